@@ -1,381 +1,1371 @@
-from fastapi import FastAPI, HTTPException
-from fastapi.middleware.cors import CORSMiddleware
-from fastapi.responses import StreamingResponse
-from pydantic import BaseModel
-import httpx
-import os
-from api.utils.pdf_generator import DDIReportGenerator
-
-app = FastAPI(title="BioGPT-DI API")
-
-app.add_middleware(
-    CORSMiddleware,
-    allow_origins=["*"],
-    allow_credentials=True,
-    allow_methods=["*"],
-    allow_headers=["*"],
-)
-
-# Initialize PDF generator
-pdf_generator = DDIReportGenerator()
-
-# Hugging Face configuration
-HF_API_TOKEN = os.getenv("HF_API_TOKEN", "")
-BIOGPT_MODEL = "microsoft/BioGPT-Large"
-
-class PredictionRequest(BaseModel):
-    drug1: str
-    drug2: str
-
-class PredictionResponse(BaseModel):
-    prediction: str
-    severity: str
-    patient_report: str
-    professional_report: str
-
-class PDFRequest(BaseModel):
-    drug1: str
-    drug2: str
-    report_type: str  # "patient" or "professional"
-    prediction_data: dict
-
-async def query_huggingface(model_id: str, inputs: dict, use_token: bool = True):
-    """Query Hugging Face Inference API"""
-    API_URL = f"https://api-inference.huggingface.co/models/{model_id}"
-    headers = {}
-    
-    if use_token and HF_API_TOKEN:
-        headers["Authorization"] = f"Bearer {HF_API_TOKEN}"
-    
-    async with httpx.AsyncClient(timeout=60.0) as client:
-        try:
-            response = await client.post(API_URL, headers=headers, json=inputs)
-            response.raise_for_status()
-            return response.json()
-        except httpx.HTTPError as e:
-            print(f"HF API Error for {model_id}: {str(e)}")
-            return None
-        except Exception as e:
-            print(f"Unexpected error: {str(e)}")
-            return None
-
-async def classify_interaction(drug1: str, drug2: str):
-    """Classify interaction severity based on known drug interactions"""
-    
-    drug1_lower = drug1.lower()
-    drug2_lower = drug2.lower()
-    
-    print(f"[Classification] Analyzing: {drug1} + {drug2}")
-    
-    # Major severity interactions (life-threatening or requires immediate intervention)
-    major_pairs = [
-        # Bleeding risks
-        ("warfarin", "aspirin"), ("warfarin", "ibuprofen"), ("warfarin", "naproxen"),
-        ("warfarin", "clopidogrel"), ("apixaban", "aspirin"), ("rivaroxaban", "ibuprofen"),
-        ("dabigatran", "aspirin"), ("edoxaban", "naproxen"),
-        
-        # Cardiovascular
-        ("sildenafil", "nitroglycerin"), ("viagra", "nitroglycerin"), ("tadalafil", "isosorbide"),
-        ("vardenafil", "nitroglycerin"), ("sildenafil", "isosorbide"),
-        ("metoprolol", "verapamil"), ("atenolol", "diltiazem"), ("propranolol", "diltiazem"),
-        ("carvedilol", "verapamil"), ("bisoprolol", "verapamil"),
-        
-        # CNS depression
-        ("diazepam", "morphine"), ("alprazolam", "oxycodone"), ("lorazepam", "fentanyl"),
-        ("clonazepam", "hydrocodone"), ("temazepam", "codeine"), ("zolpidem", "morphine"),
-        
-        # Serotonin syndrome
-        ("fluoxetine", "phenelzine"), ("sertraline", "selegiline"), ("citalopram", "tranylcypromine"),
-        ("paroxetine", "phenelzine"), ("escitalopram", "selegiline"),
-        
-        # Metabolic interactions (Rhabdomyolysis risk)
-        ("simvastatin", "clarithromycin"), ("atorvastatin", "itraconazole"), 
-        ("simvastatin", "erythromycin"), ("lovastatin", "ketoconazole"),
-        ("simvastatin", "gemfibrozil"), ("atorvastatin", "clarithromycin"),
-        
-        # Alcohol interactions
-        ("metronidazole", "alcohol"), ("tinidazole", "alcohol"), ("disulfiram", "alcohol"),
-        ("cefoperazone", "alcohol"), ("ketoconazole", "alcohol"),
-        
-        # QT prolongation
-        ("azithromycin", "amiodarone"), ("erythromycin", "quinidine"), ("clarithromycin", "sotalol"),
-        ("ciprofloxacin", "amiodarone"), ("levofloxacin", "sotalol"),
-        
-        # Immunosuppressants
-        ("tacrolimus", "ketoconazole"), ("cyclosporine", "st john's wort"), 
-        ("tacrolimus", "clarithromycin"), ("cyclosporine", "rifampin"),
-        ("sirolimus", "ketoconazole"), ("everolimus", "itraconazole"),
-        
-        # Methotrexate toxicity
-        ("methotrexate", "ibuprofen"), ("methotrexate", "naproxen"),
-        ("methotrexate", "aspirin"), ("methotrexate", "penicillin"),
-        
-        # Digoxin toxicity
-        ("digoxin", "amiodarone"), ("digoxin", "verapamil"), ("digoxin", "clarithromycin"),
-        ("digoxin", "quinidine"), ("digoxin", "spironolactone"),
-        
-        # Lithium toxicity
-        ("lithium", "hydrochlorothiazide"), ("lithium", "furosemide"), ("lithium", "ibuprofen"),
-        ("lithium", "naproxen"), ("lithium", "lisinopril"), ("lithium", "losartan"),
-        
-        # Hyperkalemia
-        ("lisinopril", "potassium"), ("enalapril", "potassium"), ("ramipril", "spironolactone"),
-        ("losartan", "potassium"), ("valsartan", "spironolactone"),
-        
-        # Lactic acidosis
-        ("metformin", "alcohol"), ("metformin", "contrast"),
-        
-        # Hypoglycemia
-        ("insulin", "alcohol"), ("glipizide", "alcohol"), ("glyburide", "alcohol"),
-    ]
-    
-    # Check for major interactions
-    for d1, d2 in major_pairs:
-        if (d1 in drug1_lower or drug1_lower in d1) and (d2 in drug2_lower or drug2_lower in d2):
-            print(f"[Classification] ⚠️  MAJOR severity detected")
-            return "EFFECT", "Major"
-        if (d1 in drug2_lower or drug2_lower in d1) and (d2 in drug1_lower or drug1_lower in d2):
-            print(f"[Classification] ⚠️  MAJOR severity detected")
-            return "EFFECT", "Major"
-    
-    # Drug class-based moderate interactions
-    anticoagulants = ["warfarin", "apixaban", "rivaroxaban", "dabigatran", "edoxaban", "heparin", "enoxaparin"]
-    antiplatelets = ["aspirin", "clopidogrel", "ticagrelor", "prasugrel", "dipyridamole"]
-    nsaids = ["ibuprofen", "naproxen", "diclofenac", "celecoxib", "indomethacin", "meloxicam", "ketorolac", "piroxicam"]
-    ssris = ["fluoxetine", "sertraline", "paroxetine", "citalopram", "escitalopram", "fluvoxamine"]
-    statins = ["simvastatin", "atorvastatin", "rosuvastatin", "pravastatin", "lovastatin", "fluvastatin", "pitavastatin"]
-    macrolides = ["erythromycin", "clarithromycin", "azithromycin"]
-    azole_antifungals = ["ketoconazole", "itraconazole", "fluconazole", "voriconazole", "posaconazole"]
-    ace_inhibitors = ["lisinopril", "enalapril", "ramipril", "perindopril", "captopril"]
-    arbs = ["losartan", "valsartan", "irbesartan", "candesartan", "olmesartan"]
-    
-    # Anticoagulant + Antiplatelet = Moderate
-    if any(ac in drug1_lower for ac in anticoagulants) or any(ac in drug2_lower for ac in anticoagulants):
-        if any(ap in drug1_lower or ap in drug2_lower for ap in antiplatelets):
-            print(f"[Classification] MODERATE: Anticoagulant + Antiplatelet")
-            return "EFFECT", "Moderate"
-    
-    # SSRI + NSAID = Moderate (bleeding risk)
-    if any(s in drug1_lower or s in drug2_lower for s in ssris):
-        if any(n in drug1_lower or n in drug2_lower for n in nsaids):
-            print(f"[Classification] MODERATE: SSRI + NSAID (bleeding risk)")
-            return "MECHANISM", "Moderate"
-    
-    # Statin + Macrolide/Azole = Moderate
-    if any(st in drug1_lower or st in drug2_lower for st in statins):
-        if any(m in drug1_lower or m in drug2_lower for m in macrolides + azole_antifungals):
-            print(f"[Classification] MODERATE: Statin + CYP3A4 inhibitor")
-            return "MECHANISM", "Moderate"
-    
-    # ACE-I/ARB + NSAID = Moderate (reduced efficacy, renal risk)
-    if any(ace in drug1_lower or ace in drug2_lower for ace in ace_inhibitors + arbs):
-        if any(n in drug1_lower or n in drug2_lower for n in nsaids):
-            print(f"[Classification] MODERATE: ACE-I/ARB + NSAID")
-            return "MECHANISM", "Moderate"
-    
-    # Minor interactions - just informational
-    minor_classes = anticoagulants + antiplatelets + nsaids + ssris + statins
-    if any(drug in drug1_lower or drug in drug2_lower for drug in minor_classes):
-        print(f"[Classification] MINOR: One or both drugs in monitored class")
-        return "ADVICE", "Minor"
-    
-    # Default classification
-    print(f"[Classification] MODERATE: General potential interaction")
-    return "EFFECT", "Moderate"
-
-async def generate_patient_explanation(drug1: str, drug2: str, interaction_type: str, severity: str):
-    """Generate unique patient-friendly explanation using BioGPT"""
-    
-    prompt = f"""Question: What happens when a patient takes {drug1} and {drug2} together?
-
-Answer: When taking {drug1} with {drug2},"""
-    
-    result = await query_huggingface(
-        BIOGPT_MODEL,
-        {
-            "inputs": prompt,
-            "parameters": {
-                "max_new_tokens": 150,
-                "temperature": 0.7,
-                "top_p": 0.9,
-                "do_sample": True,
-                "return_full_text": False
-            }
-        }
-    )
-    
-    if result and isinstance(result, list) and len(result) > 0:
-        generated_text = result[0].get('generated_text', '')
-        
-        if generated_text:
-            generated_text = generated_text.replace(prompt, '').strip()
-            
-            if not generated_text.startswith("When taking"):
-                generated_text = f"When taking {drug1} with {drug2}, {generated_text}"
-            
-            print(f"[Patient Report] Generated {len(generated_text)} characters")
-            return generated_text
-    
-    print("[Patient Report] Using fallback")
-    return f"Taking {drug1} with {drug2} may cause a {severity.lower()}-severity interaction. This means the drugs may affect how each other works in your body. The interaction is classified as {interaction_type} type, which may involve changes in drug absorption, metabolism, or effects. Please consult your healthcare provider for personalized guidance on taking these medications together safely."
-
-async def generate_professional_explanation(drug1: str, drug2: str, interaction_type: str, severity: str):
-    """Generate unique professional explanation using BioGPT"""
-    
-    prompt = f"""Clinical drug interaction assessment for {drug1} and {drug2}:
-
-Mechanism: The interaction"""
-    
-    result = await query_huggingface(
-        BIOGPT_MODEL,
-        {
-            "inputs": prompt,
-            "parameters": {
-                "max_new_tokens": 200,
-                "temperature": 0.6,
-                "top_p": 0.85,
-                "do_sample": True,
-                "return_full_text": False
-            }
-        }
-    )
-    
-    if result and isinstance(result, list) and len(result) > 0:
-        generated_text = result[0].get('generated_text', '')
-        
-        if generated_text:
-            generated_text = generated_text.replace(prompt, '').strip()
-            
-            if not generated_text.startswith("The"):
-                generated_text = f"The interaction {generated_text}"
-            
-            clinical_summary = f"The concurrent use of {drug1} and {drug2} presents a {severity.lower()}-severity drug-drug interaction classified as {interaction_type}. {generated_text}"
-            
-            print(f"[Professional Report] Generated {len(clinical_summary)} characters")
-            return clinical_summary
-    
-    print("[Professional Report] Using fallback")
-    return f"The concurrent use of {drug1} and {drug2} presents a {severity.lower()}-severity interaction classified as {interaction_type}. This interaction may involve pharmacokinetic alterations (affecting absorption, distribution, metabolism, or excretion) or pharmacodynamic effects (affecting drug receptor interactions or physiological responses). Clinical monitoring, potential dose adjustment, and assessment of therapeutic alternatives are recommended. Implement enhanced monitoring protocols and document risk-benefit assessment in patient record."
-
-@app.get("/")
-def read_root():
-    return {
-        "message": "BioGPT-DI API is running",
-        "status": "healthy",
-        "version": "1.0.0"
-    }
-
-@app.get("/api/health")
-def health_check():
-    return {
-        "status": "healthy",
-        "hf_token_configured": bool(HF_API_TOKEN),
-        "models": {
-            "classification": "rule-based (covering 100+ drug pairs)",
-            "generation": BIOGPT_MODEL
-        }
-    }
-
-@app.post("/api/predict", response_model=PredictionResponse)
-async def predict_interaction(request: PredictionRequest):
-    """
-    Predict drug-drug interaction with AI-generated unique explanations
-    """
-    try:
-        drug1 = request.drug1.strip().title()
-        drug2 = request.drug2.strip().title()
-        
-        if not drug1 or not drug2:
-            raise HTTPException(status_code=400, detail="Both drug names are required")
-        
-        print(f"\n{'='*60}")
-        print(f"[ANALYSIS START] {drug1} + {drug2}")
-        print(f"{'='*60}")
-        
-        # Step 1: Classify interaction
-        print("[Step 1/3] Classifying interaction severity...")
-        interaction_type, severity = await classify_interaction(drug1, drug2)
-        
-        # Step 2: Generate patient explanation
-        print("[Step 2/3] Generating patient explanation with BioGPT...")
-        patient_report = await generate_patient_explanation(
-            drug1, drug2, interaction_type, severity
-        )
-        
-        # Step 3: Generate professional explanation
-        print("[Step 3/3] Generating professional explanation with BioGPT...")
-        professional_report = await generate_professional_explanation(
-            drug1, drug2, interaction_type, severity
-        )
-        
-        print(f"[ANALYSIS COMPLETE] Type: {interaction_type}, Severity: {severity}")
-        print(f"{'='*60}\n")
-        
-        return PredictionResponse(
-            prediction=interaction_type,
-            severity=severity,
-            patient_report=patient_report,
-            professional_report=professional_report
-        )
-        
-    except HTTPException:
-        raise
-    except Exception as e:
-        print(f"[ERROR] {str(e)}")
-        import traceback
-        traceback.print_exc()
-        raise HTTPException(
-            status_code=500,
-            detail="Analysis failed. The AI models may be loading (cold start - typically takes 30-60 seconds on first request). Please try again in a moment."
-        )
-
-@app.post("/api/generate-pdf")
-async def generate_pdf_report(request: PDFRequest):
-    """
-    Generate detailed PDF report based on user type (patient or professional)
-    """
-    try:
-        drug1 = request.drug1.strip()
-        drug2 = request.drug2.strip()
-        report_type = request.report_type.lower()
-        prediction_data = request.prediction_data
-        
-        if report_type not in ["patient", "professional"]:
-            raise HTTPException(
-                status_code=400,
-                detail="report_type must be 'patient' or 'professional'"
-            )
-        
-        print(f"[PDF Generation] Type: {report_type}, Drugs: {drug1} + {drug2}")
-        
-        # Generate PDF based on report type
-        if report_type == "patient":
-            pdf_buffer = pdf_generator.generate_patient_report(
-                drug1, drug2, prediction_data
-            )
-            filename = f"DDI_Report_Patient_{drug1}_{drug2}.pdf"
-        else:
-            pdf_buffer = pdf_generator.generate_professional_report(
-                drug1, drug2, prediction_data
-            )
-            filename = f"DDI_Report_Professional_{drug1}_{drug2}.pdf"
-        
-        print(f"[PDF Generated] {filename}")
-        
-        # Return PDF as streaming response
-        return StreamingResponse(
-            pdf_buffer,
-            media_type="application/pdf",
-            headers={
-                "Content-Disposition": f"attachment; filename={filename}"
-            }
-        )
-        
-    except Exception as e:
-        print(f"[PDF Error] {str(e)}")
-        import traceback
-        traceback.print_exc()
-        raise HTTPException(
-            status_code=500,
-            detail=f"PDF generation failed: {str(e)}"
-        )
+from contextlib import asynccontextmanager
+from fastapi import FastAPI, Header, HTTPException
+from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import Response, StreamingResponse
+from pydantic import BaseModel
+from io import BytesIO
+import asyncio
+import hashlib
+import hmac
+import json
+import httpx
+import os
+import re
+import tempfile
+from api.utils.render_pool import PDFRenderPool, RenderPoolFull
+from api.utils.pdf_cache import PDFCache, pdf_cache_key
+from api.utils.zip_stream import ZipStream
+from api.utils.concurrency import bounded_as_completed, hedged
+from api.utils.circuit_breaker import CircuitBreaker
+from api.utils.model_warmer import ModelLoading, ModelWarmer, loading_estimate
+from api.utils.generation_backend import LocalTransformersBackend, RemoteBackend, StubBackend
+from api.utils.interaction_index import RuleSetManager, normalize_drug_name
+from api.utils.knowledge_base import InteractionKnowledgeBase
+from api.utils.cache import TTLCache
+from api.utils.report_store import ReportStore
+from api.utils.singleflight import SingleFlight
+from api.utils.session_store import SessionConflict, SessionStore
+from api.routers import predict as ddi_models
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    get_http_client()
+    if generation_backend.kind == "remote":
+        model_warmer.start()
+    elif LOCAL_GENERATION_WARMUP:
+        generation_backend.warmup()
+    ddi_models.warmup()
+    pdf_render_pool.start()
+    rule_sets.start()
+    if report_store:
+        report_store.start()
+    yield
+    if report_store:
+        report_store.stop()
+    rule_sets.stop()
+    pdf_render_pool.shutdown()
+    await model_warmer.stop()
+    await close_http_client()
+
+app = FastAPI(title="BioGPT-DI API", lifespan=lifespan)
+# Classifier + BioGPT report endpoints; the models load in the background from lifespan
+app.include_router(ddi_models.router, prefix="/api/ddi")
+
+app.add_middleware(
+    CORSMiddleware,
+    allow_origins=["*"],
+    allow_credentials=True,
+    allow_methods=["*"],
+    allow_headers=["*"],
+)
+
+# PDF rendering pool ("process" or "thread"), kept off the event loop
+PDF_RENDER_POOL = os.getenv("PDF_RENDER_POOL", "process")
+PDF_RENDER_WORKERS = int(os.getenv("PDF_RENDER_WORKERS", "0")) or None
+PDF_RENDER_QUEUE = int(os.getenv("PDF_RENDER_QUEUE", "16"))
+pdf_render_pool = PDFRenderPool(PDF_RENDER_POOL, max_workers=PDF_RENDER_WORKERS, max_queue=PDF_RENDER_QUEUE)
+
+# Bulk export: most items per request, and how many renders one export keeps in flight
+BULK_PDF_MAX_ITEMS = int(os.getenv("BULK_PDF_MAX_ITEMS", "1000"))
+BULK_PDF_CONCURRENCY = int(os.getenv("BULK_PDF_CONCURRENCY", "0")) or pdf_render_pool.max_workers
+
+# Content-addressed cache of rendered PDFs on local disk (empty path disables it)
+PDF_CACHE_DIR = os.getenv("PDF_CACHE_DIR", os.path.join(tempfile.gettempdir(), "biogpt_ddi_pdfs"))
+PDF_CACHE_MAX_MB = float(os.getenv("PDF_CACHE_MAX_MB", "256"))
+pdf_cache = None
+if PDF_CACHE_DIR:
+    try:
+        pdf_cache = PDFCache(PDF_CACHE_DIR, max_bytes=int(PDF_CACHE_MAX_MB * 1024 * 1024))
+    except OSError as e:
+        print(f"[PDF Cache] Disabled, could not open {PDF_CACHE_DIR}: {e}")
+
+# Hugging Face configuration
+HF_API_TOKEN = os.getenv("HF_API_TOKEN", "")
+HF_API_BASE = os.getenv("HF_API_BASE", "https://api-inference.huggingface.co/models")
+BIOGPT_MODEL = "microsoft/BioGPT-Large"
+
+PATIENT_GENERATION_PARAMETERS = {
+    "max_new_tokens": 150,
+    "temperature": 0.7,
+    "top_p": 0.9,
+    "do_sample": True,
+    "return_full_text": False
+}
+
+PROFESSIONAL_GENERATION_PARAMETERS = {
+    "max_new_tokens": 200,
+    "temperature": 0.6,
+    "top_p": 0.85,
+    "do_sample": True,
+    "return_full_text": False
+}
+
+# Connection pool for the Hugging Face client, shared by every request in this worker
+HF_MAX_CONNECTIONS = int(os.getenv("HF_MAX_CONNECTIONS", "20"))
+HF_MAX_KEEPALIVE = int(os.getenv("HF_MAX_KEEPALIVE", "20"))
+HF_KEEPALIVE_EXPIRY = float(os.getenv("HF_KEEPALIVE_EXPIRY", "30"))
+HF_HTTP2 = os.getenv("HF_HTTP2", "false").lower() == "true"
+HF_CONNECT_TIMEOUT = float(os.getenv("HF_CONNECT_TIMEOUT", "10"))
+HF_READ_TIMEOUT = float(os.getenv("HF_READ_TIMEOUT", "60"))
+HF_POOL_TIMEOUT = float(os.getenv("HF_POOL_TIMEOUT", "10"))
+
+# A streamed generation that produces no token for this many seconds is abandoned
+HF_STREAM_STALL_SECONDS = float(os.getenv("HF_STREAM_STALL_SECONDS", "10"))
+
+# Circuit breaker around the Hugging Face API: while open, explanations go straight to fallbacks
+HF_BREAKER_FAILURE_RATE = float(os.getenv("HF_BREAKER_FAILURE_RATE", "0.5"))
+HF_BREAKER_SLOW_SECONDS = float(os.getenv("HF_BREAKER_SLOW_SECONDS", "15"))
+HF_BREAKER_WINDOW = int(os.getenv("HF_BREAKER_WINDOW", "20"))
+HF_BREAKER_MIN_CALLS = int(os.getenv("HF_BREAKER_MIN_CALLS", "5"))
+HF_BREAKER_OPEN_SECONDS = float(os.getenv("HF_BREAKER_OPEN_SECONDS", "30"))
+hf_breaker = CircuitBreaker(
+    failure_rate=HF_BREAKER_FAILURE_RATE,
+    slow_seconds=HF_BREAKER_SLOW_SECONDS,
+    window=HF_BREAKER_WINDOW,
+    min_calls=HF_BREAKER_MIN_CALLS,
+    open_seconds=HF_BREAKER_OPEN_SECONDS
+)
+
+# Where explanations are generated: "remote" (Hugging Face Inference API), "local"
+# (transformers on this machine's CPU) or "stub" (deterministic text after a fixed latency)
+GENERATION_BACKEND = os.getenv("GENERATION_BACKEND", "remote").lower()
+LOCAL_GENERATION_MODEL = os.getenv("LOCAL_GENERATION_MODEL", "microsoft/biogpt")
+# Load the local model in the background at startup instead of on the first request
+LOCAL_GENERATION_WARMUP = os.getenv("LOCAL_GENERATION_WARMUP", "true").lower() == "true"
+STUB_GENERATION_LATENCY_SECONDS = float(os.getenv("STUB_GENERATION_LATENCY_SECONDS", "0"))
+
+# Keep-warm pings for BIOGPT_MODEL (0 disables them); while it is loading, requests wait
+# up to HF_WARM_WAIT_SECONDS for it instead of failing (the request deadline still applies)
+HF_WARM_INTERVAL_SECONDS = float(os.getenv("HF_WARM_INTERVAL_SECONDS", "240"))
+HF_WARM_WAIT_SECONDS = float(os.getenv("HF_WARM_WAIT_SECONDS", "60"))
+
+# Hedged requests: resend a call still running after the recent p95 latency (never below the minimum),
+# for at most HF_HEDGE_BUDGET of all calls so hedging cannot pile load onto a struggling upstream
+HF_HEDGE = os.getenv("HF_HEDGE", "false").lower() == "true"
+HF_HEDGE_MIN_SECONDS = float(os.getenv("HF_HEDGE_MIN_SECONDS", "1"))
+HF_HEDGE_BUDGET = float(os.getenv("HF_HEDGE_BUDGET", "0.1"))
+
+# Both explanations are generated concurrently and must finish within this many seconds
+PREDICT_DEADLINE_SECONDS = float(os.getenv("PREDICT_DEADLINE_SECONDS", "30"))
+
+# Batch prediction: most pairs per request, and how many pairs are generated at once
+# (each pair makes two upstream calls, so the default stays within the kept-alive connections)
+PREDICT_BATCH_MAX_PAIRS = int(os.getenv("PREDICT_BATCH_MAX_PAIRS", "5000"))
+PREDICT_BATCH_CONCURRENCY = int(os.getenv("PREDICT_BATCH_CONCURRENCY", "0")) or max(min(HF_MAX_CONNECTIONS, HF_MAX_KEEPALIVE) // 2, 1)
+
+# Regimen analysis: most drugs per regimen, and the lowest severity that gets explanations
+REGIMEN_MAX_DRUGS = int(os.getenv("REGIMEN_MAX_DRUGS", "40"))
+REGIMEN_EXPLAIN_SEVERITY = os.getenv("REGIMEN_EXPLAIN_SEVERITY", "Moderate")
+
+# In-process cache of generated explanations (template fallbacks are never cached)
+EXPLANATION_CACHE_SIZE = int(os.getenv("EXPLANATION_CACHE_SIZE", "1024"))
+EXPLANATION_CACHE_TTL_SECONDS = float(os.getenv("EXPLANATION_CACHE_TTL_SECONDS", "3600"))
+explanation_cache = TTLCache(EXPLANATION_CACHE_SIZE, EXPLANATION_CACHE_TTL_SECONDS)
+
+# Persistent report store shared by all workers on this host (empty path disables it)
+REPORT_STORE_PATH = os.getenv("REPORT_STORE_PATH", os.path.join(tempfile.gettempdir(), "biogpt_ddi_reports.sqlite3"))
+REPORT_STORE_MAX_ENTRIES = int(os.getenv("REPORT_STORE_MAX_ENTRIES", "50000"))
+REPORT_STORE_BATCH_SIZE = int(os.getenv("REPORT_STORE_BATCH_SIZE", "32"))
+REPORT_STORE_FLUSH_SECONDS = float(os.getenv("REPORT_STORE_FLUSH_SECONDS", "1"))
+report_store = None
+if REPORT_STORE_PATH:
+    try:
+        report_store = ReportStore(
+            REPORT_STORE_PATH,
+            max_entries=REPORT_STORE_MAX_ENTRIES,
+            batch_size=REPORT_STORE_BATCH_SIZE,
+            flush_interval=REPORT_STORE_FLUSH_SECONDS
+        )
+    except Exception as e:
+        print(f"[Report Store] Disabled, could not open {REPORT_STORE_PATH}: {e}")
+
+# Medication-list sessions persisted on local disk (empty path disables them)
+SESSION_STORE_PATH = os.getenv("SESSION_STORE_PATH", os.path.join(tempfile.gettempdir(), "biogpt_ddi_sessions.sqlite3"))
+SESSION_TTL_SECONDS = float(os.getenv("SESSION_TTL_SECONDS", str(7 * 24 * 3600)))
+session_store = None
+if SESSION_STORE_PATH:
+    try:
+        session_store = SessionStore(SESSION_STORE_PATH, ttl=SESSION_TTL_SECONDS)
+    except Exception as e:
+        print(f"[Sessions] Disabled, could not open {SESSION_STORE_PATH}: {e}")
+
+# Concurrent requests for the same explanation share one upstream generation
+generation_flights = SingleFlight()
+
+# Admin endpoints are disabled unless a token is configured
+ADMIN_TOKEN = os.getenv("ADMIN_TOKEN", "")
+
+http_client = None
+
+# Classification rules, optionally loaded from a watched JSON file
+DDI_RULES_PATH = os.getenv("DDI_RULES_PATH", "")
+DDI_RULES_POLL_SECONDS = float(os.getenv("DDI_RULES_POLL_SECONDS", "5"))
+rule_sets = RuleSetManager(DDI_RULES_PATH, poll_interval=DDI_RULES_POLL_SECONDS)
+
+# Optional compiled knowledge base (see api/utils/knowledge_base.py)
+DDI_KB_PATH = os.getenv("DDI_KB_PATH", "")
+knowledge_base = None
+if DDI_KB_PATH:
+    try:
+        knowledge_base = InteractionKnowledgeBase(DDI_KB_PATH)
+        print(f"[Knowledge Base] Loaded {knowledge_base.pair_count} pairs from {DDI_KB_PATH}")
+    except (OSError, ValueError) as e:
+        print(f"[Knowledge Base] Could not open {DDI_KB_PATH}: {e}")
+
+class PredictionRequest(BaseModel):
+    drug1: str
+    drug2: str
+
+class PredictionResponse(BaseModel):
+    prediction: str
+    severity: str
+    patient_report: str
+    professional_report: str
+    sections: dict = {}  # report field -> "generated" or "fallback"
+
+class BatchPredictionRequest(BaseModel):
+    pairs: list[PredictionRequest]
+
+class RegimenRequest(BaseModel):
+    drugs: list[str]
+    explain_severity: str = ""  # lowest severity that gets explanations, REGIMEN_EXPLAIN_SEVERITY if empty
+
+class RegimenInteraction(BaseModel):
+    drug1: str
+    drug2: str
+    prediction: str
+    severity: str
+    description: str
+    patient_report: str = ""
+    professional_report: str = ""
+    sections: dict = {}
+
+class RegimenResponse(BaseModel):
+    drugs: list[str]
+    duplicates: dict  # submitted name -> the regimen drug it was merged into
+    matrix: list[list]  # severity for every drug pair, in the order of drugs
+    interactions: list[RegimenInteraction]  # most severe first
+
+class SessionCreateRequest(BaseModel):
+    drugs: list[str] = []
+    explain_severity: str = ""  # lowest severity that gets explanations, REGIMEN_EXPLAIN_SEVERITY if empty
+
+class SessionDrugsRequest(BaseModel):
+    drugs: list[str]
+
+class SessionResponse(BaseModel):
+    session_id: str
+    version: int
+    drugs: list[str]
+    interactions: list[dict]  # every pair in the list, most severe first
+    diff: dict  # "added", "changed" and "removed" interactions caused by this request
+
+class PDFRequest(BaseModel):
+    drug1: str
+    drug2: str
+    report_type: str  # "patient" or "professional"
+    prediction_data: dict
+
+class BulkPDFRequest(BaseModel):
+    items: list[PDFRequest]
+
+def get_http_client() -> httpx.AsyncClient:
+    """Return the worker's shared Hugging Face client, creating it on first use"""
+    global http_client
+    if http_client is None:
+        http2 = HF_HTTP2
+        if http2:
+            try:
+                import h2  # noqa: F401
+            except ImportError:
+                print("[HTTP] HF_HTTP2 is set but the 'h2' package is not installed, using HTTP/1.1")
+                http2 = False
+        http_client = httpx.AsyncClient(
+            http2=http2,
+            limits=httpx.Limits(
+                max_connections=HF_MAX_CONNECTIONS,
+                max_keepalive_connections=HF_MAX_KEEPALIVE,
+                keepalive_expiry=HF_KEEPALIVE_EXPIRY
+            ),
+            timeout=httpx.Timeout(
+                HF_READ_TIMEOUT,
+                connect=HF_CONNECT_TIMEOUT,
+                read=HF_READ_TIMEOUT,
+                pool=HF_POOL_TIMEOUT
+            )
+        )
+    return http_client
+
+async def close_http_client():
+    global http_client
+    if http_client is not None:
+        await http_client.aclose()
+        http_client = None
+
+async def query_huggingface(model_id: str, inputs: dict, use_token: bool = True, on_token=None, wait_for_model: bool = True):
+    """
+    Query Hugging Face Inference API.
+
+    With on_token, the generation is requested as a server-sent event
+    stream and on_token(text) is called for every token as it arrives. The
+    return value has the same shape either way. While BIOGPT_MODEL is
+    loading, the call waits for it once and then retries.
+    """
+    warmed = model_id == BIOGPT_MODEL
+    if wait_for_model and warmed and model_warmer.loading:
+        print(f"[Model Warmer] Waiting for {model_id} to finish loading")
+        await model_warmer.wait_until_ready(HF_WARM_WAIT_SECONDS)
+    
+    if not hf_breaker.allow():
+        print(f"[Circuit Breaker] Open, skipping HF API call for {model_id}")
+        return None
+    
+    API_URL = f"{HF_API_BASE}/{model_id}"
+    headers = {}
+    
+    if use_token and HF_API_TOKEN:
+        headers["Authorization"] = f"Bearer {HF_API_TOKEN}"
+    
+    async def post():
+        response = await get_http_client().post(API_URL, headers=headers, json=inputs)
+        estimated_time = loading_estimate(response)
+        if estimated_time is not None:
+            raise ModelLoading(estimated_time)
+        response.raise_for_status()
+        return response.json()
+    
+    loop = asyncio.get_running_loop()
+    started = loop.time()
+    try:
+        if on_token is not None:
+            # Streams are never hedged: a second attempt would replay the tokens
+            async with get_http_client().stream("POST", API_URL, headers=headers, json={**inputs, "stream": True}) as response:
+                if response.status_code == 503:
+                    await response.aread()
+                    estimated_time = loading_estimate(response)
+                    if estimated_time is not None:
+                        raise ModelLoading(estimated_time)
+                response.raise_for_status()
+                result = await read_generation_stream(response, on_token)
+        else:
+            hedge_after = None
+            if HF_HEDGE and hf_breaker.hedges < HF_HEDGE_BUDGET * hf_breaker.allowed:
+                hedge_after = hf_breaker.latency_quantile(0.95)
+            if hedge_after is None:
+                result = await post()
+            else:
+                result, hedge_sent = await hedged(post, max(hedge_after, HF_HEDGE_MIN_SECONDS))
+                if hedge_sent:
+                    hf_breaker.hedges += 1
+        hf_breaker.record_success(loop.time() - started)
+        if warmed and model_warmer.loading:
+            model_warmer.mark_ready()
+        return result
+    except ModelLoading as e:
+        # A cold start is not an upstream failure: wait on the shared readiness event, then retry once
+        hf_breaker.release()
+        print(f"HF API model {model_id} is loading, estimated {e.estimated_time:.0f}s")
+        if warmed:
+            model_warmer.mark_loading(e.estimated_time)
+            if wait_for_model and await model_warmer.wait_until_ready(HF_WARM_WAIT_SECONDS):
+                return await query_huggingface(model_id, inputs, use_token, on_token, wait_for_model=False)
+        return None
+    except asyncio.CancelledError:
+        hf_breaker.record_cancelled(loop.time() - started)
+        raise
+    except asyncio.TimeoutError:
+        print(f"HF API stream for {model_id} stalled for {HF_STREAM_STALL_SECONDS}s")
+    except httpx.HTTPError as e:
+        print(f"HF API Error for {model_id}: {str(e)}")
+    except Exception as e:
+        print(f"Unexpected error: {str(e)}")
+    hf_breaker.record_failure()
+    return None
+
+async def ping_model():
+    """Tiny generation against BIOGPT_MODEL: None if it answered, else seconds until it has loaded"""
+    headers = {"Authorization": f"Bearer {HF_API_TOKEN}"} if HF_API_TOKEN else {}
+    response = await get_http_client().post(
+        f"{HF_API_BASE}/{BIOGPT_MODEL}",
+        headers=headers,
+        json={"inputs": "Aspirin", "parameters": {"max_new_tokens": 1, "return_full_text": False}}
+    )
+    estimated_time = loading_estimate(response)
+    if estimated_time is not None:
+        return estimated_time
+    response.raise_for_status()
+    return None
+
+model_warmer = ModelWarmer(ping_model, interval=HF_WARM_INTERVAL_SECONDS)
+
+if GENERATION_BACKEND == "local":
+    generation_backend = LocalTransformersBackend(LOCAL_GENERATION_MODEL)
+elif GENERATION_BACKEND == "stub":
+    generation_backend = StubBackend(latency=STUB_GENERATION_LATENCY_SECONDS)
+else:
+    if GENERATION_BACKEND != "remote":
+        print(f"[Generation] Unknown backend {GENERATION_BACKEND!r}, using remote")
+    generation_backend = RemoteBackend(query_huggingface, BIOGPT_MODEL)
+print(f"[Generation] Using {generation_backend.kind} backend ({generation_backend.name})")
+
+async def read_generation_stream(response: httpx.Response, on_token):
+    """Consume a text-generation event stream, returning [{"generated_text": ...}] like the JSON API"""
+    if not response.headers.get("content-type", "").startswith("text/event-stream"):
+        # Backends without streaming answer with the whole result at once
+        result = json.loads(await response.aread())
+        if result and isinstance(result, list) and result[0].get("generated_text"):
+            on_token(result[0]["generated_text"])
+        return result
+    
+    tokens = []
+    lines = response.aiter_lines()
+    while True:
+        try:
+            line = await asyncio.wait_for(lines.__anext__(), timeout=HF_STREAM_STALL_SECONDS)
+        except StopAsyncIteration:
+            break
+        if not line.startswith("data:"):
+            continue
+        event = json.loads(line[len("data:"):])
+        if "error" in event:
+            raise RuntimeError(event["error"])
+        token = event.get("token") or {}
+        if token.get("text") and not token.get("special"):
+            tokens.append(token["text"])
+            on_token(token["text"])
+        if event.get("generated_text") is not None:
+            return [{"generated_text": event["generated_text"]}]
+    return [{"generated_text": "".join(tokens)}]
+
+MAJOR_PAIR_DESCRIPTION = "Known major interaction pair"
+KNOWN_PAIR_DESCRIPTION = "Known pair in knowledge base"
+DEFAULT_DESCRIPTION = "General potential interaction"
+SEVERITY_RANK = {"Major": 3, "Moderate": 2, "Minor": 1}
+
+def resolve_drug(interaction_index, name: str) -> tuple:
+    """Everything classification needs about one normalized drug name, looked up once"""
+    return (
+        interaction_index.related_ids(name),
+        interaction_index.class_mask(name),
+        knowledge_base.drug_id(name) if knowledge_base else None
+    )
+
+def classify_resolved(interaction_index, resolved1: tuple, resolved2: tuple) -> tuple:
+    """(interaction_type, severity, description) for two drugs from resolve_drug"""
+    related1, class_mask1, kb_id1 = resolved1
+    related2, class_mask2, kb_id2 = resolved2
+    
+    # Check for major interactions
+    if interaction_index.is_major_pair(related1, related2):
+        outcome = ("EFFECT", "Major", MAJOR_PAIR_DESCRIPTION)
+    else:
+        # Drug class-based moderate/minor interactions, else the default classification
+        outcome = interaction_index.class_outcome(class_mask1 | class_mask2) or ("EFFECT", "Moderate", DEFAULT_DESCRIPTION)
+    
+    # An exact pair from the compiled knowledge base replaces the default guess,
+    # but never downgrades what the rules found
+    if kb_id1 is not None and kb_id2 is not None:
+        known = knowledge_base.lookup_ids(kb_id1, kb_id2)
+        if known and (outcome[2] == DEFAULT_DESCRIPTION
+                      or SEVERITY_RANK.get(known[1], 0) >= SEVERITY_RANK.get(outcome[1], 0)):
+            return known[0], known[1], KNOWN_PAIR_DESCRIPTION
+    return outcome
+
+async def classify_interaction(drug1: str, drug2: str):
+    """Classify interaction severity based on known drug interactions"""
+    
+    # Pin one rule set for the whole classification, even if a reload lands mid-call
+    interaction_index = rule_sets.current.index
+    drug1_lower = normalize_drug_name(drug1)
+    drug2_lower = normalize_drug_name(drug2)
+    
+    print(f"[Classification] Analyzing: {drug1} + {drug2}")
+    
+    interaction_type, severity, description = classify_resolved(
+        interaction_index,
+        resolve_drug(interaction_index, drug1_lower),
+        resolve_drug(interaction_index, drug2_lower)
+    )
+    if description == MAJOR_PAIR_DESCRIPTION:
+        print(f"[Classification] ⚠️  MAJOR severity detected")
+    else:
+        print(f"[Classification] {severity.upper()}: {description}")
+    return interaction_type, severity
+
+def regimen_entity(interaction_index, name: str) -> str:
+    """
+    Identity used to deduplicate a regimen: the rule drug the name refers to
+    when it contains exactly one (e.g. "warfarin sodium" -> "warfarin"),
+    otherwise the normalized name itself
+    """
+    contained = interaction_index.contained_ids(name)
+    if len(contained) == 1:
+        return interaction_index.drug_names[next(iter(contained))]
+    return name
+
+def classify_regimen(drugs: list):
+    """
+    Classify every pair in a regimen in one pass.
+
+    Each distinct drug is resolved against the rules once, so the pairwise
+    step is only set intersections and a matrix lookup. Returns the
+    regimen drugs, the merged duplicates, and (i, j, interaction_type,
+    severity, description) for every pair i < j.
+    """
+    interaction_index = rule_sets.current.index
+    regimen = []
+    resolved = []
+    duplicates = {}
+    entities = {}
+    for drug in drugs:
+        display = drug.strip().title()
+        if not display:
+            continue
+        name = normalize_drug_name(display)
+        entity = regimen_entity(interaction_index, name)
+        if entity in entities:
+            if display != regimen[entities[entity]]:
+                duplicates[display] = regimen[entities[entity]]
+            continue
+        entities[entity] = len(regimen)
+        regimen.append(display)
+        resolved.append(resolve_drug(interaction_index, name))
+    
+    pairs = []
+    for i in range(len(regimen)):
+        for j in range(i + 1, len(regimen)):
+            pairs.append((i, j) + classify_resolved(interaction_index, resolved[i], resolved[j]))
+    return regimen, duplicates, pairs
+
+async def generate_patient_explanation(drug1: str, drug2: str, interaction_type: str, severity: str, on_token=None):
+    """Generate unique patient-friendly explanation using BioGPT, or None if generation failed"""
+    
+    prompt = f"""Question: What happens when a patient takes {drug1} and {drug2} together?
+
+Answer: When taking {drug1} with {drug2},"""
+    
+    result = await generation_backend.generate(prompt, PATIENT_GENERATION_PARAMETERS, on_token=on_token)
+    
+    if result and isinstance(result, list) and len(result) > 0:
+        generated_text = result[0].get('generated_text', '')
+        
+        if generated_text:
+            generated_text = generated_text.replace(prompt, '').strip()
+            
+            if not generated_text.startswith("When taking"):
+                generated_text = f"When taking {drug1} with {drug2}, {generated_text}"
+            
+            print(f"[Patient Report] Generated {len(generated_text)} characters")
+            return generated_text
+    
+    print("[Patient Report] Using fallback")
+    return None
+
+def fallback_patient_explanation(drug1: str, drug2: str, interaction_type: str, severity: str):
+    """Template patient explanation used when BioGPT is unavailable"""
+    return f"Taking {drug1} with {drug2} may cause a {severity.lower()}-severity interaction. This means the drugs may affect how each other works in your body. The interaction is classified as {interaction_type} type, which may involve changes in drug absorption, metabolism, or effects. Please consult your healthcare provider for personalized guidance on taking these medications together safely."
+
+async def generate_professional_explanation(drug1: str, drug2: str, interaction_type: str, severity: str, on_token=None):
+    """Generate unique professional explanation using BioGPT, or None if generation failed"""
+    
+    prompt = f"""Clinical drug interaction assessment for {drug1} and {drug2}:
+
+Mechanism: The interaction"""
+    
+    result = await generation_backend.generate(prompt, PROFESSIONAL_GENERATION_PARAMETERS, on_token=on_token)
+    
+    if result and isinstance(result, list) and len(result) > 0:
+        generated_text = result[0].get('generated_text', '')
+        
+        if generated_text:
+            generated_text = generated_text.replace(prompt, '').strip()
+            
+            if not generated_text.startswith("The"):
+                generated_text = f"The interaction {generated_text}"
+            
+            clinical_summary = f"The concurrent use of {drug1} and {drug2} presents a {severity.lower()}-severity drug-drug interaction classified as {interaction_type}. {generated_text}"
+            
+            print(f"[Professional Report] Generated {len(clinical_summary)} characters")
+            return clinical_summary
+    
+    print("[Professional Report] Using fallback")
+    return None
+
+def fallback_professional_explanation(drug1: str, drug2: str, interaction_type: str, severity: str):
+    """Template professional explanation used when BioGPT is unavailable"""
+    return f"The concurrent use of {drug1} and {drug2} presents a {severity.lower()}-severity interaction classified as {interaction_type}. This interaction may involve pharmacokinetic alterations (affecting absorption, distribution, metabolism, or excretion) or pharmacodynamic effects (affecting drug receptor interactions or physiological responses). Clinical monitoring, potential dose adjustment, and assessment of therapeutic alternatives are recommended. Implement enhanced monitoring protocols and document risk-benefit assessment in patient record."
+
+def drug_pair_key(drug1: str, drug2: str) -> tuple:
+    """Order-independent key for a drug pair"""
+    return tuple(sorted((normalize_drug_name(drug1.strip()), normalize_drug_name(drug2.strip()))))
+
+async def cached_explanation(kind: str, generate, parameters: dict, drug1: str, drug2: str, interaction_type: str, severity: str, on_token=None):
+    """
+    Serve a generated explanation from the in-process cache, then the
+    persistent report store, generating and storing it on a miss. Concurrent
+    misses for the same key share a single generation; on_token, if given,
+    receives the tokens only when this caller starts that generation.
+    """
+    pair = drug_pair_key(drug1, drug2)
+    key = (pair, kind, interaction_type, severity, generation_backend.name, tuple(sorted(parameters.items())))
+    explanation = explanation_cache.get(key)
+    if explanation is not None:
+        print(f"[Cache] Hit for {kind} explanation")
+        return explanation
+    
+    store_key = hashlib.sha256(repr(key).encode("utf-8")).hexdigest()
+    if report_store:
+        # SQLite reads can wait on other workers' writes, so they run off the event loop
+        stored = await asyncio.to_thread(report_store.get, store_key)
+        if stored:
+            print(f"[Report Store] Hit for {kind} explanation")
+            explanation_cache.set(key, stored["text"])
+            return stored["text"]
+    
+    async def generate_and_store():
+        explanation = await generate(drug1, drug2, interaction_type, severity, on_token=on_token)
+        if explanation:
+            explanation_cache.set(key, explanation)
+            if report_store:
+                await asyncio.to_thread(
+                    report_store.put, store_key, pair[0], pair[1], kind, interaction_type, severity, generation_backend.name, explanation
+                )
+        return explanation
+    
+    return await generation_flights.do(key, generate_and_store)
+
+def etag_matches(if_none_match: str, etag: str) -> bool:
+    """Whether an If-None-Match header value matches etag (weak comparison)"""
+    if not if_none_match:
+        return False
+    if if_none_match.strip() == "*":
+        return True
+    candidates = [tag.strip() for tag in if_none_match.split(",")]
+    return any(tag.removeprefix("W/") == etag for tag in candidates)
+
+async def render_report_pdf(cache_key: str, report_type: str, drug1: str, drug2: str, prediction_data: dict) -> bytes:
+    """PDF bytes from the disk cache, or rendered on the worker pool and cached"""
+    # Disk I/O runs off the event loop, like the render itself
+    pdf_bytes = await asyncio.to_thread(pdf_cache.get, cache_key) if pdf_cache else None
+    if pdf_bytes is not None:
+        print(f"[PDF Cache] Hit for {report_type} report: {drug1} + {drug2}")
+        return pdf_bytes
+    
+    print(f"[PDF Generation] Type: {report_type}, Drugs: {drug1} + {drug2}")
+    
+    # Render the PDF on the worker pool so the event loop keeps serving
+    pdf_bytes = await pdf_render_pool.render(report_type, drug1, drug2, prediction_data)
+    if pdf_cache:
+        await asyncio.to_thread(pdf_cache.put, cache_key, pdf_bytes)
+    return pdf_bytes
+
+def fill_from_report_store(drug1: str, drug2: str, report_type: str, prediction_data: dict) -> dict:
+    """Complete prediction_data with the latest stored classification and report for the pair"""
+    report_field = f"{report_type}_report"
+    if not report_store or prediction_data.get(report_field):
+        return prediction_data
+    
+    stored = report_store.latest_for_pair(*drug_pair_key(drug1, drug2), report_type)
+    if not stored:
+        return prediction_data
+    
+    print(f"[Report Store] Filled {report_type} PDF data from stored report")
+    filled = dict(prediction_data)
+    filled.setdefault("prediction", stored["interaction_type"])
+    filled.setdefault("severity", stored["severity"])
+    filled[report_field] = stored["text"]
+    return filled
+
+async def _generate_before_deadline(label: str, generation, deadline: float):
+    """Await one explanation branch, giving up (None) once the request deadline passes"""
+    try:
+        return await asyncio.wait_for(generation, timeout=max(deadline - asyncio.get_running_loop().time(), 0))
+    except asyncio.TimeoutError:
+        print(f"[{label}] Missed request deadline")
+    except Exception as e:
+        print(f"[{label}] Generation error: {str(e)}")
+    return None
+
+async def generate_explanations(drug1: str, drug2: str, interaction_type: str, severity: str, deadline: float):
+    """
+    Generate the patient and professional explanations concurrently.
+
+    Each branch that fails or misses the deadline falls back to its template
+    text on its own. Returns (patient_report, professional_report, sections).
+    """
+    patient_report, professional_report = await asyncio.gather(
+        _generate_before_deadline(
+            "Patient Report",
+            cached_explanation(
+                "patient", generate_patient_explanation, PATIENT_GENERATION_PARAMETERS,
+                drug1, drug2, interaction_type, severity
+            ),
+            deadline
+        ),
+        _generate_before_deadline(
+            "Professional Report",
+            cached_explanation(
+                "professional", generate_professional_explanation, PROFESSIONAL_GENERATION_PARAMETERS,
+                drug1, drug2, interaction_type, severity
+            ),
+            deadline
+        )
+    )
+    
+    sections = {
+        "patient_report": "generated" if patient_report else "fallback",
+        "professional_report": "generated" if professional_report else "fallback"
+    }
+    if not patient_report:
+        patient_report = fallback_patient_explanation(drug1, drug2, interaction_type, severity)
+    if not professional_report:
+        professional_report = fallback_professional_explanation(drug1, drug2, interaction_type, severity)
+    
+    return patient_report, professional_report, sections
+
+@app.get("/")
+def read_root():
+    return {
+        "message": "BioGPT-DI API is running",
+        "status": "healthy",
+        "version": "1.0.0"
+    }
+
+@app.get("/api/health")
+def health_check():
+    return {
+        "status": "healthy",
+        "hf_token_configured": bool(HF_API_TOKEN),
+        "models": {
+            "classification": "rule-based (covering 100+ drug pairs)",
+            "knowledge_base_pairs": knowledge_base.pair_count if knowledge_base else 0,
+            "rule_set": rule_sets.current.info(),
+            "generation": generation_backend.name
+        },
+        "generation_backend": generation_backend.stats(),
+        "explanation_cache": explanation_cache.stats(),
+        "report_store": report_store.stats() if report_store else None,
+        "session_store": session_store.stats() if session_store else None,
+        "generation_flights": generation_flights.stats(),
+        "hf_circuit_breaker": hf_breaker.stats(),
+        "model_warmer": model_warmer.stats(),
+        "pdf_render_pool": pdf_render_pool.stats(),
+        "pdf_cache": pdf_cache.stats() if pdf_cache else None
+    }
+
+@app.delete("/api/admin/cache")
+def invalidate_explanation_cache(drug1: str = "", drug2: str = "", x_admin_token: str = Header(default="")):
+    """
+    Invalidate cached explanations for one drug pair, or all of them when no pair is given
+    """
+    if not ADMIN_TOKEN:
+        raise HTTPException(status_code=404, detail="Not Found")
+    if not hmac.compare_digest(x_admin_token.encode("utf-8"), ADMIN_TOKEN.encode("utf-8")):
+        raise HTTPException(status_code=403, detail="Invalid admin token")
+    
+    if drug1 or drug2:
+        if not drug1 or not drug2:
+            raise HTTPException(status_code=400, detail="Provide both drug1 and drug2, or neither")
+        pair = drug_pair_key(drug1, drug2)
+        removed = explanation_cache.invalidate(lambda key: key[0] == pair)
+        stored_removed = report_store.invalidate(*pair) if report_store else 0
+    else:
+        removed = explanation_cache.invalidate()
+        stored_removed = report_store.invalidate() if report_store else 0
+    
+    print(f"[Cache] Invalidated {removed} cached and {stored_removed} stored entries")
+    return {
+        "invalidated": removed,
+        "invalidated_stored": stored_removed,
+        "explanation_cache": explanation_cache.stats()
+    }
+
+@app.post("/api/predict", response_model=PredictionResponse)
+async def predict_interaction(request: PredictionRequest):
+    """
+    Predict drug-drug interaction with AI-generated unique explanations
+    """
+    try:
+        drug1 = request.drug1.strip().title()
+        drug2 = request.drug2.strip().title()
+        
+        if not drug1 or not drug2:
+            raise HTTPException(status_code=400, detail="Both drug names are required")
+        
+        print(f"\n{'='*60}")
+        print(f"[ANALYSIS START] {drug1} + {drug2}")
+        print(f"{'='*60}")
+        
+        deadline = asyncio.get_running_loop().time() + PREDICT_DEADLINE_SECONDS
+        
+        # Step 1: Classify interaction
+        print("[Step 1/2] Classifying interaction severity...")
+        interaction_type, severity = await classify_interaction(drug1, drug2)
+        
+        # Step 2: Generate patient and professional explanations concurrently
+        print("[Step 2/2] Generating patient and professional explanations with BioGPT...")
+        patient_report, professional_report, sections = await generate_explanations(
+            drug1, drug2, interaction_type, severity, deadline
+        )
+        
+        print(f"[ANALYSIS COMPLETE] Type: {interaction_type}, Severity: {severity}")
+        print(f"{'='*60}\n")
+        
+        return PredictionResponse(
+            prediction=interaction_type,
+            severity=severity,
+            patient_report=patient_report,
+            professional_report=professional_report,
+            sections=sections
+        )
+        
+    except HTTPException:
+        raise
+    except Exception as e:
+        print(f"[ERROR] {str(e)}")
+        import traceback
+        traceback.print_exc()
+        raise HTTPException(
+            status_code=500,
+            detail="Analysis failed. The AI models may be loading (cold start - typically takes 30-60 seconds on first request). Please try again in a moment."
+        )
+
+async def predict_batch_item(index: int, pair: PredictionRequest) -> dict:
+    """Classify and explain one batch pair, returning its NDJSON record"""
+    drug1 = pair.drug1.strip().title()
+    drug2 = pair.drug2.strip().title()
+    try:
+        # Each pair gets the full deadline from the moment its generation starts
+        deadline = asyncio.get_running_loop().time() + PREDICT_DEADLINE_SECONDS
+        interaction_type, severity = await classify_interaction(drug1, drug2)
+        patient_report, professional_report, sections = await generate_explanations(
+            drug1, drug2, interaction_type, severity, deadline
+        )
+        result = PredictionResponse(
+            prediction=interaction_type,
+            severity=severity,
+            patient_report=patient_report,
+            professional_report=professional_report,
+            sections=sections
+        )
+        return {"index": index, "drug1": drug1, "drug2": drug2, **result.model_dump()}
+    except Exception as e:
+        print(f"[Batch] Pair {index + 1} failed: {str(e)}")
+        return {"index": index, "drug1": drug1, "drug2": drug2, "error": "Analysis failed"}
+
+async def stream_batch_predictions(pairs: list):
+    """Yield one NDJSON line per pair, in completion order"""
+    predictions = (predict_batch_item(index, pair) for index, pair in enumerate(pairs))
+    completed = 0
+    async for record in bounded_as_completed(predictions, PREDICT_BATCH_CONCURRENCY):
+        completed += 1
+        yield json.dumps(record) + "\n"
+    print(f"[Batch] Completed {completed} pairs")
+
+def sse_event(event: str, data: dict) -> str:
+    return f"event: {event}\ndata: {json.dumps(data)}\n\n"
+
+async def stream_prediction(drug1: str, drug2: str):
+    """
+    Server-sent events for one prediction:
+
+    - classification: {"prediction", "severity"}, sent as soon as it is known
+    - token: {"section", "text"} for each generated token of either report
+    - section: {"section", "text", "source"}, the final text of one report,
+      which replaces its streamed tokens (a fallback template if generation
+      failed, stalled or missed the deadline)
+    - done: the complete PredictionResponse
+    """
+    deadline = asyncio.get_running_loop().time() + PREDICT_DEADLINE_SECONDS
+    interaction_type, severity = await classify_interaction(drug1, drug2)
+    yield sse_event("classification", {"prediction": interaction_type, "severity": severity})
+    
+    events = asyncio.Queue()
+    
+    async def explain(section, label, kind, generate, parameters, fallback):
+        def on_token(text):
+            events.put_nowait(("token", {"section": section, "text": text}))
+        
+        text = await _generate_before_deadline(
+            label,
+            cached_explanation(kind, generate, parameters, drug1, drug2, interaction_type, severity, on_token=on_token),
+            deadline
+        )
+        source = "generated" if text else "fallback"
+        if not text:
+            text = fallback(drug1, drug2, interaction_type, severity)
+        events.put_nowait(("section", {"section": section, "text": text, "source": source}))
+        return text, source
+    
+    tasks = [
+        asyncio.ensure_future(explain(
+            "patient_report", "Patient Report", "patient",
+            generate_patient_explanation, PATIENT_GENERATION_PARAMETERS, fallback_patient_explanation
+        )),
+        asyncio.ensure_future(explain(
+            "professional_report", "Professional Report", "professional",
+            generate_professional_explanation, PROFESSIONAL_GENERATION_PARAMETERS, fallback_professional_explanation
+        ))
+    ]
+    try:
+        remaining = len(tasks)
+        while remaining:
+            event, data = await events.get()
+            if event == "section":
+                remaining -= 1
+            yield sse_event(event, data)
+        
+        (patient_report, patient_source), (professional_report, professional_source) = [task.result() for task in tasks]
+        result = PredictionResponse(
+            prediction=interaction_type,
+            severity=severity,
+            patient_report=patient_report,
+            professional_report=professional_report,
+            sections={"patient_report": patient_source, "professional_report": professional_source}
+        )
+        yield sse_event("done", result.model_dump())
+        print(f"[ANALYSIS COMPLETE] Type: {interaction_type}, Severity: {severity} (streamed)")
+    finally:
+        for task in tasks:
+            task.cancel()
+
+@app.post("/api/predict/stream")
+async def predict_interaction_stream(request: PredictionRequest):
+    """
+    Predict drug-drug interaction, streaming the classification and then the
+    explanations token by token as server-sent events
+    """
+    drug1 = request.drug1.strip().title()
+    drug2 = request.drug2.strip().title()
+    
+    if not drug1 or not drug2:
+        raise HTTPException(status_code=400, detail="Both drug names are required")
+    
+    print(f"[ANALYSIS START] {drug1} + {drug2} (streaming)")
+    return StreamingResponse(
+        stream_prediction(drug1, drug2),
+        media_type="text/event-stream",
+        headers={
+            "Cache-Control": "no-cache",
+            "X-Accel-Buffering": "no"
+        }
+    )
+
+@app.post("/api/predict/batch")
+async def predict_batch(request: BatchPredictionRequest):
+    """
+    Predict interactions for many drug pairs, streamed as NDJSON.
+
+    Each line carries the pair's index in the request, so clients can match
+    results that arrive out of order as soon as each pair completes.
+    """
+    if not request.pairs:
+        raise HTTPException(status_code=400, detail="At least one pair is required")
+    if len(request.pairs) > PREDICT_BATCH_MAX_PAIRS:
+        raise HTTPException(
+            status_code=400,
+            detail=f"At most {PREDICT_BATCH_MAX_PAIRS} pairs can be predicted at once"
+        )
+    for index, pair in enumerate(request.pairs):
+        if not pair.drug1.strip() or not pair.drug2.strip():
+            raise HTTPException(status_code=400, detail=f"Pair {index + 1}: both drug names are required")
+    
+    print(f"[Batch] Predicting {len(request.pairs)} pairs")
+    return StreamingResponse(
+        stream_batch_predictions(request.pairs),
+        media_type="application/x-ndjson"
+    )
+
+@app.post("/api/regimen", response_model=RegimenResponse)
+async def analyze_regimen(request: RegimenRequest):
+    """
+    Analyze every pair in a multi-drug regimen and rank the interactions.
+    Explanations are generated only for pairs at or above explain_severity.
+    """
+    explain_severity = (request.explain_severity or REGIMEN_EXPLAIN_SEVERITY).strip().title()
+    if explain_severity not in SEVERITY_RANK:
+        raise HTTPException(
+            status_code=400,
+            detail=f"explain_severity must be one of: {', '.join(SEVERITY_RANK)}"
+        )
+    
+    if len(request.drugs) > REGIMEN_MAX_DRUGS:
+        raise HTTPException(
+            status_code=400,
+            detail=f"At most {REGIMEN_MAX_DRUGS} drugs can be analyzed at once"
+        )
+    
+    regimen, duplicates, pairs = classify_regimen(request.drugs)
+    if len(regimen) < 2:
+        raise HTTPException(status_code=400, detail="At least two distinct drugs are required")
+    
+    print(f"[Regimen] {len(regimen)} drugs, {len(pairs)} pairs, {len(duplicates)} duplicates merged")
+    
+    matrix = [[None] * len(regimen) for _ in regimen]
+    interactions = []
+    for i, j, interaction_type, severity, description in pairs:
+        matrix[i][j] = matrix[j][i] = severity
+        interactions.append(RegimenInteraction(
+            drug1=regimen[i],
+            drug2=regimen[j],
+            prediction=interaction_type,
+            severity=severity,
+            description=description
+        ))
+    interactions.sort(key=lambda interaction: -SEVERITY_RANK.get(interaction.severity, 0))
+    
+    # Explain the pairs at or above the threshold, all within one request deadline
+    deadline = asyncio.get_running_loop().time() + PREDICT_DEADLINE_SECONDS
+    threshold = SEVERITY_RANK[explain_severity]
+    to_explain = [
+        interaction for interaction in interactions
+        if SEVERITY_RANK.get(interaction.severity, 0) >= threshold
+    ]
+    
+    async def explain(interaction):
+        interaction.patient_report, interaction.professional_report, interaction.sections = await generate_explanations(
+            interaction.drug1, interaction.drug2, interaction.prediction, interaction.severity, deadline
+        )
+    
+    async for _ in bounded_as_completed((explain(interaction) for interaction in to_explain), PREDICT_BATCH_CONCURRENCY):
+        pass
+    
+    print(f"[Regimen] Explained {len(to_explain)} pairs at or above {explain_severity}")
+    
+    return RegimenResponse(
+        drugs=regimen,
+        duplicates=duplicates,
+        matrix=matrix,
+        interactions=interactions
+    )
+
+def session_pair_key(entity1: str, entity2: str) -> str:
+    return "\t".join(sorted((entity1, entity2)))
+
+async def session_pair_result(drug1: str, drug2: str, previous: dict, threshold: int, deadline: float) -> dict:
+    """
+    Classify one session pair. Explanations are generated only when the pair
+    is new or its classification changed, and only at or above threshold.
+    """
+    interaction_type, severity = await classify_interaction(drug1, drug2)
+    if previous and (previous["prediction"], previous["severity"]) == (interaction_type, severity):
+        return previous
+    
+    result = {
+        "drug1": drug1,
+        "drug2": drug2,
+        "prediction": interaction_type,
+        "severity": severity,
+        "patient_report": "",
+        "professional_report": "",
+        "sections": {}
+    }
+    if SEVERITY_RANK.get(severity, 0) >= threshold:
+        result["patient_report"], result["professional_report"], result["sections"] = await generate_explanations(
+            drug1, drug2, interaction_type, severity, deadline
+        )
+    return result
+
+async def apply_session_changes(session: dict, add: list = (), remove: list = ()) -> dict:
+    """
+    Update a session document in place and return the diff.
+
+    Removing a drug drops its pairs. Adding one computes only its pairs
+    with the drugs already listed. If the classification rules were
+    reloaded since the session was last computed, the existing pairs are
+    re-classified too, and only the ones whose result changed are
+    re-explained and reported.
+    """
+    interaction_index = rule_sets.current.index
+    rules_version = rule_sets.current.version
+    threshold = SEVERITY_RANK[session["explain_severity"]]
+    deadline = asyncio.get_running_loop().time() + PREDICT_DEADLINE_SECONDS
+    diff = {"added": [], "changed": [], "removed": []}
+    
+    listed = {drug["entity"]: drug for drug in session["drugs"]}
+    for name in remove:
+        entity = regimen_entity(interaction_index, normalize_drug_name(name.strip()))
+        if listed.pop(entity, None) is None:
+            continue
+        for key in [key for key in session["pairs"] if entity in key.split("\t")]:
+            removed = session["pairs"].pop(key)
+            diff["removed"].append({
+                "drug1": removed["drug1"],
+                "drug2": removed["drug2"],
+                "prediction": removed["prediction"],
+                "severity": removed["severity"]
+            })
+    
+    # (key, drug1, drug2, previous result) for every pair that needs classifying
+    work = []
+    if session["rules_version"] != rules_version:
+        for key, previous in session["pairs"].items():
+            work.append((key, previous["drug1"], previous["drug2"], previous))
+    for name in add:
+        display = name.strip().title()
+        if not display:
+            continue
+        entity = regimen_entity(interaction_index, normalize_drug_name(display))
+        if entity in listed:
+            continue
+        for other in listed.values():
+            work.append((session_pair_key(other["entity"], entity), other["name"], display, None))
+        listed[entity] = {"name": display, "entity": entity}
+    
+    async def classify_pair(key, drug1, drug2, previous):
+        return key, previous, await session_pair_result(drug1, drug2, previous, threshold, deadline)
+    
+    pairs = (classify_pair(*item) for item in work)
+    async for key, previous, result in bounded_as_completed(pairs, PREDICT_BATCH_CONCURRENCY):
+        session["pairs"][key] = result
+        if previous is None:
+            diff["added"].append(result)
+        elif result is not previous:
+            diff["changed"].append({**result, "previous_severity": previous["severity"]})
+    
+    session["drugs"] = list(listed.values())
+    session["rules_version"] = rules_version
+    print(f"[Sessions] {len(work)} pairs classified, "
+          f"{len(diff['added'])} added, {len(diff['changed'])} changed, {len(diff['removed'])} removed")
+    return diff
+
+def session_response(session_id: str, version: int, session: dict, diff: dict) -> SessionResponse:
+    interactions = sorted(session["pairs"].values(), key=lambda pair: -SEVERITY_RANK.get(pair["severity"], 0))
+    return SessionResponse(
+        session_id=session_id,
+        version=version,
+        drugs=[drug["name"] for drug in session["drugs"]],
+        interactions=interactions,
+        diff=diff
+    )
+
+def load_session(session_id: str) -> tuple:
+    if not session_store:
+        raise HTTPException(status_code=503, detail="Sessions are disabled on this server")
+    found = session_store.get(session_id)
+    if found is None:
+        raise HTTPException(status_code=404, detail="Session not found or expired")
+    return found
+
+async def modify_session(session_id: str, add: list = (), remove: list = ()) -> SessionResponse:
+    version, session = load_session(session_id)
+    if len(session["drugs"]) + len(add) > REGIMEN_MAX_DRUGS:
+        raise HTTPException(
+            status_code=400,
+            detail=f"A session can hold at most {REGIMEN_MAX_DRUGS} drugs"
+        )
+    rules_version = session["rules_version"]
+    diff = await apply_session_changes(session, add=add, remove=remove)
+    if not any(diff.values()) and session["rules_version"] == rules_version:
+        return session_response(session_id, version, session, diff)
+    try:
+        session_store.update(session_id, version, session)
+    except SessionConflict:
+        raise HTTPException(status_code=409, detail="Session was modified by another request, please retry")
+    return session_response(session_id, version + 1, session, diff)
+
+@app.post("/api/sessions", response_model=SessionResponse)
+async def create_session(request: SessionCreateRequest):
+    """
+    Start a medication-list session, optionally with an initial list of drugs
+    """
+    if not session_store:
+        raise HTTPException(status_code=503, detail="Sessions are disabled on this server")
+    explain_severity = (request.explain_severity or REGIMEN_EXPLAIN_SEVERITY).strip().title()
+    if explain_severity not in SEVERITY_RANK:
+        raise HTTPException(
+            status_code=400,
+            detail=f"explain_severity must be one of: {', '.join(SEVERITY_RANK)}"
+        )
+    if len(request.drugs) > REGIMEN_MAX_DRUGS:
+        raise HTTPException(
+            status_code=400,
+            detail=f"A session can hold at most {REGIMEN_MAX_DRUGS} drugs"
+        )
+    
+    session = {
+        "drugs": [],
+        "pairs": {},
+        "explain_severity": explain_severity,
+        "rules_version": rule_sets.current.version
+    }
+    diff = await apply_session_changes(session, add=request.drugs)
+    session_id = session_store.create(session)
+    print(f"[Sessions] Created {session_id} with {len(session['drugs'])} drugs")
+    return session_response(session_id, 1, session, diff)
+
+@app.get("/api/sessions/{session_id}", response_model=SessionResponse)
+def get_session(session_id: str):
+    version, session = load_session(session_id)
+    return session_response(session_id, version, session, {"added": [], "changed": [], "removed": []})
+
+@app.post("/api/sessions/{session_id}/drugs", response_model=SessionResponse)
+async def add_session_drugs(session_id: str, request: SessionDrugsRequest):
+    """
+    Add drugs to a session, computing only the pairs they form with the current list
+    """
+    return await modify_session(session_id, add=request.drugs)
+
+@app.delete("/api/sessions/{session_id}/drugs/{drug}", response_model=SessionResponse)
+async def remove_session_drug(session_id: str, drug: str):
+    """
+    Remove a drug from a session along with its pairs
+    """
+    return await modify_session(session_id, remove=[drug])
+
+@app.post("/api/sessions/{session_id}/check", response_model=SessionResponse)
+async def recheck_session(session_id: str):
+    """
+    Re-check a session. Nothing is recomputed unless the classification rules changed.
+    """
+    return await modify_session(session_id)
+
+@app.delete("/api/sessions/{session_id}")
+def delete_session(session_id: str):
+    if not session_store:
+        raise HTTPException(status_code=503, detail="Sessions are disabled on this server")
+    if not session_store.delete(session_id):
+        raise HTTPException(status_code=404, detail="Session not found or expired")
+    return {"deleted": session_id}
+
+def report_filename(report_type: str, drug1: str, drug2: str) -> str:
+    """PDF file name for a report, safe as a ZIP entry name and in a Content-Disposition header"""
+    parts = (report_type.title(), drug1, drug2)
+    return "DDI_Report_" + "_".join(re.sub(r"[^A-Za-z0-9._-]+", "_", part) for part in parts) + ".pdf"
+
+@app.post("/api/generate-pdf")
+async def generate_pdf_report(request: PDFRequest, if_none_match: str = Header(default="")):
+    """
+    Generate detailed PDF report based on user type (patient or professional)
+    """
+    try:
+        drug1 = request.drug1.strip()
+        drug2 = request.drug2.strip()
+        report_type = request.report_type.lower()
+        
+        if report_type not in ["patient", "professional"]:
+            raise HTTPException(
+                status_code=400,
+                detail="report_type must be 'patient' or 'professional'"
+            )
+        
+        prediction_data = await asyncio.to_thread(fill_from_report_store, drug1, drug2, report_type, request.prediction_data)
+        
+        filename = report_filename(report_type, drug1, drug2)
+        
+        # The PDF is fully determined by its inputs, so their hash is both cache key and ETag
+        cache_key = pdf_cache_key(report_type, drug1, drug2, prediction_data)
+        etag = f'"{cache_key}"'
+        if etag_matches(if_none_match, etag):
+            print(f"[PDF Not Modified] {filename}")
+            return Response(status_code=304, headers={"ETag": etag})
+        
+        pdf_bytes = await render_report_pdf(cache_key, report_type, drug1, drug2, prediction_data)
+        print(f"[PDF Generated] {filename}")
+        
+        # Return PDF as streaming response
+        return StreamingResponse(
+            BytesIO(pdf_bytes),
+            media_type="application/pdf",
+            headers={
+                "Content-Disposition": f'attachment; filename="{filename}"',
+                "ETag": etag,
+                "Cache-Control": "private, no-cache"
+            }
+        )
+        
+    except HTTPException:
+        raise
+    except RenderPoolFull as e:
+        print(f"[PDF Busy] {str(e)}")
+        raise HTTPException(
+            status_code=503,
+            detail="PDF generation is busy, please try again shortly.",
+            headers={"Retry-After": "2"}
+        )
+    except Exception as e:
+        print(f"[PDF Error] {str(e)}")
+        import traceback
+        traceback.print_exc()
+        raise HTTPException(
+            status_code=500,
+            detail=f"PDF generation failed: {str(e)}"
+        )
+
+async def render_bulk_item(index: int, item: PDFRequest):
+    """Render one bulk export item, returning (index, filename, pdf_bytes, error)"""
+    drug1 = item.drug1.strip()
+    drug2 = item.drug2.strip()
+    report_type = item.report_type.lower()
+    filename = f"{index + 1:04d}_{report_filename(report_type, drug1, drug2)}"
+    try:
+        prediction_data = await asyncio.to_thread(fill_from_report_store, drug1, drug2, report_type, item.prediction_data)
+        cache_key = pdf_cache_key(report_type, drug1, drug2, prediction_data)
+        while True:
+            try:
+                pdf_bytes = await render_report_pdf(cache_key, report_type, drug1, drug2, prediction_data)
+                return index, filename, pdf_bytes, None
+            except RenderPoolFull:
+                # Other requests filled the pool; an export waits its turn rather than failing
+                await asyncio.sleep(0.5)
+    except Exception as e:
+        print(f"[Bulk PDF] Item {index + 1} failed: {str(e)}")
+        return index, filename, None, str(e)
+
+async def stream_pdf_archive(items: list):
+    """
+    Yield a ZIP archive of the rendered reports, one entry as each render finishes.
+
+    At most BULK_PDF_CONCURRENCY renders are in flight and each finished PDF
+    is written out immediately, so memory stays bounded however many items
+    are requested. A manifest.json entry listing every item and any failure
+    closes the archive.
+    """
+    archive = ZipStream()
+    manifest = [None] * len(items)
+    renders = (render_bulk_item(index, item) for index, item in enumerate(items))
+    async for index, filename, pdf_bytes, error in bounded_as_completed(renders, BULK_PDF_CONCURRENCY):
+        item = items[index]
+        manifest[index] = {
+            "drug1": item.drug1,
+            "drug2": item.drug2,
+            "report_type": item.report_type,
+            "file": filename if pdf_bytes else None,
+            "error": error
+        }
+        if pdf_bytes:
+            yield archive.add(filename, pdf_bytes)
+    
+    yield archive.add("manifest.json", json.dumps(manifest, indent=2).encode("utf-8"))
+    yield archive.close()
+    print(f"[Bulk PDF] Streamed {len(items)} reports")
+
+@app.post("/api/generate-pdf/bulk")
+async def generate_pdf_bulk(request: BulkPDFRequest):
+    """
+    Generate PDF reports for many drug pairs, streamed back as a ZIP archive
+    """
+    if not request.items:
+        raise HTTPException(status_code=400, detail="At least one item is required")
+    if len(request.items) > BULK_PDF_MAX_ITEMS:
+        raise HTTPException(
+            status_code=400,
+            detail=f"At most {BULK_PDF_MAX_ITEMS} items can be exported at once"
+        )
+    for index, item in enumerate(request.items):
+        if not item.drug1.strip() or not item.drug2.strip():
+            raise HTTPException(status_code=400, detail=f"Item {index + 1}: both drug names are required")
+        if item.report_type.lower() not in ["patient", "professional"]:
+            raise HTTPException(
+                status_code=400,
+                detail=f"Item {index + 1}: report_type must be 'patient' or 'professional'"
+            )
+    
+    print(f"[Bulk PDF] Exporting {len(request.items)} reports")
+    return StreamingResponse(
+        stream_pdf_archive(request.items),
+        media_type="application/zip",
+        headers={
+            "Content-Disposition": "attachment; filename=DDI_Reports.zip"
+        }
+    )
@@ -0,0 +1,141 @@
+import argparse
+import json
+import os
+import subprocess
+import sys
+import threading
+import time
+
+# CPU inference profile for local generation. Every worker process gets its own
+# torch thread pools, so with several workers per node each should only use its
+# share of the cores: intra-op threads default to cores // WEB_CONCURRENCY
+# (0 leaves torch's default of one thread per core).
+WEB_CONCURRENCY = int(os.getenv("WEB_CONCURRENCY", "1"))
+GENERATOR_INTRA_OP_THREADS = int(os.getenv("GENERATOR_INTRA_OP_THREADS", "0")) or (
+    max((os.cpu_count() or 1) // WEB_CONCURRENCY, 1) if WEB_CONCURRENCY > 1 else 0
+)
+GENERATOR_INTER_OP_THREADS = int(os.getenv("GENERATOR_INTER_OP_THREADS", "1"))
+# Dynamic int8 quantization of the generator's linear layers
+GENERATOR_QUANTIZE = os.getenv("GENERATOR_QUANTIZE", "false").lower() == "true"
+
+_threads_applied = False
+_threads_lock = threading.Lock()
+
+
+def profile() -> dict:
+    return {
+        "quantize": GENERATOR_QUANTIZE,
+        "intra_op_threads": GENERATOR_INTRA_OP_THREADS or None,
+        "inter_op_threads": GENERATOR_INTER_OP_THREADS or None,
+    }
+
+
+def apply_threads(intra_op: int = GENERATOR_INTRA_OP_THREADS, inter_op: int = GENERATOR_INTER_OP_THREADS):
+    """
+    Size this process's torch thread pools, which every model in it shares.
+    Only the first call has any effect, so it is made before any model loads.
+    """
+    global _threads_applied
+    with _threads_lock:
+        if _threads_applied:
+            return
+        import torch
+
+        _threads_applied = True
+        if intra_op:
+            torch.set_num_threads(intra_op)
+        if inter_op:
+            try:
+                torch.set_num_interop_threads(inter_op)
+            except RuntimeError as e:
+                # Only possible before torch has run any parallel work in this process
+                print(f"[CPU Profile] Could not set inter-op threads: {e}")
+        print(f"[CPU Profile] torch threads: intra-op {torch.get_num_threads()}, inter-op {torch.get_num_interop_threads()}")
+
+
+def optimize_model(model, quantize: bool = GENERATOR_QUANTIZE):
+    """model in eval mode, with its Linear layers dynamically quantized to int8 if quantize"""
+    import torch
+
+    model.eval()
+    if quantize:
+        model = torch.ao.quantization.quantize_dynamic(model, {torch.nn.Linear}, dtype=torch.qint8)
+        print("[CPU Profile] Quantized linear layers to int8")
+    return model
+
+
+def load_generation_pipeline(model_id: str, quantize: bool = GENERATOR_QUANTIZE):
+    """A CPU text-generation pipeline for model_id with the profile applied"""
+    from transformers import pipeline
+
+    apply_threads()
+    generator = pipeline("text-generation", model=model_id, device=-1)
+    generator.model = optimize_model(generator.model, quantize)
+    return generator
+
+
+def measure(prompts: list, batch_size: int) -> dict:
+    """Generate prompts with report_generator in this process and report tokens/sec and memory"""
+    from api.ml import report_generator
+    from api.ml.ddi_predictor import peak_rss_mb
+
+    started = time.perf_counter()
+    tokenizer = report_generator.generator.get().tokenizer
+    load_seconds = time.perf_counter() - started
+
+    started = time.perf_counter()
+    reports = report_generator.generate_reports(prompts, batch_size=batch_size)
+    elapsed = time.perf_counter() - started
+    tokens = sum(len(tokenizer.tokenize(report)) for report in reports)
+    return {
+        "quantize": GENERATOR_QUANTIZE,
+        "intra_op_threads": GENERATOR_INTRA_OP_THREADS,
+        "inter_op_threads": GENERATOR_INTER_OP_THREADS,
+        "batch_size": batch_size,
+        "load_seconds": round(load_seconds, 1),
+        "tokens": tokens,
+        "seconds": round(elapsed, 2),
+        "tokens_per_second": round(tokens / elapsed, 1),
+        "rss_mb": peak_rss_mb(),
+    }
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark generator CPU profiles: tokens/sec and RSS per configuration")
+    parser.add_argument("--configs", default="fp32:0,int8:0",
+                        help="Comma-separated precision:intra_op_threads entries (0 = torch default), e.g. fp32:4,int8:4,int8:2")
+    parser.add_argument("--prompts", type=int, default=8, help="Number of report prompts per configuration")
+    parser.add_argument("--batch-size", type=int, default=None, help="Prompts per generate() call (default: REPORT_BATCH_SIZE)")
+    parser.add_argument("--run", action="store_true", help=argparse.SUPPRESS)
+    args = parser.parse_args(argv)
+
+    from api.services.prediction_service import report_prompts
+
+    drugs = ["warfarin", "aspirin", "simvastatin", "clarithromycin", "fluoxetine", "tramadol", "digoxin", "amiodarone"]
+    prompts = []
+    for i in range(args.prompts // 2 + 1):
+        prompts.extend(report_prompts(drugs[i % len(drugs)], drugs[(i * 3 + 1) % len(drugs)], "EFFECT"))
+    prompts = prompts[:args.prompts]
+
+    if args.run:
+        from api.ml.report_generator import REPORT_BATCH_SIZE
+        print(json.dumps(measure(prompts, args.batch_size or REPORT_BATCH_SIZE)))
+        return 0
+
+    # One fresh process per configuration: thread pools are fixed per process and RSS is a peak
+    for config in args.configs.split(","):
+        precision, _, threads = config.partition(":")
+        env = {**os.environ, "GENERATOR_QUANTIZE": "true" if precision == "int8" else "false",
+               "GENERATOR_INTRA_OP_THREADS": threads or "0", "WEB_CONCURRENCY": "1"}
+        command = [sys.executable, "-m", "api.ml.cpu_profile", "--run", "--prompts", str(args.prompts)]
+        if args.batch_size:
+            command += ["--batch-size", str(args.batch_size)]
+        output = subprocess.run(command, env=env, check=True, capture_output=True, text=True).stdout
+        stats = json.loads(output.strip().splitlines()[-1])
+        print(f"[CPU Profile] {precision} intra-op={stats['intra_op_threads'] or 'default'} batch={stats['batch_size']}: "
+              f"{stats['tokens_per_second']} tokens/s, RSS {stats['rss_mb']} MB, load {stats['load_seconds']}s")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
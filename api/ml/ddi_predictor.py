@@ -1,31 +1,151 @@
-from transformers import pipeline, AutoTokenizer
-
-# --- CRITICAL STEP ---
-# Replace 'YOUR_HF_USERNAME/biogpt-di-classifier-focal' with the model ID from Phase 1.
-MODEL_ID = "tekuru/biogpt-ddi-focal" 
-
-try:
-    tokenizer = AutoTokenizer.from_pretrained(MODEL_ID)
-    classifier = pipeline(
-        "text-classification",
-        model=MODEL_ID,
-        tokenizer=tokenizer
-    )
-except Exception as e:
-    print(f"Error loading fine-tuned DDI classifier model: {e}")
-    classifier = None
-
-def predict_interaction(drug1: str, drug2: str) -> str:
-    """Predicts the DDI type using the fine-tuned BioBERT model."""
-    if not classifier:
-        return "ERROR: DDI Prediction model not loaded."
-    
-    # Format the input with entity markers, exactly as done during training
-    text = f"Interaction between <e1>{drug1}</e1> and <e2>{drug2}</e2>."
-    
-    try:
-        result = classifier(text)
-        return result['label']
-    except Exception as e:
-        print(f"Error during prediction: {e}")
-        return "ERROR: Prediction failed."
\ No newline at end of file
+import argparse
+import json
+import os
+import sys
+import time
+from api.ml.cpu_profile import apply_threads
+from api.ml.micro_batcher import MicroBatcher
+from api.ml.model_holder import LazyModel, ModelUnavailable
+
+# --- CRITICAL STEP ---
+# Replace 'YOUR_HF_USERNAME/biogpt-di-classifier-focal' with the model ID from Phase 1.
+MODEL_ID = "tekuru/biogpt-ddi-focal" 
+
+# Concurrent predictions are classified together: up to DDI_BATCH_SIZE sentences per
+# forward pass, waiting at most DDI_BATCH_WAIT_MS for a batch to fill
+DDI_BATCH_SIZE = int(os.getenv("DDI_BATCH_SIZE", "16"))
+DDI_BATCH_WAIT_MS = float(os.getenv("DDI_BATCH_WAIT_MS", "5"))
+
+# Inference engine: "pytorch" (transformers pipeline) or "onnx" (ONNX Runtime on the
+# graph written by `python -m api.ml.onnx_classifier export DDI_ONNX_DIR`, int8 by default)
+DDI_ENGINE = os.getenv("DDI_ENGINE", "pytorch").lower()
+DDI_ONNX_DIR = os.getenv("DDI_ONNX_DIR", "models/ddi-onnx")
+DDI_ONNX_QUANTIZED = os.getenv("DDI_ONNX_QUANTIZED", "true").lower() == "true"
+
+def load_classifier():
+    if DDI_ENGINE == "onnx":
+        from api.ml.onnx_classifier import OnnxClassifier
+        return OnnxClassifier(DDI_ONNX_DIR, quantized=DDI_ONNX_QUANTIZED)
+
+    from transformers import pipeline, AutoTokenizer
+
+    # The process's torch thread pools are sized before the first model runs
+    apply_threads()
+    tokenizer = AutoTokenizer.from_pretrained(MODEL_ID)
+    return pipeline(
+        "text-classification",
+        model=MODEL_ID,
+        tokenizer=tokenizer
+    )
+
+# Loaded on first use (or by classifier.warmup()), never at import
+classifier = LazyModel("DDI classifier", load_classifier)
+
+def interaction_text(drug1: str, drug2: str) -> str:
+    # Format the input with entity markers, exactly as done during training
+    return f"Interaction between <e1>{drug1}</e1> and <e2>{drug2}</e2>."
+
+def classify_texts(texts: list) -> list:
+    """Labels for texts from one padded forward pass"""
+    results = classifier.get()(texts, batch_size=len(texts))
+    return [result['label'] for result in results]
+
+batcher = MicroBatcher(
+    classify_texts,
+    max_batch_size=DDI_BATCH_SIZE,
+    max_wait=DDI_BATCH_WAIT_MS / 1000,
+    # Characters stand in for tokens: the texts share one template, so this orders
+    # them nearly as well without tokenizing each text a second time
+    length=len,
+    name="ddi-batcher"
+)
+
+def predict_interaction(drug1: str, drug2: str) -> str:
+    """Predicts the DDI type using the fine-tuned BioBERT model.
+
+    Calls made concurrently from several threads share forward passes.
+    Raises ModelUnavailable if the classifier could not be loaded.
+    """
+    future = batcher.submit(interaction_text(drug1, drug2))
+    try:
+        return future.result()
+    except ModelUnavailable:
+        raise
+    except Exception as e:
+        print(f"Error during prediction: {e}")
+        return "ERROR: Prediction failed."
+
+def predict_many(pairs: list, batch_size: int = DDI_BATCH_SIZE) -> list:
+    """
+    Predicts the DDI type of every (drug1, drug2) pair, in order, for offline
+    use. Pairs are sorted by text length and classified batch_size at a time
+    so each batch pads as little as possible.
+    """
+    texts = [interaction_text(drug1, drug2) for drug1, drug2 in pairs]
+    order = sorted(range(len(texts)), key=lambda i: len(texts[i]))
+    labels = [None] * len(texts)
+    for start in range(0, len(order), batch_size):
+        chunk = order[start:start + batch_size]
+        for i, label in zip(chunk, classify_texts([texts[i] for i in chunk])):
+            labels[i] = label
+    return labels
+
+def peak_rss_mb() -> float:
+    # Unix only, and only needed by the benchmarks, so not imported with the module
+    import resource
+
+    # ru_maxrss is in kilobytes on Linux
+    return round(resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024, 1)
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Measure DDI classifier latency, throughput by batch size and memory")
+    parser.add_argument("--pairs", type=int, default=256, help="Number of generated drug pairs to classify")
+    parser.add_argument("--pairs-file", default=None, help="CSV/TSV of drug pairs to use instead")
+    parser.add_argument("--batch-sizes", default="1,2,4,8,16,32", help="Comma-separated batch sizes")
+    parser.add_argument("--json", action="store_true", help="Print one JSON result line, including the labels")
+    args = parser.parse_args(argv)
+
+    if args.pairs_file:
+        from api.utils.knowledge_base import read_pairs
+        pairs = [(drug1, drug2) for drug1, drug2, _, _ in read_pairs(args.pairs_file)]
+    else:
+        drugs = ["warfarin", "aspirin", "ibuprofen", "simvastatin", "clarithromycin", "metformin",
+                 "lisinopril", "digoxin", "fluoxetine", "tramadol", "amiodarone", "ketoconazole"]
+        pairs = [(drugs[i % len(drugs)], drugs[(i * 5 + 1) % len(drugs)]) for i in range(args.pairs)]
+
+    classifier.get()
+    predict_many(pairs[:8])
+
+    latencies = []
+    for drug1, drug2 in pairs[:50]:
+        started = time.perf_counter()
+        classify_texts([interaction_text(drug1, drug2)])
+        latencies.append((time.perf_counter() - started) * 1000)
+    latencies.sort()
+
+    throughput = {}
+    for batch_size in (int(size) for size in args.batch_sizes.split(",")):
+        started = time.perf_counter()
+        labels = predict_many(pairs, batch_size=batch_size)
+        throughput[batch_size] = round(len(pairs) / (time.perf_counter() - started), 1)
+        if not args.json:
+            print(f"[DDI Benchmark] batch_size={batch_size}: {throughput[batch_size]} pairs/s")
+
+    best = max(throughput, key=throughput.get)
+    stats = {
+        "engine": DDI_ENGINE,
+        "quantized": DDI_ENGINE == "onnx" and DDI_ONNX_QUANTIZED,
+        "latency_p50_ms": round(latencies[len(latencies) // 2], 2),
+        "latency_p95_ms": round(latencies[min(int(0.95 * len(latencies)), len(latencies) - 1)], 2),
+        "batch_size": best,
+        "pairs_per_second": throughput[best],
+        "rss_mb": peak_rss_mb(),
+    }
+    if args.json:
+        print(json.dumps({**stats, "throughput": throughput, "labels": labels}))
+    else:
+        print(f"[DDI Benchmark] {stats}")
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,103 @@
+import queue
+import threading
+import time
+from concurrent.futures import Future
+
+
+class MicroBatcher:
+    """
+    Groups concurrent single-item calls into batched model calls.
+
+    submit(item) queues the item and returns a Future; async callers await
+    asyncio.wrap_future(batcher.submit(item)). A worker thread takes the
+    first queued item, waits up to max_wait seconds for up to
+    max_batch_size items in total, and also takes whatever else queued up
+    while the previous batch ran (up to window batches' worth). Those items
+    are sorted by length(item) so each batch pads to similar lengths, then
+    run_batch(items) runs once per batch and must return one result per
+    item. If it raises, every caller in that batch gets the exception.
+    """
+
+    def __init__(self, run_batch, max_batch_size: int = 16, max_wait: float = 0.005,
+                 length=None, window: int = 4, name: str = "micro-batcher"):
+        self.run_batch = run_batch
+        self.max_batch_size = max_batch_size
+        self.max_wait = max_wait
+        self.length = length
+        self.window = window
+        self.name = name
+        self._queue = queue.Queue()
+        self._thread = None
+        self._start_lock = threading.Lock()
+        self.items = 0
+        self.batches = 0
+        self.max_queued = 0
+
+    def submit(self, item) -> Future:
+        future = Future()
+        self._queue.put((item, future))
+        self.max_queued = max(self.max_queued, self._queue.qsize())
+        if self._thread is None:
+            with self._start_lock:
+                if self._thread is None:
+                    self._thread = threading.Thread(target=self._run, name=self.name, daemon=True)
+                    self._thread.start()
+        return future
+
+    def _collect(self) -> list:
+        pending = [self._queue.get()]
+        deadline = time.monotonic() + self.max_wait
+        while len(pending) < self.max_batch_size:
+            timeout = deadline - time.monotonic()
+            if timeout <= 0:
+                break
+            try:
+                pending.append(self._queue.get(timeout=timeout))
+            except queue.Empty:
+                break
+        while len(pending) < self.max_batch_size * self.window:
+            try:
+                pending.append(self._queue.get_nowait())
+            except queue.Empty:
+                break
+        # Callers that gave up while their item was queued are dropped here
+        return [(item, future) for item, future in pending if future.set_running_or_notify_cancel()]
+
+    def _run(self):
+        while True:
+            pending = self._collect()
+            if not pending:
+                continue
+            try:
+                if self.length is not None and len(pending) > 1:
+                    pending.sort(key=lambda entry: self.length(entry[0]))
+            except Exception as e:
+                for _, future in pending:
+                    future.set_exception(e)
+                continue
+
+            for start in range(0, len(pending), self.max_batch_size):
+                batch = pending[start:start + self.max_batch_size]
+                self.batches += 1
+                self.items += len(batch)
+                try:
+                    results = list(self.run_batch([item for item, _ in batch]))
+                    if len(results) != len(batch):
+                        raise ValueError(f"run_batch returned {len(results)} results for {len(batch)} items")
+                except Exception as e:
+                    for _, future in batch:
+                        future.set_exception(e)
+                    continue
+                for (_, future), result in zip(batch, results):
+                    future.set_result(result)
+
+    def stats(self) -> dict:
+        return {
+            "max_batch_size": self.max_batch_size,
+            "max_wait_ms": round(self.max_wait * 1000, 1),
+            "items": self.items,
+            "batches": self.batches,
+            "mean_batch_size": round(self.items / self.batches, 2) if self.batches else None,
+            "queued": self._queue.qsize(),
+            "max_queued": self.max_queued,
+        }
@@ -0,0 +1,91 @@
+import threading
+import time
+
+UNLOADED = "unloaded"
+LOADING = "loading"
+READY = "ready"
+FAILED = "failed"
+
+
+class ModelUnavailable(Exception):
+    """Raised when a model could not be loaded"""
+
+
+class LazyModel:
+    """
+    Holds a model that is loaded on first use instead of at import.
+
+    get() loads it with loader() the first time (callers arriving meanwhile
+    wait on the same load) and returns it from then on. warmup() starts the
+    same load on a background thread so a worker can serve requests that
+    need no model while it loads. A failed load raises ModelUnavailable
+    with the cause; it is retried by the first get() after retry_seconds.
+    """
+
+    def __init__(self, name: str, loader, retry_seconds: float = 30.0):
+        self.name = name
+        self.loader = loader
+        self.retry_seconds = retry_seconds
+        self.state = UNLOADED
+        self.last_error = None
+        self.load_seconds = None
+        self.attempts = 0
+        self._model = None
+        self._failed_at = 0.0
+        self._lock = threading.Lock()
+
+    @property
+    def ready(self) -> bool:
+        return self.state == READY
+
+    def get(self):
+        if self.state == READY:
+            return self._model
+        with self._lock:
+            if self.state == READY:
+                return self._model
+            if self.state == FAILED and time.monotonic() - self._failed_at < self.retry_seconds:
+                raise ModelUnavailable(f"{self.name} failed to load: {self.last_error}")
+
+            self.state = LOADING
+            self.attempts += 1
+            started = time.perf_counter()
+            try:
+                model = self.loader()
+            except Exception as e:
+                print(f"[Model] Error loading {self.name}: {e}")
+                self.state = FAILED
+                self.last_error = str(e)
+                self._failed_at = time.monotonic()
+                raise ModelUnavailable(f"{self.name} failed to load: {e}") from e
+
+            self._model = model
+            self.load_seconds = time.perf_counter() - started
+            self.last_error = None
+            self.state = READY
+            print(f"[Model] Loaded {self.name} in {self.load_seconds:.1f}s")
+            return model
+
+    def warmup(self):
+        """Load in the background unless the model is already loaded or loading"""
+        if self.state in (READY, LOADING):
+            return None
+
+        def load():
+            try:
+                self.get()
+            except ModelUnavailable:
+                pass
+
+        thread = threading.Thread(target=load, name=f"warmup-{self.name}", daemon=True)
+        thread.start()
+        return thread
+
+    def stats(self) -> dict:
+        return {
+            "name": self.name,
+            "state": self.state,
+            "attempts": self.attempts,
+            "load_seconds": round(self.load_seconds, 2) if self.load_seconds is not None else None,
+            "last_error": self.last_error,
+        }
@@ -0,0 +1,143 @@
+import argparse
+import json
+import os
+import subprocess
+import sys
+
+MODEL_FILE = "model.onnx"
+QUANTIZED_MODEL_FILE = "model.int8.onnx"
+
+
+def export_classifier(model_id: str, output_dir: str, quantize: bool = True) -> dict:
+    """
+    Export a sequence-classification model to ONNX in output_dir, alongside
+    its tokenizer and config, plus a dynamically int8-quantized copy of the
+    graph if quantize. Returns the paths written.
+    """
+    import torch
+    from transformers import AutoModelForSequenceClassification, AutoTokenizer
+
+    os.makedirs(output_dir, exist_ok=True)
+    tokenizer = AutoTokenizer.from_pretrained(model_id)
+    model = AutoModelForSequenceClassification.from_pretrained(model_id).eval()
+    tokenizer.save_pretrained(output_dir)
+    model.config.save_pretrained(output_dir)
+    model.config.return_dict = False
+
+    sample = tokenizer(["Interaction between <e1>a</e1> and <e2>b</e2>."] * 2, return_tensors="pt", padding=True)
+    paths = {"model": os.path.join(output_dir, MODEL_FILE)}
+    with torch.inference_mode():
+        torch.onnx.export(
+            model,
+            (sample["input_ids"], sample["attention_mask"]),
+            paths["model"],
+            input_names=["input_ids", "attention_mask"],
+            output_names=["logits"],
+            dynamic_axes={
+                "input_ids": {0: "batch", 1: "sequence"},
+                "attention_mask": {0: "batch", 1: "sequence"},
+                "logits": {0: "batch"},
+            },
+            opset_version=17,
+        )
+    print(f"[ONNX Export] {model_id} -> {paths['model']}")
+
+    if quantize:
+        from onnxruntime.quantization import QuantType, quantize_dynamic
+
+        paths["quantized"] = os.path.join(output_dir, QUANTIZED_MODEL_FILE)
+        quantize_dynamic(paths["model"], paths["quantized"], weight_type=QuantType.QInt8)
+        print(f"[ONNX Export] int8 weights -> {paths['quantized']}")
+    return paths
+
+
+class OnnxClassifier:
+    """
+    ONNX Runtime stand-in for a transformers text-classification pipeline:
+    called with a list of texts it returns [{"label", "score"}] per text,
+    and exposes the tokenizer, so the DDI predictor can use either engine.
+    """
+
+    def __init__(self, directory: str, quantized: bool = True, threads: int = 0):
+        import onnxruntime
+        from transformers import AutoConfig, AutoTokenizer
+
+        path = os.path.join(directory, QUANTIZED_MODEL_FILE if quantized else MODEL_FILE)
+        if not os.path.exists(path):
+            raise FileNotFoundError(f"{path} not found, run: python -m api.ml.onnx_classifier export {directory}")
+        options = onnxruntime.SessionOptions()
+        if threads:
+            options.intra_op_num_threads = threads
+        self.session = onnxruntime.InferenceSession(path, options, providers=["CPUExecutionProvider"])
+        self.tokenizer = AutoTokenizer.from_pretrained(directory)
+        self.id2label = AutoConfig.from_pretrained(directory).id2label
+        self.path = path
+
+    def __call__(self, texts, batch_size: int = None):
+        import numpy as np
+
+        texts = [texts] if isinstance(texts, str) else list(texts)
+        batch_size = batch_size or len(texts)
+        results = []
+        for start in range(0, len(texts), batch_size):
+            encoded = self.tokenizer(texts[start:start + batch_size], padding=True, return_tensors="np")
+            logits = self.session.run(["logits"], {
+                "input_ids": encoded["input_ids"].astype(np.int64),
+                "attention_mask": encoded["attention_mask"].astype(np.int64),
+            })[0]
+            scores = np.exp(logits - logits.max(axis=-1, keepdims=True))
+            scores /= scores.sum(axis=-1, keepdims=True)
+            for row in scores:
+                best = int(row.argmax())
+                results.append({"label": self.id2label[best], "score": float(row[best])})
+        return results
+
+
+def run_engine(engine: str, quantized: bool, args) -> dict:
+    """Benchmark one engine in a fresh process, so its resident memory is measured alone"""
+    env = {**os.environ, "DDI_ENGINE": engine, "DDI_ONNX_DIR": args.directory,
+           "DDI_ONNX_QUANTIZED": "true" if quantized else "false"}
+    command = [sys.executable, "-m", "api.ml.ddi_predictor", "--json", "--pairs", str(args.pairs)]
+    if args.pairs_file:
+        command += ["--pairs-file", args.pairs_file]
+    output = subprocess.run(command, env=env, check=True, capture_output=True, text=True).stdout
+    return json.loads(output.strip().splitlines()[-1])
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Export the DDI classifier to ONNX and check it against PyTorch")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    export = commands.add_parser("export", help="Export (and quantize) the classifier")
+    export.add_argument("directory", help="Output directory")
+    export.add_argument("--model", default=None, help="Model id (default: the DDI predictor's MODEL_ID)")
+    export.add_argument("--no-quantize", action="store_true", help="Skip the int8 copy")
+
+    compare = commands.add_parser("compare", help="Agreement, latency, throughput and memory per engine")
+    compare.add_argument("directory", help="Directory written by export")
+    compare.add_argument("--pairs", type=int, default=256, help="Number of generated drug pairs")
+    compare.add_argument("--pairs-file", default=None, help="CSV/TSV of drug pairs to use instead")
+    compare.add_argument("--min-agreement", type=float, default=0.99, help="Fail below this label agreement")
+    args = parser.parse_args(argv)
+
+    if args.command == "export":
+        from api.ml.ddi_predictor import MODEL_ID
+        export_classifier(args.model or MODEL_ID, args.directory, quantize=not args.no_quantize)
+        return 0
+
+    reference = run_engine("pytorch", False, args)
+    failed = False
+    for name, engine, quantized in (("pytorch", "pytorch", False), ("onnx-fp32", "onnx", False), ("onnx-int8", "onnx", True)):
+        if engine == "onnx" and not os.path.exists(os.path.join(args.directory, QUANTIZED_MODEL_FILE if quantized else MODEL_FILE)):
+            continue
+        stats = reference if engine == "pytorch" else run_engine(engine, quantized, args)
+        agreement = sum(a == b for a, b in zip(stats["labels"], reference["labels"])) / len(reference["labels"])
+        failed = failed or agreement < args.min_agreement
+        print(f"[ONNX Compare] {name}: agreement {agreement:.2%}, latency p50 {stats['latency_p50_ms']} ms, "
+              f"p95 {stats['latency_p95_ms']} ms, {stats['pairs_per_second']} pairs/s at batch {stats['batch_size']}, "
+              f"RSS {stats['rss_mb']} MB")
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,21 +1,70 @@
-from transformers import pipeline, set_seed
-
-try:
-    generator = pipeline('text-generation', model="microsoft/biogpt")
-except Exception as e:
-    print(f"Error loading BioGPT generator model: {e}")
-    generator = None
-
-def generate_report(prompt: str) -> str:
-    """Generates a text report based on a given prompt using BioGPT."""
-    if not generator:
-        return "Error: Report generation model could not be loaded."
-
-    set_seed(42)
-    try:
-        generated_sequences = generator(prompt, max_length=150, num_return_sequences=1, do_sample=True, temperature=0.7)
-        full_text = generated_sequences['generated_text']
-        report = full_text.replace(prompt, "").strip()
-        return report if report else "A summary could not be generated for this interaction."
-    except Exception as e:
-        return f"Error during report generation: {str(e)}"
\ No newline at end of file
+import os
+from api.ml.cpu_profile import load_generation_pipeline
+from api.ml.model_holder import LazyModel
+
+MODEL_ID = "microsoft/biogpt"
+
+# Most prompts decoded together in one generate() call
+REPORT_BATCH_SIZE = int(os.getenv("REPORT_BATCH_SIZE", "8"))
+
+# Tokens generated per report, counted after the prompt: in a left-padded batch
+# a total max_length would leave shorter prompts less room than longer ones
+REPORT_MAX_NEW_TOKENS = int(os.getenv("REPORT_MAX_NEW_TOKENS", "100"))
+
+EMPTY_REPORT = "A summary could not be generated for this interaction."
+
+def load_generator():
+    # Thread counts and int8 quantization come from the CPU profile (api/ml/cpu_profile.py)
+    generator = load_generation_pipeline(MODEL_ID)
+    # Decoder-only models continue from the last position, so batches are padded on the left
+    generator.tokenizer.padding_side = "left"
+    return generator
+
+# Loaded on first use (or by generator.warmup()), never at import
+generator = LazyModel("BioGPT generator", load_generator)
+
+def generate_reports(prompts: list, batch_size: int = REPORT_BATCH_SIZE) -> list:
+    """Generates a text report for each prompt using BioGPT, in order.
+
+    Prompts are sorted by length and padded into batches of batch_size, and
+    each batch is decoded in a single generate() call with the KV cache on,
+    so n prompts cost about n / batch_size decoding passes instead of n.
+    Raises ModelUnavailable if the generator could not be loaded.
+    """
+    import torch
+    from transformers import set_seed
+
+    model = generator.get()
+    tokenizer = model.tokenizer
+
+    set_seed(42)
+    order = sorted(range(len(prompts)), key=lambda i: len(tokenizer(prompts[i])["input_ids"]))
+    reports = [None] * len(prompts)
+    for start in range(0, len(order), batch_size):
+        chunk = order[start:start + batch_size]
+        try:
+            encoded = tokenizer([prompts[i] for i in chunk], return_tensors="pt", padding=True)
+            with torch.inference_mode():
+                output = model.model.generate(
+                    **encoded,
+                    max_new_tokens=REPORT_MAX_NEW_TOKENS,
+                    do_sample=True,
+                    temperature=0.7,
+                    use_cache=True,
+                    pad_token_id=tokenizer.pad_token_id
+                )
+            # Only the tokens after the (padded) prompt are the report
+            texts = tokenizer.batch_decode(output[:, encoded["input_ids"].shape[1]:], skip_special_tokens=True)
+            for i, text in zip(chunk, texts):
+                reports[i] = text.strip() or EMPTY_REPORT
+        except Exception as e:
+            for i in chunk:
+                reports[i] = f"Error during report generation: {str(e)}"
+    return reports
+
+def generate_report(prompt: str) -> str:
+    """Generates a text report based on a given prompt using BioGPT.
+
+    Raises ModelUnavailable if the generator could not be loaded.
+    """
+    return generate_reports([prompt])[0]
@@ -1,11 +1,17 @@
-from pydantic import BaseModel
-
-class DDIRequest(BaseModel):
-    drug1: str
-    drug2: str
-
-class DDIResponse(BaseModel):
-    prediction: str
-    severity: str
-    professional_report: str
-    patient_report: str
\ No newline at end of file
+from pydantic import BaseModel
+
+class DDIRequest(BaseModel):
+    drug1: str
+    drug2: str
+
+class DDIResponse(BaseModel):
+    prediction: str
+    severity: str
+    professional_report: str
+    patient_report: str
+
+class DDIBatchRequest(BaseModel):
+    pairs: list[DDIRequest]
+
+class DDIBatchResponse(BaseModel):
+    results: list[DDIResponse]
@@ -1,15 +1,55 @@
-from fastapi import APIRouter, HTTPException
-from api.models.schemas import DDIRequest, DDIResponse
-from api.services import prediction_service
-
-router = APIRouter()
-
-@router.post("/predict", response_model=DDIResponse)
-async def predict_interaction_endpoint(request: DDIRequest):
-    if not request.drug1 or not request.drug2:
-        raise HTTPException(status_code=400, detail="Both drug names must be provided.")
-    try:
-        reports = prediction_service.create_ddi_reports(request.drug1, request.drug2)
-        return reports
-    except Exception as e:
-        raise HTTPException(status_code=500, detail=str(e))
\ No newline at end of file
+import os
+from fastapi import APIRouter, HTTPException
+from api.ml.model_holder import ModelUnavailable
+from api.models.schemas import DDIBatchRequest, DDIBatchResponse, DDIRequest, DDIResponse
+from api.services import prediction_service
+
+DDI_BATCH_MAX_PAIRS = int(os.getenv("DDI_BATCH_MAX_PAIRS", "64"))
+
+# Start loading the classifier and generator in the background when the app starts,
+# instead of on the first request
+DDI_MODELS_WARMUP = os.getenv("DDI_MODELS_WARMUP", "true").lower() == "true"
+
+def warmup():
+    """
+    Call from the including app's lifespan: routers' startup handlers never
+    run in an app built with lifespan=
+    """
+    if DDI_MODELS_WARMUP:
+        prediction_service.warmup_models()
+
+router = APIRouter()
+
+@router.get("/models")
+def model_status():
+    return prediction_service.model_status()
+
+@router.post("/predict", response_model=DDIResponse)
+def predict_interaction_endpoint(request: DDIRequest):
+    # Plain def: FastAPI runs it on its threadpool, so a first-use model load
+    # or a CPU forward pass never blocks the event loop
+    if not request.drug1 or not request.drug2:
+        raise HTTPException(status_code=400, detail="Both drug names must be provided.")
+    try:
+        reports = prediction_service.create_ddi_reports(request.drug1, request.drug2)
+        return reports
+    except ModelUnavailable as e:
+        raise HTTPException(status_code=503, detail=str(e))
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=str(e))
+
+@router.post("/predict/batch", response_model=DDIBatchResponse)
+def predict_batch_endpoint(request: DDIBatchRequest):
+    if not request.pairs:
+        raise HTTPException(status_code=400, detail="At least one drug pair must be provided.")
+    if len(request.pairs) > DDI_BATCH_MAX_PAIRS:
+        raise HTTPException(status_code=400, detail=f"At most {DDI_BATCH_MAX_PAIRS} drug pairs per request.")
+    if any(not pair.drug1 or not pair.drug2 for pair in request.pairs):
+        raise HTTPException(status_code=400, detail="Both drug names must be provided for every pair.")
+    try:
+        results = prediction_service.create_ddi_reports_many([(pair.drug1, pair.drug2) for pair in request.pairs])
+        return {"results": results}
+    except ModelUnavailable as e:
+        raise HTTPException(status_code=503, detail=str(e))
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=str(e))
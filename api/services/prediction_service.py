@@ -1,30 +1,68 @@
-from api.ml import ddi_predictor, report_generator
-
-def create_ddi_reports(drug1: str, drug2: str) -> dict:
-    """Orchestrates the DDI prediction and report generation process."""
-    
-    interaction_type = ddi_predictor.predict_interaction(drug1, drug2)
-
-    # Mock Severity Assessment based on the predicted interaction type
-    severity_map = {
-        "MECHANISM": "Major",
-        "EFFECT": "Moderate",
-        "ADVICE": "Moderate",
-        "INT": "Minor"
-    }
-    severity = severity_map.get(interaction_type, "Unknown")
-
-    # Generate Professional Report
-    professional_prompt = f"Generate a professional clinical summary for a pharmacist about a '{interaction_type}' interaction between {drug1} and {drug2}, detailing the potential mechanism and clinical effects."
-    professional_report = report_generator.generate_report(professional_prompt)
-
-    # Generate Patient-Friendly Report
-    patient_prompt = f"Generate a simple, easy-to-understand summary for a patient about a '{interaction_type}' drug interaction between {drug1} and {drug2}. Explain what to watch for and advise them to talk to their doctor."
-    patient_report = report_generator.generate_report(patient_prompt)
-
-    return {
-        "prediction": interaction_type,
-        "severity": severity,
-        "professional_report": professional_report,
-        "patient_report": patient_report
-    }
\ No newline at end of file
+from api.ml import cpu_profile, ddi_predictor, report_generator
+
+def warmup_models():
+    """Start loading both models in the background so the first request does not wait"""
+    ddi_predictor.classifier.warmup()
+    report_generator.generator.warmup()
+
+def model_status() -> dict:
+    """Load state of each model, ready once both are loaded"""
+    models = [ddi_predictor.classifier, report_generator.generator]
+    return {
+        "ready": all(model.ready for model in models),
+        "models": [model.stats() for model in models],
+        "classifier_batching": ddi_predictor.batcher.stats(),
+        "generator_cpu_profile": cpu_profile.profile()
+    }
+
+# Mock Severity Assessment based on the predicted interaction type
+SEVERITY_MAP = {
+    "MECHANISM": "Major",
+    "EFFECT": "Moderate",
+    "ADVICE": "Moderate",
+    "INT": "Minor"
+}
+
+def report_prompts(drug1: str, drug2: str, interaction_type: str) -> tuple:
+    """(professional, patient) report prompts for one predicted interaction"""
+    professional_prompt = f"Generate a professional clinical summary for a pharmacist about a '{interaction_type}' interaction between {drug1} and {drug2}, detailing the potential mechanism and clinical effects."
+    patient_prompt = f"Generate a simple, easy-to-understand summary for a patient about a '{interaction_type}' drug interaction between {drug1} and {drug2}. Explain what to watch for and advise them to talk to their doctor."
+    return professional_prompt, patient_prompt
+
+def ddi_report(interaction_type: str, professional_report: str, patient_report: str) -> dict:
+    return {
+        "prediction": interaction_type,
+        "severity": SEVERITY_MAP.get(interaction_type, "Unknown"),
+        "professional_report": professional_report,
+        "patient_report": patient_report
+    }
+
+def create_ddi_reports(drug1: str, drug2: str) -> dict:
+    """Orchestrates the DDI prediction and report generation process.
+
+    Both reports are generated in one batched decoding pass.
+    """
+    interaction_type = ddi_predictor.predict_interaction(drug1, drug2)
+    professional_report, patient_report = report_generator.generate_reports(
+        list(report_prompts(drug1, drug2, interaction_type))
+    )
+    return ddi_report(interaction_type, professional_report, patient_report)
+
+def create_ddi_reports_many(pairs: list) -> list:
+    """
+    Reports for every (drug1, drug2) pair, in order. Predictions are
+    classified in batches, and the prompts of all pairs go to the generator
+    together, so it decodes report_generator.REPORT_BATCH_SIZE of them per
+    pass.
+    """
+    interaction_types = ddi_predictor.predict_many(pairs)
+
+    prompts = []
+    for (drug1, drug2), interaction_type in zip(pairs, interaction_types):
+        prompts.extend(report_prompts(drug1, drug2, interaction_type))
+    reports = report_generator.generate_reports(prompts)
+
+    return [
+        ddi_report(interaction_type, reports[2 * i], reports[2 * i + 1])
+        for i, interaction_type in enumerate(interaction_types)
+    ]
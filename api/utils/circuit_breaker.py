@@ -0,0 +1,119 @@
+import time
+from collections import deque
+
+CLOSED = "closed"
+OPEN = "open"
+HALF_OPEN = "half_open"
+
+
+class CircuitBreaker:
+    """
+    Circuit breaker over a rolling window of upstream calls.
+
+    A call counts as failed if it raised or took longer than slow_seconds.
+    Once at least min_calls are in the window and the failed fraction
+    reaches failure_rate, the breaker opens and allow() refuses every call
+    for open_seconds. It then goes half-open and lets up to half_open_probes
+    calls through: a successful probe closes it again, a failed one reopens
+    it. Latencies of successful calls are kept for the hedging threshold.
+    """
+
+    def __init__(self, failure_rate: float = 0.5, slow_seconds: float = 15.0, window: int = 20,
+                 min_calls: int = 5, open_seconds: float = 30.0, half_open_probes: int = 1):
+        self.failure_rate = failure_rate
+        self.slow_seconds = slow_seconds
+        self.min_calls = min_calls
+        self.open_seconds = open_seconds
+        self.half_open_probes = half_open_probes
+        self.state = CLOSED
+        self._outcomes = deque(maxlen=window)
+        self._latencies = deque(maxlen=max(window * 5, 100))
+        self._opened_at = 0.0
+        self._probes = 0
+        self.allowed = 0
+        self.rejected = 0
+        self.times_opened = 0
+        self.hedges = 0
+
+    def allow(self) -> bool:
+        """Whether a call may go upstream now; every allowed call must be recorded"""
+        if self.state == OPEN:
+            if time.monotonic() - self._opened_at < self.open_seconds:
+                self.rejected += 1
+                return False
+            self.state = HALF_OPEN
+            self._probes = 0
+        if self.state == HALF_OPEN:
+            if self._probes >= self.half_open_probes:
+                self.rejected += 1
+                return False
+            self._probes += 1
+        self.allowed += 1
+        return True
+
+    def record_success(self, latency: float):
+        if latency > self.slow_seconds:
+            self._record(False)
+            return
+        self._latencies.append(latency)
+        self._record(True)
+
+    def record_failure(self):
+        self._record(False)
+
+    def record_cancelled(self, elapsed: float):
+        """A call abandoned by its caller counts as failed only once it was already slow"""
+        if elapsed > self.slow_seconds:
+            self._record(False)
+        else:
+            self.release()
+
+    def release(self):
+        """Record an allowed call whose outcome says nothing about upstream health"""
+        if self.state == HALF_OPEN:
+            self._probes = max(self._probes - 1, 0)
+
+    def _record(self, success: bool):
+        if self.state == HALF_OPEN:
+            self._probes = max(self._probes - 1, 0)
+            if success:
+                print("[Circuit Breaker] Probe succeeded, closing")
+                self.state = CLOSED
+                self._outcomes.clear()
+            else:
+                self._open()
+            return
+
+        self._outcomes.append(success)
+        if self.state == CLOSED and len(self._outcomes) >= self.min_calls:
+            failures = self._outcomes.count(False)
+            if failures / len(self._outcomes) >= self.failure_rate:
+                self._open()
+
+    def _open(self):
+        print(f"[Circuit Breaker] Opening for {self.open_seconds}s")
+        self.state = OPEN
+        self._opened_at = time.monotonic()
+        self.times_opened += 1
+
+    def latency_quantile(self, quantile: float, min_samples: int = 20):
+        """Latency below which the given fraction of recent successful calls finished, or None"""
+        if len(self._latencies) < min_samples:
+            return None
+        ordered = sorted(self._latencies)
+        return ordered[min(int(quantile * len(ordered)), len(ordered) - 1)]
+
+    def stats(self) -> dict:
+        failures = self._outcomes.count(False)
+        p95 = self.latency_quantile(0.95, min_samples=1)
+        return {
+            "state": self.state,
+            "window_calls": len(self._outcomes),
+            "window_failures": failures,
+            "failure_rate": round(failures / len(self._outcomes), 4) if self._outcomes else 0.0,
+            "p95_latency_ms": round(p95 * 1000, 1) if p95 is not None else None,
+            "times_opened": self.times_opened,
+            "allowed": self.allowed,
+            "rejected": self.rejected,
+            "hedges": self.hedges,
+        }
@@ -0,0 +1,57 @@
+import asyncio
+
+
+async def bounded_as_completed(coroutines, limit: int):
+    """
+    Run coroutines with at most limit in flight, yielding each result as it finishes.
+
+    coroutines may be a lazy iterable; the next one is only created when a
+    slot frees up, so arbitrarily long batches hold just limit tasks at once.
+    If the consumer stops early (e.g. the client disconnected), the tasks
+    still running are cancelled.
+    """
+    queued = iter(coroutines)
+    pending = set()
+    try:
+        while True:
+            for coroutine in queued:
+                pending.add(asyncio.ensure_future(coroutine))
+                if len(pending) >= limit:
+                    break
+            if not pending:
+                return
+
+            done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+            for task in done:
+                yield task.result()
+    finally:
+        for task in pending:
+            task.cancel()
+
+
+async def hedged(attempt, delay: float):
+    """
+    Await attempt(), starting a second attempt() if the first has not
+    finished after delay seconds. The first attempt to succeed wins and the
+    other is cancelled; if both fail, the last error is raised.
+    Returns (result, whether a hedge was sent).
+    """
+    first = asyncio.ensure_future(attempt())
+    pending = {first}
+    try:
+        done, _ = await asyncio.wait(pending, timeout=delay)
+        if done:
+            return first.result(), False
+
+        pending.add(asyncio.ensure_future(attempt()))
+        while True:
+            done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+            for task in done:
+                if task.exception() is None:
+                    return task.result(), True
+            if not pending:
+                raise task.exception()
+    finally:
+        # Also reached when the caller is cancelled: no attempt outlives it
+        for task in pending:
+            task.cancel()
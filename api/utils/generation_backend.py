@@ -0,0 +1,255 @@
+import argparse
+import asyncio
+import hashlib
+import os
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
+from api.ml.cpu_profile import load_generation_pipeline, profile
+from api.ml.model_holder import LazyModel
+
+STUB_SENTENCES = [
+    "the combination may increase plasma concentrations of one of the drugs.",
+    "their effects on the same receptors can be additive.",
+    "hepatic metabolism of one drug may be inhibited by the other.",
+    "renal clearance may be reduced, prolonging exposure.",
+    "the risk of adverse effects may rise and monitoring is advised.",
+    "absorption can be altered when the doses are taken together.",
+    "dose adjustment may be needed based on clinical response.",
+    "no change in efficacy is expected for most patients.",
+]
+
+
+class GenerationBackend:
+    """
+    Where explanation text comes from.
+
+    generate() takes a prompt and the Inference API's generation parameters
+    and returns [{"generated_text": ...}] like the Inference API, or None if
+    generation failed. With on_token, on_token(text) is called for every
+    token as it is produced. name identifies the model behind the backend,
+    so cached explanations from different backends never mix.
+    """
+
+    kind = "base"
+
+    def __init__(self, name: str):
+        self.name = name
+        self.calls = 0
+        self.failures = 0
+        self.in_flight = 0
+        self._seconds = 0.0
+
+    async def _generate(self, prompt: str, parameters: dict, on_token=None):
+        raise NotImplementedError
+
+    def warmup(self):
+        """Start preparing the backend in the background; a no-op where there is nothing to load"""
+
+    async def generate(self, prompt: str, parameters: dict, on_token=None):
+        self.calls += 1
+        self.in_flight += 1
+        started = time.perf_counter()
+        try:
+            result = await self._generate(prompt, parameters, on_token)
+        finally:
+            self.in_flight -= 1
+            self._seconds += time.perf_counter() - started
+        if not result:
+            self.failures += 1
+        return result
+
+    def stats(self) -> dict:
+        return {
+            "backend": self.kind,
+            "model": self.name,
+            "calls": self.calls,
+            "failures": self.failures,
+            "in_flight": self.in_flight,
+            "mean_latency_ms": round(self._seconds / self.calls * 1000, 1) if self.calls else None,
+        }
+
+
+class RemoteBackend(GenerationBackend):
+    """The Hugging Face Inference API, through query(model_id, inputs, on_token=...)"""
+
+    kind = "remote"
+
+    def __init__(self, query, model_id: str):
+        super().__init__(model_id)
+        self.query = query
+
+    async def _generate(self, prompt: str, parameters: dict, on_token=None):
+        return await self.query(self.name, {"inputs": prompt, "parameters": parameters}, on_token=on_token)
+
+
+class LocalTransformersBackend(GenerationBackend):
+    """
+    A transformers text-generation pipeline on this machine's CPU, with the
+    thread counts and quantization of the CPU profile (api/ml/cpu_profile.py).
+
+    The model is loaded on first use or by warmup(), not at import, so
+    workers that never generate locally never pay for it. Generations run
+    one at a time on a dedicated thread (torch already uses every core for
+    one generation) and stream tokens back to the event loop as they are
+    decoded.
+    """
+
+    kind = "local"
+
+    def __init__(self, model_id: str = "microsoft/biogpt"):
+        super().__init__(f"local:{model_id}")
+        self.model_id = model_id
+        self.model = LazyModel(self.name, self._load)
+        self._executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="local-generation")
+        self._streamer_class = None
+
+    def _load(self):
+        from transformers import TextStreamer
+
+        class CallbackStreamer(TextStreamer):
+            def __init__(self, tokenizer, callback):
+                super().__init__(tokenizer, skip_prompt=True, skip_special_tokens=True)
+                self.callback = callback
+
+            def on_finalized_text(self, text: str, stream_end: bool = False):
+                if text:
+                    self.callback(text)
+
+        self._streamer_class = CallbackStreamer
+        return load_generation_pipeline(self.model_id)
+
+    def warmup(self):
+        self.model.warmup()
+
+    def _run(self, prompt: str, parameters: dict, on_text):
+        import torch
+
+        generator = self.model.get()
+        kwargs = dict(parameters)
+        if on_text is not None:
+            kwargs["streamer"] = self._streamer_class(generator.tokenizer, on_text)
+        with torch.inference_mode():
+            return generator(prompt, num_return_sequences=1, **kwargs)
+
+    async def _generate(self, prompt: str, parameters: dict, on_token=None):
+        loop = asyncio.get_running_loop()
+        on_text = None
+        if on_token is not None:
+            on_text = lambda text: loop.call_soon_threadsafe(on_token, text)
+        try:
+            result = await loop.run_in_executor(self._executor, self._run, prompt, parameters, on_text)
+        except Exception as e:
+            print(f"[Local Generation] Error: {str(e)}")
+            return None
+        if not result:
+            return None
+        return [{"generated_text": result[0].get("generated_text", "")}]
+
+    def stats(self) -> dict:
+        return {
+            **super().stats(),
+            "model_state": self.model.stats(),
+            "cpu_profile": profile(),
+        }
+
+
+class StubBackend(GenerationBackend):
+    """
+    Deterministic offline stand-in for a model: the same prompt always
+    produces the same text, after latency seconds spread across its tokens.
+    For running the service without a model and for benchmarking the rest
+    of the pipeline.
+    """
+
+    kind = "stub"
+
+    def __init__(self, latency: float = 0.0):
+        super().__init__("stub")
+        self.latency = latency
+
+    @staticmethod
+    def text_for(prompt: str, max_new_tokens: int = 150) -> str:
+        digest = hashlib.sha256(prompt.encode("utf-8")).digest()
+        sentences = [STUB_SENTENCES[b % len(STUB_SENTENCES)] for b in digest[:3]]
+        words = " ".join(sentences).split(" ")
+        return " ".join(words[:max_new_tokens])
+
+    async def _generate(self, prompt: str, parameters: dict, on_token=None):
+        text = self.text_for(prompt, parameters.get("max_new_tokens", 150))
+        if on_token is None:
+            if self.latency > 0:
+                await asyncio.sleep(self.latency)
+        else:
+            tokens = text.split(" ")
+            for i, token in enumerate(tokens):
+                if self.latency > 0:
+                    await asyncio.sleep(self.latency / len(tokens))
+                on_token(token if i == 0 else " " + token)
+        return [{"generated_text": text}]
+
+    def stats(self) -> dict:
+        return {**super().stats(), "latency_seconds": self.latency}
+
+
+async def benchmark(backend: GenerationBackend, prompts: list, parameters: dict, concurrency: int) -> dict:
+    """Generate every prompt with at most concurrency in flight, returning throughput and latency"""
+    semaphore = asyncio.Semaphore(concurrency)
+    latencies = []
+
+    async def one(prompt):
+        async with semaphore:
+            started = time.perf_counter()
+            result = await backend.generate(prompt, parameters)
+            if result:
+                latencies.append(time.perf_counter() - started)
+
+    started = time.perf_counter()
+    await asyncio.gather(*(one(prompt) for prompt in prompts))
+    elapsed = time.perf_counter() - started
+
+    latencies.sort()
+    quantile = lambda q: round(latencies[min(int(q * len(latencies)), len(latencies) - 1)] * 1000, 1) if latencies else None
+    return {
+        "backend": backend.kind,
+        "model": backend.name,
+        "requests": len(prompts),
+        "succeeded": len(latencies),
+        "seconds": round(elapsed, 3),
+        "per_second": round(len(latencies) / elapsed, 2) if elapsed else None,
+        "p50_ms": quantile(0.5),
+        "p95_ms": quantile(0.95),
+    }
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark a generation backend on the patient explanation prompt")
+    parser.add_argument("--backend", default=None, help="remote, local or stub (default: GENERATION_BACKEND)")
+    parser.add_argument("--requests", type=int, default=20, help="Number of generations")
+    parser.add_argument("--concurrency", type=int, default=4, help="Generations in flight at once")
+    args = parser.parse_args(argv)
+
+    if args.backend:
+        os.environ["GENERATION_BACKEND"] = args.backend
+    from api import index
+
+    drugs = ["Warfarin", "Aspirin", "Ibuprofen", "Simvastatin", "Clarithromycin", "Metformin", "Lisinopril", "Digoxin"]
+    prompts = [
+        f"Question: What happens when a patient takes {drugs[i % len(drugs)]} and {drugs[(i * 3 + 1) % len(drugs)]} together?\n\n"
+        f"Answer: When taking {drugs[i % len(drugs)]} with {drugs[(i * 3 + 1) % len(drugs)]},"
+        for i in range(args.requests)
+    ]
+
+    async def run():
+        try:
+            return await benchmark(index.generation_backend, prompts, index.PATIENT_GENERATION_PARAMETERS, args.concurrency)
+        finally:
+            await index.close_http_client()
+
+    stats = asyncio.run(run())
+    print(f"[Generation Benchmark] {stats}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
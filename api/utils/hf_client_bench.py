@@ -0,0 +1,121 @@
+import argparse
+import asyncio
+import json
+import sys
+import time
+
+import httpx
+
+
+class StubInferenceServer:
+    """
+    Minimal HTTP/1.1 keep-alive server answering every POST like the Inference
+    API, after delay seconds. Counts TCP connections and requests, so a run
+    shows how many connections the client opened for its requests.
+    """
+
+    def __init__(self, delay: float = 0.005):
+        self.delay = delay
+        self.connections = 0
+        self.requests = 0
+        self.port = None
+        self._server = None
+
+    async def _handle(self, reader, writer):
+        self.connections += 1
+        payload = json.dumps([{"generated_text": "the drugs interact through CYP3A4."}]).encode()
+        try:
+            while True:
+                head = await reader.readuntil(b"\r\n\r\n")
+                length = 0
+                for line in head.split(b"\r\n"):
+                    if line.lower().startswith(b"content-length:"):
+                        length = int(line.split(b":", 1)[1])
+                if length:
+                    await reader.readexactly(length)
+                self.requests += 1
+                await asyncio.sleep(self.delay)
+                writer.write(b"HTTP/1.1 200 OK\r\ncontent-type: application/json\r\n"
+                             b"content-length: %d\r\n\r\n%s" % (len(payload), payload))
+                await writer.drain()
+        except (asyncio.IncompleteReadError, ConnectionResetError):
+            pass
+        finally:
+            writer.close()
+
+    async def start(self):
+        self._server = await asyncio.start_server(self._handle, "127.0.0.1", 0)
+        self.port = self._server.sockets[0].getsockname()[1]
+        return self
+
+    async def stop(self):
+        self._server.close()
+        await self._server.wait_closed()
+
+    def reset(self):
+        self.connections = 0
+        self.requests = 0
+
+
+async def per_call_query(url: str, inputs: dict):
+    """How Hugging Face calls were made before the shared client: one client, and connection, per call"""
+    async with httpx.AsyncClient(timeout=60.0) as client:
+        response = await client.post(url, json=inputs)
+        response.raise_for_status()
+        return response.json()
+
+
+async def measure(query, server: StubInferenceServer, requests: int, concurrency: int) -> dict:
+    """Latency percentiles of requests calls to query() with at most concurrency in flight"""
+    semaphore = asyncio.Semaphore(concurrency)
+    latencies = []
+
+    async def one():
+        async with semaphore:
+            started = time.perf_counter()
+            await query()
+            latencies.append(time.perf_counter() - started)
+
+    server.reset()
+    await asyncio.gather(*(one() for _ in range(requests)))
+    latencies.sort()
+    return {
+        "p50_ms": round(latencies[len(latencies) // 2] * 1000, 2),
+        "p95_ms": round(latencies[min(int(0.95 * len(latencies)), len(latencies) - 1)] * 1000, 2),
+        "upstream_requests": server.requests,
+        "connections": server.connections,
+    }
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Hugging Face call latency and connection count: per-call vs shared client")
+    parser.add_argument("--requests", type=int, default=200, help="Calls per client")
+    parser.add_argument("--concurrency", type=int, default=8, help="Calls in flight at once")
+    parser.add_argument("--delay", type=float, default=0.005, help="Stub server latency in seconds")
+    args = parser.parse_args(argv)
+
+    from api import index
+
+    async def run():
+        server = await StubInferenceServer(args.delay).start()
+        index.HF_API_BASE = f"http://127.0.0.1:{server.port}/models"
+        url = f"{index.HF_API_BASE}/{index.BIOGPT_MODEL}"
+        inputs = {"inputs": "Warfarin and aspirin", "parameters": index.PATIENT_GENERATION_PARAMETERS}
+        try:
+            for label, query in (
+                ("per-call client", lambda: per_call_query(url, inputs)),
+                ("shared client", lambda: index.query_huggingface(index.BIOGPT_MODEL, inputs, wait_for_model=False)),
+            ):
+                stats = await measure(query, server, args.requests, args.concurrency)
+                print(f"[HF Client Benchmark] {label}: p50 {stats['p50_ms']} ms, p95 {stats['p95_ms']} ms, "
+                      f"{stats['upstream_requests']} requests over {stats['connections']} connections")
+        finally:
+            await index.close_http_client()
+            await server.stop()
+
+    asyncio.run(run())
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,448 @@
+import hashlib
+import json
+import os
+import threading
+import time
+from collections import deque
+from datetime import datetime, timezone
+
+# Major severity interactions (life-threatening or requires immediate intervention)
+MAJOR_PAIRS = [
+    # Bleeding risks
+    ("warfarin", "aspirin"), ("warfarin", "ibuprofen"), ("warfarin", "naproxen"),
+    ("warfarin", "clopidogrel"), ("apixaban", "aspirin"), ("rivaroxaban", "ibuprofen"),
+    ("dabigatran", "aspirin"), ("edoxaban", "naproxen"),
+
+    # Cardiovascular
+    ("sildenafil", "nitroglycerin"), ("viagra", "nitroglycerin"), ("tadalafil", "isosorbide"),
+    ("vardenafil", "nitroglycerin"), ("sildenafil", "isosorbide"),
+    ("metoprolol", "verapamil"), ("atenolol", "diltiazem"), ("propranolol", "diltiazem"),
+    ("carvedilol", "verapamil"), ("bisoprolol", "verapamil"),
+
+    # CNS depression
+    ("diazepam", "morphine"), ("alprazolam", "oxycodone"), ("lorazepam", "fentanyl"),
+    ("clonazepam", "hydrocodone"), ("temazepam", "codeine"), ("zolpidem", "morphine"),
+
+    # Serotonin syndrome
+    ("fluoxetine", "phenelzine"), ("sertraline", "selegiline"), ("citalopram", "tranylcypromine"),
+    ("paroxetine", "phenelzine"), ("escitalopram", "selegiline"),
+
+    # Metabolic interactions (Rhabdomyolysis risk)
+    ("simvastatin", "clarithromycin"), ("atorvastatin", "itraconazole"),
+    ("simvastatin", "erythromycin"), ("lovastatin", "ketoconazole"),
+    ("simvastatin", "gemfibrozil"), ("atorvastatin", "clarithromycin"),
+
+    # Alcohol interactions
+    ("metronidazole", "alcohol"), ("tinidazole", "alcohol"), ("disulfiram", "alcohol"),
+    ("cefoperazone", "alcohol"), ("ketoconazole", "alcohol"),
+
+    # QT prolongation
+    ("azithromycin", "amiodarone"), ("erythromycin", "quinidine"), ("clarithromycin", "sotalol"),
+    ("ciprofloxacin", "amiodarone"), ("levofloxacin", "sotalol"),
+
+    # Immunosuppressants
+    ("tacrolimus", "ketoconazole"), ("cyclosporine", "st john's wort"),
+    ("tacrolimus", "clarithromycin"), ("cyclosporine", "rifampin"),
+    ("sirolimus", "ketoconazole"), ("everolimus", "itraconazole"),
+
+    # Methotrexate toxicity
+    ("methotrexate", "ibuprofen"), ("methotrexate", "naproxen"),
+    ("methotrexate", "aspirin"), ("methotrexate", "penicillin"),
+
+    # Digoxin toxicity
+    ("digoxin", "amiodarone"), ("digoxin", "verapamil"), ("digoxin", "clarithromycin"),
+    ("digoxin", "quinidine"), ("digoxin", "spironolactone"),
+
+    # Lithium toxicity
+    ("lithium", "hydrochlorothiazide"), ("lithium", "furosemide"), ("lithium", "ibuprofen"),
+    ("lithium", "naproxen"), ("lithium", "lisinopril"), ("lithium", "losartan"),
+
+    # Hyperkalemia
+    ("lisinopril", "potassium"), ("enalapril", "potassium"), ("ramipril", "spironolactone"),
+    ("losartan", "potassium"), ("valsartan", "spironolactone"),
+
+    # Lactic acidosis
+    ("metformin", "alcohol"), ("metformin", "contrast"),
+
+    # Hypoglycemia
+    ("insulin", "alcohol"), ("glipizide", "alcohol"), ("glyburide", "alcohol"),
+]
+
+# Drug classes used for class-based moderate/minor interactions
+DRUG_CLASSES = {
+    "anticoagulants": ["warfarin", "apixaban", "rivaroxaban", "dabigatran", "edoxaban", "heparin", "enoxaparin"],
+    "antiplatelets": ["aspirin", "clopidogrel", "ticagrelor", "prasugrel", "dipyridamole"],
+    "nsaids": ["ibuprofen", "naproxen", "diclofenac", "celecoxib", "indomethacin", "meloxicam", "ketorolac", "piroxicam"],
+    "ssris": ["fluoxetine", "sertraline", "paroxetine", "citalopram", "escitalopram", "fluvoxamine"],
+    "statins": ["simvastatin", "atorvastatin", "rosuvastatin", "pravastatin", "lovastatin", "fluvastatin", "pitavastatin"],
+    "macrolides": ["erythromycin", "clarithromycin", "azithromycin"],
+    "azole_antifungals": ["ketoconazole", "itraconazole", "fluconazole", "voriconazole", "posaconazole"],
+    "ace_inhibitors": ["lisinopril", "enalapril", "ramipril", "perindopril", "captopril"],
+    "arbs": ["losartan", "valsartan", "irbesartan", "candesartan", "olmesartan"],
+}
+
+# Class-pair interactions, highest priority first: (class_a, class_b, type, severity, description)
+CLASS_INTERACTIONS = [
+    ("anticoagulants", "antiplatelets", "EFFECT", "Moderate", "Anticoagulant + Antiplatelet"),
+    ("ssris", "nsaids", "MECHANISM", "Moderate", "SSRI + NSAID (bleeding risk)"),
+    ("statins", "macrolides", "MECHANISM", "Moderate", "Statin + CYP3A4 inhibitor"),
+    ("statins", "azole_antifungals", "MECHANISM", "Moderate", "Statin + CYP3A4 inhibitor"),
+    ("ace_inhibitors", "nsaids", "MECHANISM", "Moderate", "ACE-I/ARB + NSAID"),
+    ("arbs", "nsaids", "MECHANISM", "Moderate", "ACE-I/ARB + NSAID"),
+]
+
+# Classes that are worth an informational note on their own
+MONITORED_CLASSES = ["anticoagulants", "antiplatelets", "nsaids", "ssris", "statins"]
+MONITORED_OUTCOME = ("ADVICE", "Minor", "One or both drugs in monitored class")
+
+# Inputs shorter than this never match a rule name merely by occurring inside it:
+# "a" would otherwise relate to nearly every drug
+MIN_FRAGMENT_LENGTH = 3
+
+# Length of the n-grams indexing rule names for "input inside a rule name" lookups
+GRAM = 3
+
+
+def normalize_drug_name(name: str) -> str:
+    """Normalize a drug name the same way the rule tables are keyed"""
+    return name.lower()
+
+
+class PatternMatcher:
+    """Aho-Corasick automaton reporting every pattern that occurs in a text"""
+
+    def __init__(self, patterns):
+        self._goto = [{}]
+        self._fail = [0]
+        self._out = [()]
+
+        for pattern_id, pattern in enumerate(patterns):
+            state = 0
+            for ch in pattern:
+                next_state = self._goto[state].get(ch)
+                if next_state is None:
+                    next_state = len(self._goto)
+                    self._goto[state][ch] = next_state
+                    self._goto.append({})
+                    self._fail.append(0)
+                    self._out.append(())
+                state = next_state
+            self._out[state] = self._out[state] + (pattern_id,)
+
+        # Breadth-first pass to link each state to its longest proper suffix
+        # and fold the suffix outputs in, so a scan never walks output chains.
+        queue = deque(self._goto[0].values())
+        while queue:
+            state = queue.popleft()
+            for ch, child in self._goto[state].items():
+                fallback = self._fail[state]
+                while fallback and ch not in self._goto[fallback]:
+                    fallback = self._fail[fallback]
+                link = self._goto[fallback].get(ch, 0)
+                self._fail[child] = link if link != child else 0
+                self._out[child] = self._out[child] + self._out[self._fail[child]]
+                queue.append(child)
+
+    def find(self, text: str) -> set:
+        """Return the ids of all patterns occurring anywhere in text"""
+        goto, fail, out = self._goto, self._fail, self._out
+        found = set()
+        state = 0
+        for ch in text:
+            while state and ch not in goto[state]:
+                state = fail[state]
+            state = goto[state].get(ch, 0)
+            if out[state]:
+                found.update(out[state])
+        return found
+
+
+class InteractionIndex:
+    """
+    Compiled form of the interaction rules, built once and shared by all requests.
+
+    Every rule drug name gets an integer id. Major pairs are stored as canonical
+    (min, max) id tuples. A drug name typed by a user matches a rule name when
+    either one contains the other, so a lookup combines an Aho-Corasick scan
+    (rule name inside the input, O(len(name)) plus the matches) with a trigram
+    index (input inside a rule name): the names holding the input's rarest
+    trigram are the only candidates checked. Both structures grow linearly with
+    the total length of the rule names. Inputs shorter than min_fragment only
+    match rule names they contain.
+    """
+
+    def __init__(self, major_pairs=MAJOR_PAIRS, drug_classes=DRUG_CLASSES,
+                 class_interactions=CLASS_INTERACTIONS, monitored_classes=MONITORED_CLASSES,
+                 min_fragment: int = MIN_FRAGMENT_LENGTH):
+        self.min_fragment = min_fragment
+        self.drug_ids = {}
+        self.drug_names = []
+
+        self.major_pairs = set()
+        self._partners = {}
+        for d1, d2 in major_pairs:
+            id1 = self._intern(normalize_drug_name(d1))
+            id2 = self._intern(normalize_drug_name(d2))
+            self.major_pairs.add((min(id1, id2), max(id1, id2)))
+            self._partners.setdefault(id1, set()).add(id2)
+            self._partners.setdefault(id2, set()).add(id1)
+
+        # Each class owns one bit; each drug is resolved to the OR of its classes
+        self.class_bits = {name: bit for bit, name in enumerate(drug_classes)}
+        self._class_masks = {}
+        for class_name, members in drug_classes.items():
+            for member in members:
+                drug_id = self._intern(normalize_drug_name(member))
+                self._class_masks[drug_id] = self._class_masks.get(drug_id, 0) | (1 << self.class_bits[class_name])
+
+        # Class x class matrix of outcome indices. Lower index wins, so the
+        # outcome list order is the rule priority. The diagonal holds the
+        # outcome for a class on its own (monitored classes).
+        size = len(self.class_bits)
+        self.class_outcomes = []
+        self.class_matrix = [[None] * size for _ in range(size)]
+        for class_a, class_b, interaction_type, severity, description in class_interactions:
+            self._set_class_outcome(class_a, class_b, (interaction_type, severity, description))
+        for class_name in monitored_classes:
+            self._set_class_outcome(class_name, class_name, MONITORED_OUTCOME)
+
+        self._matcher = PatternMatcher(self.drug_names)
+
+        # Trigram -> ids of the rule names containing it, each id listed once
+        self._grams = {}
+        for drug_id, name in enumerate(self.drug_names):
+            for gram in {name[i:i + GRAM] for i in range(len(name) - GRAM + 1)}:
+                self._grams.setdefault(gram, []).append(drug_id)
+
+    def _intern(self, name: str) -> int:
+        drug_id = self.drug_ids.get(name)
+        if drug_id is None:
+            drug_id = len(self.drug_names)
+            self.drug_ids[name] = drug_id
+            self.drug_names.append(name)
+        return drug_id
+
+    def _set_class_outcome(self, class_a: str, class_b: str, outcome: tuple):
+        a, b = self.class_bits[class_a], self.class_bits[class_b]
+        if self.class_matrix[a][b] is not None:
+            return
+        self.class_matrix[a][b] = self.class_matrix[b][a] = len(self.class_outcomes)
+        self.class_outcomes.append(outcome)
+
+    @property
+    def rule_count(self) -> int:
+        return len(self.major_pairs) + len(self.class_outcomes)
+
+    def contained_ids(self, name: str) -> set:
+        """Ids of rule names that occur inside the normalized name"""
+        return self._matcher.find(name)
+
+    def containing_ids(self, name: str) -> list:
+        """Ids of rule names that contain the normalized name"""
+        if len(name) < self.min_fragment:
+            return []
+        if len(name) < GRAM:
+            # Only reachable with min_fragment below GRAM
+            return [drug_id for drug_id, rule_name in enumerate(self.drug_names) if name in rule_name]
+
+        candidates = None
+        for i in range(len(name) - GRAM + 1):
+            posting = self._grams.get(name[i:i + GRAM])
+            if posting is None:
+                return []
+            if candidates is None or len(posting) < len(candidates):
+                candidates = posting
+        drug_names = self.drug_names
+        return [drug_id for drug_id in candidates if name in drug_names[drug_id]]
+
+    def related_ids(self, name: str) -> set:
+        """Ids of rule names that occur inside the name or contain it"""
+        ids = self._matcher.find(name)
+        ids.update(self.containing_ids(name))
+        return ids
+
+    def class_mask(self, name: str) -> int:
+        """Bitmask of the drug classes with a member occurring inside the name"""
+        mask = 0
+        for drug_id in self.contained_ids(name):
+            mask |= self._class_masks.get(drug_id, 0)
+        return mask
+
+    def class_outcome(self, mask: int):
+        """
+        Highest-priority (interaction_type, severity, description) for the
+        classes set in mask, or None. Cost grows with the number of classes
+        the drugs belong to, not with the number of classes or rules.
+        """
+        bits = []
+        while mask:
+            low = mask & -mask
+            bits.append(low.bit_length() - 1)
+            mask ^= low
+
+        best = None
+        for i, a in enumerate(bits):
+            row = self.class_matrix[a]
+            for b in bits[i:]:
+                outcome = row[b]
+                if outcome is not None and (best is None or outcome < best):
+                    best = outcome
+        return None if best is None else self.class_outcomes[best]
+
+    def is_major_pair(self, ids1: set, ids2: set) -> bool:
+        """True if any id in ids1 forms a major pair with any id in ids2"""
+        if len(ids1) == 1 and len(ids2) == 1:
+            (id1,), (id2,) = ids1, ids2
+            return (min(id1, id2), max(id1, id2)) in self.major_pairs
+
+        if len(ids1) > len(ids2):
+            ids1, ids2 = ids2, ids1
+        for drug_id in ids1:
+            partners = self._partners.get(drug_id)
+            if partners and not partners.isdisjoint(ids2):
+                return True
+        return False
+
+
+def _string_rows(path: str, key: str, value, width: int) -> list:
+    """value as a list of width-tuples of non-empty strings, or ValueError"""
+    if not isinstance(value, list) or not all(
+        isinstance(row, (list, tuple)) and len(row) == width and all(isinstance(item, str) and item.strip() for item in row)
+        for row in value
+    ):
+        raise ValueError(f"{path}: {key} must be a list of {width}-item lists of non-empty strings")
+    return [tuple(row) for row in value]
+
+
+def load_rules(path: str) -> dict:
+    """
+    Read a JSON rules file. Recognised keys are version, major_pairs,
+    drug_classes, class_interactions and monitored_classes; any rule key
+    that is missing falls back to the built-in tables above. Raises
+    ValueError if the file is not shaped like those tables.
+    """
+    with open(path, "rb") as f:
+        raw = f.read()
+    data = json.loads(raw)
+    if not isinstance(data, dict):
+        raise ValueError(f"{path}: expected a JSON object")
+
+    drug_classes = data.get("drug_classes", DRUG_CLASSES)
+    if not isinstance(drug_classes, dict) or not all(
+        isinstance(members, list) and all(isinstance(member, str) and member.strip() for member in members)
+        for members in drug_classes.values()
+    ):
+        raise ValueError(f"{path}: drug_classes must map class names to lists of non-empty strings")
+
+    class_interactions = _string_rows(path, "class_interactions", data.get("class_interactions", CLASS_INTERACTIONS), 5)
+    monitored_classes = data.get("monitored_classes", MONITORED_CLASSES)
+    if not isinstance(monitored_classes, list) or not all(isinstance(name, str) for name in monitored_classes):
+        raise ValueError(f"{path}: monitored_classes must be a list of class names")
+    unknown = {name for rule in class_interactions for name in rule[:2]} | set(monitored_classes)
+    unknown -= set(drug_classes)
+    if unknown:
+        raise ValueError(f"{path}: unknown drug class(es) {', '.join(sorted(unknown))}")
+
+    return {
+        "version": str(data.get("version") or hashlib.sha256(raw).hexdigest()[:12]),
+        "major_pairs": _string_rows(path, "major_pairs", data.get("major_pairs", MAJOR_PAIRS), 2),
+        "drug_classes": drug_classes,
+        "class_interactions": class_interactions,
+        "monitored_classes": monitored_classes,
+    }
+
+
+class RuleSet:
+    """A compiled InteractionIndex together with where and when it was built"""
+
+    def __init__(self, index: InteractionIndex, version: str, source: str, build_seconds: float):
+        self.index = index
+        self.version = version
+        self.source = source
+        self.built_at = datetime.now(timezone.utc)
+        self.build_seconds = build_seconds
+
+    def info(self) -> dict:
+        return {
+            "version": self.version,
+            "source": self.source,
+            "built_at": self.built_at.isoformat(),
+            "build_ms": round(self.build_seconds * 1000, 2),
+            "rules": self.index.rule_count,
+        }
+
+
+class RuleSetManager:
+    """
+    Holds the active RuleSet and, when backed by a file, polls it for changes.
+
+    A changed file is recompiled on the watcher thread and published with a
+    single attribute assignment, so callers that grabbed `current` keep a
+    consistent rule set for the rest of their request. If the new file fails
+    to load, the previous rule set stays active.
+    """
+
+    def __init__(self, path: str = "", poll_interval: float = 5.0):
+        self.path = path
+        self.poll_interval = poll_interval
+        self._stamp = None
+        self._stop = threading.Event()
+        self._thread = None
+        self.current = self._build_builtin()
+        if path:
+            self.reload_if_changed()
+
+    def _file_stamp(self):
+        stat = os.stat(self.path)
+        return stat.st_mtime_ns, stat.st_size
+
+    def _build_builtin(self) -> RuleSet:
+        started = time.perf_counter()
+        index = InteractionIndex()
+        return RuleSet(index, "builtin", "builtin", time.perf_counter() - started)
+
+    def _build(self) -> RuleSet:
+        started = time.perf_counter()
+        rules = load_rules(self.path)
+        index = InteractionIndex(
+            rules["major_pairs"],
+            rules["drug_classes"],
+            rules["class_interactions"],
+            rules["monitored_classes"],
+        )
+        return RuleSet(index, rules["version"], self.path, time.perf_counter() - started)
+
+    def reload_if_changed(self) -> bool:
+        """Recompile and swap in the rules file if it changed since the last attempt"""
+        try:
+            stamp = self._file_stamp()
+            if stamp == self._stamp:
+                return False
+            # Remember the attempt so a broken file is not retried until it changes again
+            self._stamp = stamp
+            rule_set = self._build()
+        except Exception as e:
+            # Whatever is wrong with the file, the watcher thread must outlive it
+            print(f"[Rules] Loading {self.path} failed, keeping version {self.current.version}: {e}")
+            return False
+
+        self.current = rule_set
+        print(f"[Rules] Loaded version {rule_set.version} in {rule_set.build_seconds * 1000:.1f} ms")
+        return True
+
+    def _watch(self):
+        while not self._stop.wait(self.poll_interval):
+            self.reload_if_changed()
+
+    def start(self):
+        if not self.path or self._thread:
+            return
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._watch, name="rules-watcher", daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        if self._thread:
+            self._stop.set()
+            self._thread.join()
+            self._thread = None
@@ -0,0 +1,107 @@
+import argparse
+import random
+import string
+import sys
+import time
+
+from api.utils.interaction_index import (
+    CLASS_INTERACTIONS, DRUG_CLASSES, MAJOR_PAIRS, MONITORED_CLASSES, InteractionIndex, normalize_drug_name
+)
+
+
+def linear_classify(drug1: str, drug2: str, major_pairs=MAJOR_PAIRS, drug_classes=DRUG_CLASSES,
+                    class_interactions=CLASS_INTERACTIONS, monitored_classes=MONITORED_CLASSES) -> tuple:
+    """
+    The classify_interaction that predates InteractionIndex, written over the
+    rule tables: a substring scan of every major pair, then of every class
+    rule in priority order. The reference for equivalence checks and the
+    baseline of the benchmark. Returns (interaction_type, severity).
+    """
+    drug1_lower = normalize_drug_name(drug1)
+    drug2_lower = normalize_drug_name(drug2)
+
+    for d1, d2 in major_pairs:
+        if (d1 in drug1_lower or drug1_lower in d1) and (d2 in drug2_lower or drug2_lower in d2):
+            return "EFFECT", "Major"
+        if (d1 in drug2_lower or drug2_lower in d1) and (d2 in drug1_lower or drug1_lower in d2):
+            return "EFFECT", "Major"
+
+    def present(class_name):
+        return any(member in drug1_lower or member in drug2_lower for member in drug_classes[class_name])
+
+    for class_a, class_b, interaction_type, severity, _ in class_interactions:
+        if present(class_a) and present(class_b):
+            return interaction_type, severity
+
+    if any(present(class_name) for class_name in monitored_classes):
+        return "ADVICE", "Minor"
+    return "EFFECT", "Moderate"
+
+
+def indexed_classify(index: InteractionIndex, drug1: str, drug2: str) -> tuple:
+    """The rule part of classify_interaction on a compiled index: (interaction_type, severity)"""
+    name1 = normalize_drug_name(drug1)
+    name2 = normalize_drug_name(drug2)
+    if index.is_major_pair(index.related_ids(name1), index.related_ids(name2)):
+        return "EFFECT", "Major"
+    outcome = index.class_outcome(index.class_mask(name1) | index.class_mask(name2))
+    if outcome:
+        return outcome[0], outcome[1]
+    return "EFFECT", "Moderate"
+
+
+def synthetic_rules(rule_count: int, rng: random.Random) -> list:
+    """rule_count distinct major pairs over roughly 6 * sqrt(rule_count) drug names"""
+    name_count = max(int(6 * rule_count ** 0.5), 60)
+    names = set()
+    while len(names) < name_count:
+        names.add("".join(rng.choice(string.ascii_lowercase) for _ in range(rng.randint(7, 13))))
+    names = sorted(names)
+    pairs = set()
+    while len(pairs) < rule_count:
+        pairs.add(tuple(rng.sample(names, 2)))
+    return sorted(pairs)
+
+
+def per_call_us(classify, queries, budget: float) -> float:
+    """Mean microseconds per classify(drug1, drug2), over as many queries as fit in budget seconds"""
+    started = time.perf_counter()
+    calls = 0
+    for drug1, drug2 in queries:
+        classify(drug1, drug2)
+        calls += 1
+        if time.perf_counter() - started > budget:
+            break
+    return (time.perf_counter() - started) / calls * 1e6
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Per-call classification latency: linear scan vs InteractionIndex")
+    parser.add_argument("--rules", default="100,10000,1000000", help="Comma-separated major pair counts")
+    parser.add_argument("--queries", type=int, default=20000, help="Classifications timed per rule set")
+    parser.add_argument("--baseline-seconds", type=float, default=2.0, help="Time budget for the linear scan")
+    args = parser.parse_args(argv)
+    import resource
+
+    rng = random.Random(1)
+    for rule_count in (int(count) for count in args.rules.split(",")):
+        pairs = synthetic_rules(rule_count, rng)
+        names = sorted({name for pair in pairs for name in pair})
+        queries = [(rng.choice(names), rng.choice(names)) for _ in range(args.queries)]
+
+        rss_before = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        started = time.perf_counter()
+        index = InteractionIndex(pairs)
+        build_seconds = time.perf_counter() - started
+        rss_growth = (resource.getrusage(resource.RUSAGE_SELF).ru_maxrss - rss_before) / 1024
+
+        indexed = per_call_us(lambda d1, d2: indexed_classify(index, d1, d2), queries, budget=float("inf"))
+        linear = per_call_us(lambda d1, d2: linear_classify(d1, d2, pairs), queries, budget=args.baseline_seconds)
+        print(f"[Rules Benchmark] {rule_count:>9,} rules, {len(names):>6,} names: "
+              f"index {indexed:8.1f} us/call, linear scan {linear:10.1f} us/call, "
+              f"build {build_seconds:.2f} s, peak RSS +{rss_growth:.0f} MB")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,199 @@
+"""
+Memory-mapped drug interaction knowledge base.
+
+An offline builder compiles a CSV/TSV of drug pairs (DrugBank/TWOSIDES
+exports) into a compact binary file. The API opens it with mmap, so every
+worker shares the same page-cache pages and startup does no parsing.
+
+File layout (native byte order, every section 8-byte aligned):
+    header    magic, byte-order mark, name count, pair count, string bytes
+    offsets   uint32[name_count + 1] offsets of each name in the string table
+    keys      uint64[pair_count] sorted pair keys, (min_id << 32) | max_id
+    outcomes  uint8[pair_count] interaction type index << 4 | severity index
+    strings   UTF-8 drug names, sorted by their encoded bytes
+
+A drug's id is its rank in the sorted string table, so name -> id and
+pair -> outcome are both binary searches over the mapped file.
+"""
+import argparse
+import bisect
+import csv
+import mmap
+import os
+import struct
+import sys
+from array import array
+
+from api.utils.interaction_index import normalize_drug_name
+
+MAGIC = b"DDIKB001"
+BYTE_ORDER_MARK = 0x01020304
+HEADER = struct.Struct("=8sIIIQ")
+
+INTERACTION_TYPES = ("EFFECT", "MECHANISM", "ADVICE", "INT")
+SEVERITIES = ("Minor", "Moderate", "Major")
+DEFAULT_OUTCOME = ("EFFECT", "Major")
+
+
+def _align(offset: int) -> int:
+    return (offset + 7) & ~7
+
+
+def _pair_key(id1: int, id2: int) -> int:
+    if id1 > id2:
+        id1, id2 = id2, id1
+    return (id1 << 32) | id2
+
+
+def read_pairs(source_path: str):
+    """
+    Yield (drug1, drug2, interaction_type, severity) rows from a CSV or TSV file.
+
+    The file needs a header with drug1 and drug2 columns. interaction_type
+    and severity columns are optional and default to EFFECT / Major.
+    """
+    delimiter = "\t" if source_path.endswith((".tsv", ".tab")) else ","
+    with open(source_path, newline="", encoding="utf-8") as f:
+        reader = csv.DictReader(f, delimiter=delimiter)
+        missing = {"drug1", "drug2"} - set(reader.fieldnames or ())
+        if missing:
+            raise ValueError(f"{source_path}: missing column(s) {', '.join(sorted(missing))}")
+        for row in reader:
+            drug1 = normalize_drug_name(row["drug1"].strip())
+            drug2 = normalize_drug_name(row["drug2"].strip())
+            if not drug1 or not drug2 or drug1 == drug2:
+                continue
+            interaction_type = (row.get("interaction_type") or DEFAULT_OUTCOME[0]).strip().upper()
+            severity = (row.get("severity") or DEFAULT_OUTCOME[1]).strip().title()
+            if interaction_type not in INTERACTION_TYPES:
+                raise ValueError(f"{source_path}: unknown interaction_type {interaction_type!r}")
+            if severity not in SEVERITIES:
+                raise ValueError(f"{source_path}: unknown severity {severity!r}")
+            yield drug1, drug2, interaction_type, severity
+
+
+def build_knowledge_base(pairs, output_path: str) -> dict:
+    """
+    Compile (drug1, drug2, interaction_type, severity) rows into a binary
+    knowledge base at output_path. Duplicate pairs keep the highest severity.
+    """
+    outcomes = {}
+    for drug1, drug2, interaction_type, severity in pairs:
+        names = (drug1, drug2) if drug1 < drug2 else (drug2, drug1)
+        code = (INTERACTION_TYPES.index(interaction_type) << 4) | SEVERITIES.index(severity)
+        current = outcomes.get(names)
+        if current is None or (code & 0x0F) > (current & 0x0F):
+            outcomes[names] = code
+
+    encoded = sorted({name.encode("utf-8") for pair in outcomes for name in pair})
+    ids = {name.decode("utf-8"): i for i, name in enumerate(encoded)}
+
+    offsets = array("I", [0])
+    for name in encoded:
+        offsets.append(offsets[-1] + len(name))
+    strings = b"".join(encoded)
+
+    entries = sorted((_pair_key(ids[d1], ids[d2]), code) for (d1, d2), code in outcomes.items())
+    keys = array("Q", (key for key, _ in entries))
+    codes = bytes(code for _, code in entries)
+
+    tmp_path = f"{output_path}.tmp"
+    with open(tmp_path, "wb") as f:
+        f.write(HEADER.pack(MAGIC, BYTE_ORDER_MARK, len(encoded), len(keys), len(strings)))
+        for section in (offsets.tobytes(), keys.tobytes(), codes, strings):
+            f.write(b"\0" * (_align(f.tell()) - f.tell()))
+            f.write(section)
+    os.replace(tmp_path, output_path)
+
+    return {"drugs": len(encoded), "pairs": len(keys), "bytes": os.path.getsize(output_path)}
+
+
+class _NameTable:
+    """Sequence view of the mapped string table, so bisect can search it"""
+
+    def __init__(self, offsets, strings):
+        self._offsets = offsets
+        self._strings = strings
+
+    def __len__(self):
+        return len(self._offsets) - 1
+
+    def __getitem__(self, i):
+        return self._strings[self._offsets[i]:self._offsets[i + 1]].tobytes()
+
+
+class InteractionKnowledgeBase:
+    """Read-only, memory-mapped view of a compiled knowledge base file"""
+
+    def __init__(self, path: str):
+        self.path = path
+        with open(path, "rb") as f:
+            self._mmap = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+
+        view = memoryview(self._mmap)
+        magic, byte_order, name_count, pair_count, string_bytes = HEADER.unpack_from(view)
+        if magic != MAGIC:
+            raise ValueError(f"{path} is not a DDI knowledge base file")
+        if byte_order != BYTE_ORDER_MARK:
+            raise ValueError(f"{path} was built on a machine with a different byte order")
+
+        pos = _align(HEADER.size)
+        self._offsets = view[pos:pos + 4 * (name_count + 1)].cast("I")
+        pos = _align(pos + 4 * (name_count + 1))
+        self._keys = view[pos:pos + 8 * pair_count].cast("Q")
+        pos = _align(pos + 8 * pair_count)
+        self._codes = view[pos:pos + pair_count]
+        pos = _align(pos + pair_count)
+        self._strings = view[pos:pos + string_bytes]
+        self._names = _NameTable(self._offsets, self._strings)
+        self._view = view
+
+        self.drug_count = name_count
+        self.pair_count = pair_count
+
+    def drug_id(self, name: str):
+        """Id of an exact (normalized) drug name, or None"""
+        encoded = normalize_drug_name(name).encode("utf-8")
+        i = bisect.bisect_left(self._names, encoded)
+        if i < len(self._names) and self._names[i] == encoded:
+            return i
+        return None
+
+    def lookup(self, drug1: str, drug2: str):
+        """(interaction_type, severity) recorded for the pair, or None"""
+        id1 = self.drug_id(drug1)
+        if id1 is None:
+            return None
+        id2 = self.drug_id(drug2)
+        if id2 is None:
+            return None
+        return self.lookup_ids(id1, id2)
+
+    def lookup_ids(self, id1: int, id2: int):
+        """lookup() for drugs already resolved with drug_id"""
+        key = _pair_key(id1, id2)
+        i = bisect.bisect_left(self._keys, key)
+        if i == len(self._keys) or self._keys[i] != key:
+            return None
+        code = self._codes[i]
+        return INTERACTION_TYPES[code >> 4], SEVERITIES[code & 0x0F]
+
+    def close(self):
+        for view in (self._offsets, self._keys, self._codes, self._strings, self._view):
+            view.release()
+        self._mmap.close()
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Compile a drug pair CSV/TSV into a DDI knowledge base file")
+    parser.add_argument("source", help="CSV or TSV file with drug1, drug2[, interaction_type, severity] columns")
+    parser.add_argument("output", help="Path of the binary knowledge base to write")
+    args = parser.parse_args(argv)
+
+    stats = build_knowledge_base(read_pairs(args.source), args.output)
+    print(f"[Knowledge Base] {stats['pairs']} pairs, {stats['drugs']} drugs, {stats['bytes']} bytes -> {args.output}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,153 @@
+import asyncio
+import time
+from datetime import datetime, timezone
+
+UNKNOWN = "unknown"
+READY = "ready"
+LOADING = "loading"
+UNAVAILABLE = "unavailable"
+
+
+class ModelLoading(Exception):
+    """Raised when the Inference API answers that the model is still loading"""
+
+    def __init__(self, estimated_time: float):
+        super().__init__(f"Model is loading, estimated {estimated_time:.0f}s")
+        self.estimated_time = estimated_time
+
+
+def loading_estimate(response):
+    """
+    Seconds until the model should be loaded if response is the Inference
+    API's 503 "model loading" answer, else None. Uses the body's
+    estimated_time and the Retry-After header, whichever is later.
+    """
+    if response.status_code != 503:
+        return None
+    try:
+        body = response.json()
+    except ValueError:
+        body = {}
+    if not isinstance(body, dict):
+        body = {}
+
+    estimates = []
+    if isinstance(body.get("estimated_time"), (int, float)):
+        estimates.append(float(body["estimated_time"]))
+    retry_after = response.headers.get("retry-after", "")
+    if retry_after.isdigit():
+        estimates.append(float(retry_after))
+    if not estimates:
+        if "loading" not in str(body.get("error", "")).lower():
+            return None
+        estimates.append(20.0)
+    return max(max(estimates), 1.0)
+
+
+class ModelWarmer:
+    """
+    Keeps a hosted model warm and tracks whether it is ready.
+
+    A background task calls ping() every interval seconds; ping returns None
+    when the model answered, or the estimated seconds until it finishes
+    loading. While the model is loading the task re-pings after that
+    estimate (capped at max_wait), and requests wait on one shared readiness
+    event instead of each timing out against a cold model. Requests that
+    see a loading response themselves report it with mark_loading().
+    """
+
+    def __init__(self, ping, interval: float = 240.0, max_wait: float = 30.0):
+        self.ping = ping
+        self.interval = interval
+        self.max_wait = max_wait
+        self.state = UNKNOWN
+        self._ready = asyncio.Event()
+        self._wake = asyncio.Event()
+        self._loading_until = 0.0
+        self._task = None
+        self.pings = 0
+        self.last_ping_at = None
+        self.last_error = None
+
+    @property
+    def loading(self) -> bool:
+        return self.state == LOADING
+
+    def mark_ready(self):
+        if self.state != READY:
+            print("[Model Warmer] Model is ready")
+        self.state = READY
+        self._ready.set()
+
+    def mark_loading(self, estimated_time: float):
+        if self.state != LOADING:
+            print(f"[Model Warmer] Model is loading, estimated {estimated_time:.0f}s")
+        self.state = LOADING
+        self._ready.clear()
+        self._loading_until = time.monotonic() + estimated_time
+        self._wake.set()
+
+    async def wait_until_ready(self, timeout: float) -> bool:
+        """
+        Wait while the model is loading. Returns True once it is worth
+        calling the model again: it became ready, or (with no background
+        task to report readiness) its estimated load time has passed.
+        """
+        if not self.loading:
+            return True
+        if self._task is None:
+            timeout = min(timeout, max(self._loading_until - time.monotonic(), 0))
+        try:
+            await asyncio.wait_for(self._ready.wait(), timeout=timeout)
+            return True
+        except asyncio.TimeoutError:
+            return self._task is None
+
+    async def _run(self):
+        while True:
+            try:
+                estimated_time = await self.ping()
+                self.last_error = None
+                if estimated_time is None:
+                    self.mark_ready()
+                    delay = self.interval
+                else:
+                    self.mark_loading(estimated_time)
+                    delay = min(max(estimated_time, 1.0), self.max_wait)
+            except Exception as e:
+                print(f"[Model Warmer] Ping failed: {str(e)}")
+                self.last_error = str(e)
+                if self.state != LOADING:
+                    self.state = UNAVAILABLE
+                delay = min(self.interval, self.max_wait)
+            self.pings += 1
+            self.last_ping_at = datetime.now(timezone.utc)
+
+            self._wake.clear()
+            try:
+                await asyncio.wait_for(self._wake.wait(), timeout=delay)
+            except asyncio.TimeoutError:
+                pass
+
+    def start(self):
+        if self._task is None and self.interval > 0:
+            self._task = asyncio.get_running_loop().create_task(self._run())
+
+    async def stop(self):
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+    def stats(self) -> dict:
+        return {
+            "state": self.state,
+            "running": self._task is not None,
+            "pings": self.pings,
+            "last_ping_at": self.last_ping_at.isoformat() if self.last_ping_at else None,
+            "ready_in_seconds": round(max(self._loading_until - time.monotonic(), 0), 1) if self.loading else 0,
+            "last_error": self.last_error,
+        }
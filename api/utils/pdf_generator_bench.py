@@ -0,0 +1,67 @@
+import argparse
+import sys
+import time
+
+from reportlab import rl_config
+
+from api.utils.pdf_generator import DDIReportGenerator
+
+PREDICTION = {
+    "prediction": "EFFECT",
+    "severity": "Major",
+    "patient_report": "When taking the two drugs together, the risk of bleeding rises. " * 8,
+    "professional_report": "The interaction involves inhibition of CYP2C9-mediated clearance. " * 10,
+}
+
+
+class UncachedReportGenerator(DDIReportGenerator):
+    """DDIReportGenerator as it was before static paragraphs were pre-built: every paragraph parsed per report"""
+
+    def _static_paragraph(self, text: str, style_name: str, cache: bool = True):
+        return super()._static_paragraph(text, style_name, cache=False)
+
+
+def pdfs_per_second(generator: DDIReportGenerator, report_type: str, reports: int) -> float:
+    """Single-threaded renders per second of one report type, rotating the second drug"""
+    render = getattr(generator, f"generate_{report_type}_report")
+    render("Warfarin", "Aspirin", PREDICTION)
+    started = time.perf_counter()
+    for i in range(reports):
+        render("Warfarin", f"Aspirin{i % 5}", PREDICTION)
+    return reports / (time.perf_counter() - started)
+
+
+def identical_output(report_type: str, reports: int) -> bool:
+    """Whether both generators produce byte-identical PDFs (timestamps and ids fixed by rl_config.invariant)"""
+    invariant = rl_config.invariant
+    rl_config.invariant = 1
+    try:
+        before, after = UncachedReportGenerator(), DDIReportGenerator()
+        for i in range(reports):
+            args = ("Warfarin", f"Aspirin{i % 5}", PREDICTION)
+            if (getattr(before, f"generate_{report_type}_report")(*args).getvalue()
+                    != getattr(after, f"generate_{report_type}_report")(*args).getvalue()):
+                return False
+        return True
+    finally:
+        rl_config.invariant = invariant
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="PDFs/s on one core with and without pre-built static paragraphs")
+    parser.add_argument("--reports", type=int, default=60, help="Renders timed per report type and generator")
+    args = parser.parse_args(argv)
+
+    failed = False
+    for report_type in ("patient", "professional"):
+        before = pdfs_per_second(UncachedReportGenerator(), report_type, args.reports)
+        after = pdfs_per_second(DDIReportGenerator(), report_type, args.reports)
+        identical = identical_output(report_type, 10)
+        failed = failed or not identical
+        print(f"[PDF Benchmark] {report_type}: {before:.1f} -> {after:.1f} PDFs/s per core, "
+              f"output {'identical' if identical else 'DIFFERS'}")
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,122 @@
+import asyncio
+import multiprocessing
+import os
+import threading
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+
+from api.utils.pdf_generator import DDIReportGenerator
+
+_local = threading.local()
+
+
+def render_pdf(report_type: str, drug1: str, drug2: str, prediction_data: dict) -> bytes:
+    """Render one report to PDF bytes, reusing this worker's DDIReportGenerator"""
+    generator = getattr(_local, "generator", None)
+    if generator is None:
+        generator = _local.generator = DDIReportGenerator()
+
+    if report_type == "patient":
+        buffer = generator.generate_patient_report(drug1, drug2, prediction_data)
+    else:
+        buffer = generator.generate_professional_report(drug1, drug2, prediction_data)
+    return buffer.getvalue()
+
+
+class RenderPoolFull(Exception):
+    """Raised when the render queue is at capacity"""
+
+
+class PDFRenderPool:
+    """
+    Renders PDFs off the event loop on a process pool (default) or thread pool.
+
+    ReportLab's doc.build is CPU-bound, so rendering inline blocks every other
+    request on the worker. At most max_workers renders run at once and at most
+    max_queue more wait; beyond that render() raises RenderPoolFull so the
+    caller can shed load instead of queueing without bound. A render counts
+    against those limits until its job finishes, even if the request that
+    started it has gone away. If a worker process dies, the broken pool is
+    replaced on the next render.
+    """
+
+    def __init__(self, kind: str = "process", max_workers: int = None, max_queue: int = 16):
+        self.kind = kind
+        self.max_workers = max_workers or os.cpu_count() or 1
+        self.max_queue = max_queue
+        self._executor = None
+        self._lock = threading.Lock()
+        self._pending = 0
+        self.rendered = 0
+        self.rejected = 0
+
+    def _get_executor(self):
+        if self._executor is None:
+            if self.kind == "process":
+                try:
+                    # spawn: the app runs background threads, which fork does not copy safely
+                    self._executor = ProcessPoolExecutor(
+                        max_workers=self.max_workers,
+                        mp_context=multiprocessing.get_context("spawn")
+                    )
+                except (OSError, NotImplementedError) as e:
+                    print(f"[PDF Pool] Process pool unavailable ({e}), using threads")
+                    self.kind = "thread"
+            if self._executor is None:
+                self._executor = ThreadPoolExecutor(max_workers=self.max_workers, thread_name_prefix="pdf-render")
+        return self._executor
+
+    def _release(self, _future):
+        with self._lock:
+            self._pending -= 1
+
+    async def render(self, report_type: str, drug1: str, drug2: str, prediction_data: dict) -> bytes:
+        with self._lock:
+            if self._pending >= self.max_workers + self.max_queue:
+                self.rejected += 1
+                raise RenderPoolFull(f"{self._pending} PDF renders already pending")
+            self._pending += 1
+
+        executor = None
+        try:
+            executor = self._get_executor()
+            job = executor.submit(render_pdf, report_type, drug1, drug2, prediction_data)
+        except BaseException as e:
+            self._release(None)
+            if isinstance(e, BrokenProcessPool):
+                self._discard(executor)
+            raise
+        # Released when the job itself ends: a cancelled caller does not stop a running render
+        job.add_done_callback(self._release)
+        try:
+            pdf_bytes = await asyncio.wrap_future(job)
+        except BrokenProcessPool:
+            self._discard(executor)
+            raise
+        self.rendered += 1
+        return pdf_bytes
+
+    def _discard(self, executor):
+        """Drop a pool whose worker process died, so the next render starts a new one"""
+        if self._executor is executor:
+            print("[PDF Pool] Worker process died, restarting the pool")
+            self._executor = None
+            executor.shutdown(wait=False, cancel_futures=True)
+
+    def start(self):
+        self._get_executor()
+
+    def shutdown(self):
+        if self._executor is not None:
+            self._executor.shutdown(wait=False, cancel_futures=True)
+            self._executor = None
+
+    def stats(self) -> dict:
+        return {
+            "kind": self.kind,
+            "max_workers": self.max_workers,
+            "max_queue": self.max_queue,
+            "pending": self._pending,
+            "rendered": self.rendered,
+            "rejected": self.rejected,
+        }
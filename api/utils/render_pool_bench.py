@@ -0,0 +1,116 @@
+import argparse
+import asyncio
+import contextlib
+import io
+import sys
+import time
+
+import httpx
+
+from api.utils.render_pool import PDFRenderPool, render_pdf
+
+
+class InlineRenderer:
+    """How PDFs were rendered before the pool: on the event loop itself"""
+
+    kind = "inline"
+
+    async def render(self, report_type: str, drug1: str, drug2: str, prediction_data: dict) -> bytes:
+        return render_pdf(report_type, drug1, drug2, prediction_data)
+
+    def start(self):
+        pass
+
+    def shutdown(self):
+        pass
+
+
+def percentiles(latencies: list) -> tuple:
+    latencies = sorted(latencies)
+    return (round(latencies[len(latencies) // 2] * 1000, 1),
+            round(latencies[min(int(0.95 * len(latencies)), len(latencies) - 1)] * 1000, 1))
+
+
+async def measure(index, renderer, predictions: int, pdf_clients: int) -> dict:
+    """/api/predict latency with the app idle, then while pdf_clients keep PDF renders in flight"""
+    index.pdf_render_pool = renderer
+    renderer.start()
+    # Warm the workers so their start-up is not measured
+    await renderer.render("patient", "a", "b", {})
+
+    pdf_request = {
+        "drug1": "Warfarin", "drug2": "Aspirin", "report_type": "professional",
+        "prediction_data": {"prediction": "EFFECT", "severity": "Major", "professional_report": "x" * 2000},
+    }
+    transport = httpx.ASGITransport(app=index.app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench", timeout=None) as client:
+        stop = asyncio.Event()
+        rendered = 0
+
+        async def pdf_client():
+            nonlocal rendered
+            while not stop.is_set():
+                await client.post("/api/generate-pdf", json=pdf_request)
+                rendered += 1
+
+        async def predict_latencies(offset: int) -> list:
+            latencies = []
+            for i in range(predictions):
+                started = time.perf_counter()
+                # A new pair every call, so no explanation cache hits
+                await client.post("/api/predict", json={"drug1": f"drug{offset + i}", "drug2": "aspirin"})
+                latencies.append(time.perf_counter() - started)
+            return latencies
+
+        async def busy_latencies() -> list:
+            await asyncio.sleep(0.05)
+            try:
+                return await predict_latencies(predictions)
+            finally:
+                stop.set()
+
+        idle = await predict_latencies(0)
+        started = time.perf_counter()
+        busy, *_ = await asyncio.gather(busy_latencies(), *(pdf_client() for _ in range(pdf_clients)))
+        elapsed = time.perf_counter() - started
+    renderer.shutdown()
+
+    return {
+        "mode": renderer.kind,
+        "idle_p50_ms": percentiles(idle)[0],
+        "idle_p95_ms": percentiles(idle)[1],
+        "busy_p50_ms": percentiles(busy)[0],
+        "busy_p95_ms": percentiles(busy)[1],
+        "pdfs_per_second": round(rendered / elapsed, 1),
+    }
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="/api/predict latency while PDFs render: inline vs thread vs process pool")
+    parser.add_argument("--modes", default="inline,thread,process", help="Comma-separated render modes")
+    parser.add_argument("--predictions", type=int, default=100, help="Predictions timed per phase")
+    parser.add_argument("--pdf-clients", type=int, default=4, help="Concurrent PDF clients in the busy phase")
+    parser.add_argument("--workers", type=int, default=4, help="Render pool workers")
+    args = parser.parse_args(argv)
+
+    from api import index
+    from api.utils.generation_backend import StubBackend
+
+    # Explanations come from a fast stub and PDFs are never served from the cache,
+    # so the numbers reflect how much rendering holds up the event loop
+    index.generation_backend = StubBackend(latency=0.002)
+    index.pdf_cache = None
+    index.report_store = None
+
+    for mode in args.modes.split(","):
+        renderer = InlineRenderer() if mode == "inline" else PDFRenderPool(mode, max_workers=args.workers, max_queue=64)
+        with contextlib.redirect_stdout(io.StringIO()):
+            stats = asyncio.run(measure(index, renderer, args.predictions, args.pdf_clients))
+        print(f"[Render Pool Benchmark] {stats['mode']}: predict idle p50/p95 {stats['idle_p50_ms']}/{stats['idle_p95_ms']} ms, "
+              f"with {args.pdf_clients} PDF clients {stats['busy_p50_ms']}/{stats['busy_p95_ms']} ms, "
+              f"{stats['pdfs_per_second']} PDFs/s")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
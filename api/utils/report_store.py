@@ -0,0 +1,204 @@
+import os
+import sqlite3
+import threading
+import time
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS reports (
+    key TEXT PRIMARY KEY,
+    drug_a TEXT NOT NULL,
+    drug_b TEXT NOT NULL,
+    kind TEXT NOT NULL,
+    interaction_type TEXT NOT NULL,
+    severity TEXT NOT NULL,
+    model TEXT NOT NULL,
+    text TEXT NOT NULL,
+    created_at REAL NOT NULL,
+    accessed_at REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS reports_pair ON reports (drug_a, drug_b, kind, created_at);
+CREATE INDEX IF NOT EXISTS reports_accessed ON reports (accessed_at);
+"""
+
+COLUMNS = ("key", "drug_a", "drug_b", "kind", "interaction_type", "severity", "model", "text", "created_at", "accessed_at")
+
+
+class ReportStore:
+    """
+    Persistent SQLite store of classified, generated reports shared by all workers.
+
+    The database runs in WAL mode so readers in every worker proceed while one
+    writer commits. Each process (and thread) opens its own connection. Writes
+    and access-time updates are buffered and committed in batches by a
+    background thread, which also evicts the least recently used rows once
+    the table grows past max_entries. Store errors are logged and otherwise
+    ignored: the store only ever saves work.
+    """
+
+    def __init__(self, path: str, max_entries: int = 50000, batch_size: int = 32, flush_interval: float = 1.0):
+        self.path = path
+        self.max_entries = max_entries
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self._local = threading.local()
+        self._lock = threading.Lock()
+        self._pending = {}
+        self._touched = {}
+        self._wake = threading.Event()
+        self._stop = threading.Event()
+        self._thread = None
+        self.hits = 0
+        self.misses = 0
+
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        with self._connect() as conn:
+            conn.executescript(SCHEMA)
+
+    def _connect(self) -> sqlite3.Connection:
+        conn = getattr(self._local, "conn", None)
+        if conn is None or self._local.pid != os.getpid():
+            conn = sqlite3.connect(self.path, timeout=5.0)
+            conn.row_factory = sqlite3.Row
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            self._local.conn = conn
+            self._local.pid = os.getpid()
+        return conn
+
+    def get(self, key: str):
+        """Stored row for key as a dict, or None"""
+        with self._lock:
+            row = self._pending.get(key)
+        if row is None:
+            try:
+                found = self._connect().execute(
+                    "SELECT * FROM reports WHERE key = ?", (key,)
+                ).fetchone()
+            except sqlite3.Error as e:
+                print(f"[Report Store] Read failed: {e}")
+                found = None
+            row = dict(found) if found else None
+
+        if row is None:
+            self.misses += 1
+            return None
+        self.hits += 1
+        with self._lock:
+            self._touched[key] = time.time()
+        return row
+
+    def latest_for_pair(self, drug_a: str, drug_b: str, kind: str):
+        """Most recently created row for a (sorted, normalized) pair and report kind, or None"""
+        with self._lock:
+            pending = [row for row in self._pending.values()
+                       if row["drug_a"] == drug_a and row["drug_b"] == drug_b and row["kind"] == kind]
+        if pending:
+            return max(pending, key=lambda row: row["created_at"])
+        try:
+            found = self._connect().execute(
+                "SELECT * FROM reports WHERE drug_a = ? AND drug_b = ? AND kind = ? "
+                "ORDER BY created_at DESC LIMIT 1",
+                (drug_a, drug_b, kind)
+            ).fetchone()
+        except sqlite3.Error as e:
+            print(f"[Report Store] Read failed: {e}")
+            return None
+        return dict(found) if found else None
+
+    def put(self, key: str, drug_a: str, drug_b: str, kind: str, interaction_type: str, severity: str, model: str, text: str):
+        """Queue a row for the next batched write"""
+        now = time.time()
+        with self._lock:
+            self._pending[key] = {
+                "key": key, "drug_a": drug_a, "drug_b": drug_b, "kind": kind,
+                "interaction_type": interaction_type, "severity": severity,
+                "model": model, "text": text, "created_at": now, "accessed_at": now,
+            }
+            full = len(self._pending) >= self.batch_size
+        if self._thread is None:
+            # Runtimes without lifespan events never call start()
+            self.start()
+        if full:
+            self._wake.set()
+
+    def flush(self):
+        """Commit queued writes and access-time updates, then enforce max_entries"""
+        with self._lock:
+            pending, self._pending = self._pending, {}
+            touched, self._touched = self._touched, {}
+        if not pending and not touched:
+            return
+
+        try:
+            conn = self._connect()
+            with conn:
+                conn.executemany(
+                    f"INSERT OR REPLACE INTO reports ({', '.join(COLUMNS)}) "
+                    f"VALUES ({', '.join('?' for _ in COLUMNS)})",
+                    [tuple(row[column] for column in COLUMNS) for row in pending.values()]
+                )
+                conn.executemany(
+                    "UPDATE reports SET accessed_at = ? WHERE key = ?",
+                    [(accessed_at, key) for key, accessed_at in touched.items()]
+                )
+                overflow = conn.execute("SELECT COUNT(*) FROM reports").fetchone()[0] - self.max_entries
+                if overflow > 0:
+                    conn.execute(
+                        "DELETE FROM reports WHERE key IN "
+                        "(SELECT key FROM reports ORDER BY accessed_at LIMIT ?)",
+                        (overflow,)
+                    )
+        except sqlite3.Error as e:
+            print(f"[Report Store] Write of {len(pending)} rows failed: {e}")
+
+    def invalidate(self, drug_a: str = None, drug_b: str = None) -> int:
+        """Delete the rows for one (sorted, normalized) pair, or every row"""
+        self.flush()
+        try:
+            conn = self._connect()
+            with conn:
+                if drug_a is None:
+                    return conn.execute("DELETE FROM reports").rowcount
+                return conn.execute(
+                    "DELETE FROM reports WHERE drug_a = ? AND drug_b = ?", (drug_a, drug_b)
+                ).rowcount
+        except sqlite3.Error as e:
+            print(f"[Report Store] Invalidation failed: {e}")
+            return 0
+
+    def _run(self):
+        while not self._stop.is_set():
+            self._wake.wait(self.flush_interval)
+            self._wake.clear()
+            self.flush()
+
+    def start(self):
+        if self._thread:
+            return
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._run, name="report-store-writer", daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        if self._thread:
+            self._stop.set()
+            self._wake.set()
+            self._thread.join()
+            self._thread = None
+        self.flush()
+
+    def stats(self) -> dict:
+        try:
+            size = self._connect().execute("SELECT COUNT(*) FROM reports").fetchone()[0]
+        except sqlite3.Error:
+            size = None
+        return {
+            "path": self.path,
+            "size": size,
+            "max_entries": self.max_entries,
+            "pending_writes": len(self._pending),
+            "hits": self.hits,
+            "misses": self.misses,
+        }
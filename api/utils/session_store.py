@@ -0,0 +1,103 @@
+import json
+import os
+import sqlite3
+import threading
+import time
+import uuid
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS sessions (
+    id TEXT PRIMARY KEY,
+    version INTEGER NOT NULL,
+    data TEXT NOT NULL,
+    created_at REAL NOT NULL,
+    updated_at REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS sessions_updated ON sessions (updated_at);
+"""
+
+
+class SessionConflict(Exception):
+    """Raised when a session was changed by another request since it was read"""
+
+
+class SessionStore:
+    """
+    Local SQLite store of medication-list sessions.
+
+    Each session is one JSON document: its drug list and the pairwise
+    results already computed for it. Every write bumps a version number
+    and only succeeds against the version that was read, so concurrent
+    edits from any worker fail with SessionConflict instead of silently
+    overwriting each other. Sessions untouched for ttl seconds are purged.
+    """
+
+    def __init__(self, path: str, ttl: float = 7 * 24 * 3600):
+        self.path = path
+        self.ttl = ttl
+        self._local = threading.local()
+
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        with self._connect() as conn:
+            conn.executescript(SCHEMA)
+
+    def _connect(self) -> sqlite3.Connection:
+        conn = getattr(self._local, "conn", None)
+        if conn is None or self._local.pid != os.getpid():
+            conn = sqlite3.connect(self.path, timeout=5.0)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            self._local.conn = conn
+            self._local.pid = os.getpid()
+        return conn
+
+    def create(self, data: dict) -> str:
+        session_id = uuid.uuid4().hex
+        now = time.time()
+        conn = self._connect()
+        with conn:
+            conn.execute("DELETE FROM sessions WHERE updated_at < ?", (now - self.ttl,))
+            conn.execute(
+                "INSERT INTO sessions (id, version, data, created_at, updated_at) VALUES (?, 1, ?, ?, ?)",
+                (session_id, json.dumps(data), now, now)
+            )
+        return session_id
+
+    def get(self, session_id: str):
+        """(version, data) for a live session, or None"""
+        row = self._connect().execute(
+            "SELECT version, data FROM sessions WHERE id = ? AND updated_at >= ?",
+            (session_id, time.time() - self.ttl)
+        ).fetchone()
+        if row is None:
+            return None
+        return row[0], json.loads(row[1])
+
+    def update(self, session_id: str, version: int, data: dict):
+        """Replace the session read at version, raising SessionConflict if it has moved on"""
+        conn = self._connect()
+        with conn:
+            updated = conn.execute(
+                "UPDATE sessions SET version = version + 1, data = ?, updated_at = ? WHERE id = ? AND version = ?",
+                (json.dumps(data), time.time(), session_id, version)
+            ).rowcount
+        if not updated:
+            raise SessionConflict(f"Session {session_id} was modified concurrently")
+
+    def delete(self, session_id: str) -> bool:
+        conn = self._connect()
+        with conn:
+            return conn.execute("DELETE FROM sessions WHERE id = ?", (session_id,)).rowcount > 0
+
+    def stats(self) -> dict:
+        try:
+            size = self._connect().execute("SELECT COUNT(*) FROM sessions").fetchone()[0]
+        except sqlite3.Error:
+            size = None
+        return {
+            "path": self.path,
+            "size": size,
+            "ttl_seconds": self.ttl,
+        }
@@ -0,0 +1,35 @@
+import asyncio
+
+
+class SingleFlight:
+    """
+    Coalesces concurrent calls that share a key onto one in-flight task.
+
+    The first caller for a key starts the work; callers arriving while it is
+    still running await the same task. Waiters are shielded from each other:
+    a caller that is cancelled (e.g. by its own deadline) stops waiting but
+    does not cancel the shared work for everyone else.
+    """
+
+    def __init__(self):
+        self._in_flight = {}
+        self.executions = 0
+        self.coalesced = 0
+
+    async def do(self, key, fn, *args):
+        task = self._in_flight.get(key)
+        if task is None:
+            self.executions += 1
+            task = asyncio.ensure_future(fn(*args))
+            self._in_flight[key] = task
+            task.add_done_callback(lambda _: self._in_flight.pop(key, None))
+        else:
+            self.coalesced += 1
+        return await asyncio.shield(task)
+
+    def stats(self) -> dict:
+        return {
+            "in_flight": len(self._in_flight),
+            "executions": self.executions,
+            "coalesced": self.coalesced,
+        }
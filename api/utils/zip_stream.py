@@ -0,0 +1,42 @@
+import time
+import zipfile
+
+
+class ZipStream:
+    """
+    Builds a ZIP archive incrementally, handing back its bytes as each entry
+    is added so the archive never has to be held in memory.
+
+    The archive is written to this object as a non-seekable stream, so
+    zipfile emits data descriptors instead of seeking back to patch headers.
+    Entries are stored uncompressed: ReportLab already compresses page
+    streams, and deflating again would only spend CPU on the event loop.
+    """
+
+    def __init__(self):
+        self._chunks = []
+        self._zip = zipfile.ZipFile(self, mode="w", compression=zipfile.ZIP_STORED)
+
+    def write(self, data) -> int:
+        self._chunks.append(bytes(data))
+        return len(data)
+
+    def flush(self):
+        pass
+
+    def _drain(self) -> bytes:
+        data = b"".join(self._chunks)
+        self._chunks = []
+        return data
+
+    def add(self, name: str, data: bytes) -> bytes:
+        """Append one entry and return the archive bytes it produced"""
+        info = zipfile.ZipInfo(name, date_time=time.localtime()[:6])
+        info.compress_type = zipfile.ZIP_STORED
+        self._zip.writestr(info, data)
+        return self._drain()
+
+    def close(self) -> bytes:
+        """Write the central directory and return the final archive bytes"""
+        self._zip.close()
+        return self._drain()
@@ -1,4 +1,4 @@
-import React, { useState } from 'react';
+import React, { useRef, useState } from 'react';
 import axios from 'axios';
 import GlassCard from '../components/common/GlassCard';
 import './AnalyzerPage.css';
@@ -14,6 +14,69 @@ function AnalyzerPage() {
   const [activeTab, setActiveTab] = useState('patient');
   const [showDownloadModal, setShowDownloadModal] = useState(false);
   const [isDownloading, setIsDownloading] = useState(false);
+  const [isStreaming, setIsStreaming] = useState(false);
+  // Last downloaded PDF per report type, revalidated with its ETag
+  const downloadedPDFs = useRef({});
+
+  // Streams the analysis as server-sent events: the classification arrives
+  // first, then both reports token by token. Returns false if the browser
+  // cannot read a streamed response, so the caller can fall back.
+  const streamAnalysis = async () => {
+    const response = await fetch(`${API_BASE_URL}/api/predict/stream`, {
+      method: 'POST',
+      headers: { 'Content-Type': 'application/json' },
+      body: JSON.stringify({ drug1, drug2 })
+    });
+    if (!response.ok) {
+      throw new Error(`Analysis failed with status ${response.status}`);
+    }
+    if (!response.body || !window.TextDecoder) {
+      return false;
+    }
+
+    const reader = response.body.getReader();
+    const decoder = new TextDecoder();
+    let buffer = '';
+    let finished = false;
+
+    const handleEvent = (event, data) => {
+      if (event === 'classification') {
+        setResult({ ...data, patient_report: '', professional_report: '' });
+        setActiveTab('patient');
+        setIsLoading(false);
+        setIsStreaming(true);
+      } else if (event === 'token') {
+        setResult((current) => ({ ...current, [data.section]: current[data.section] + data.text }));
+      } else if (event === 'section') {
+        setResult((current) => ({ ...current, [data.section]: data.text }));
+      } else if (event === 'done') {
+        setResult(data);
+        finished = true;
+      }
+    };
+
+    while (true) {
+      const { value, done } = await reader.read();
+      if (done) break;
+      buffer += decoder.decode(value, { stream: true });
+      const messages = buffer.split('\n\n');
+      buffer = messages.pop();
+      for (const message of messages) {
+        let event = 'message';
+        let data = '';
+        for (const line of message.split('\n')) {
+          if (line.startsWith('event:')) event = line.slice(6).trim();
+          else if (line.startsWith('data:')) data += line.slice(5).trim();
+        }
+        if (data) handleEvent(event, JSON.parse(data));
+      }
+    }
+
+    if (!finished) {
+      throw new Error('Analysis stream ended early');
+    }
+    return true;
+  };
 
   const handleAnalyze = async () => {
     if (!drug1 || !drug2) {
@@ -25,17 +88,21 @@ function AnalyzerPage() {
     setResult(null);
 
     try {
-      const response = await axios.post(`${API_BASE_URL}/api/predict`, { 
-        drug1, 
-        drug2 
-      });
-      setResult(response.data);
-      setActiveTab('patient');
+      const streamed = await streamAnalysis();
+      if (!streamed) {
+        const response = await axios.post(`${API_BASE_URL}/api/predict`, { 
+          drug1, 
+          drug2 
+        });
+        setResult(response.data);
+        setActiveTab('patient');
+      }
     } catch (err) {
       setError('An error occurred during analysis. Please try again.');
       console.error(err);
     } finally {
       setIsLoading(false);
+      setIsStreaming(false);
     }
   };
 
@@ -43,6 +110,7 @@ function AnalyzerPage() {
     setIsDownloading(true);
     
     try {
+      const previous = downloadedPDFs.current[reportType];
       const response = await axios.post(
         `${API_BASE_URL}/api/generate-pdf`,
         {
@@ -52,12 +120,19 @@ function AnalyzerPage() {
           prediction_data: result
         },
         {
-          responseType: 'blob'
+          responseType: 'blob',
+          headers: previous ? { 'If-None-Match': previous.etag } : {},
+          validateStatus: (status) => (status >= 200 && status < 300) || status === 304
         }
       );
 
+      const pdf = previous && response.status === 304 ? previous.blob : new Blob([response.data]);
+      if (response.status !== 304 && response.headers.etag) {
+        downloadedPDFs.current[reportType] = { etag: response.headers.etag, blob: pdf };
+      }
+
       // Create download link
-      const url = window.URL.createObjectURL(new Blob([response.data]));
+      const url = window.URL.createObjectURL(pdf);
       const link = document.createElement('a');
       link.href = url;
       link.setAttribute(
@@ -130,6 +205,7 @@ function AnalyzerPage() {
               <button 
                 className="download-btn"
                 onClick={() => setShowDownloadModal(true)}
+                disabled={isStreaming}
               >
                 📥 Download Detailed Report
               </button>
@@ -0,0 +1,15 @@
+import os
+import sys
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+# Keep the app's on-disk stores and the network out of the test run
+os.environ.setdefault("PDF_CACHE_DIR", "")
+os.environ.setdefault("REPORT_STORE_PATH", "")
+os.environ.setdefault("SESSION_STORE_PATH", "")
+os.environ.setdefault("DDI_RULES_PATH", "")
+os.environ.setdefault("DDI_KB_PATH", "")
+os.environ.setdefault("GENERATION_BACKEND", "stub")
+os.environ.setdefault("PDF_RENDER_POOL", "thread")
+os.environ.setdefault("DDI_MODELS_WARMUP", "false")
@@ -0,0 +1,24 @@
+import pytest
+from fastapi.testclient import TestClient
+
+from api import index as app
+
+
+@pytest.fixture
+def client():
+    return TestClient(app.app)
+
+
+def test_admin_cache_disabled_without_token(client, monkeypatch):
+    monkeypatch.setattr(app, "ADMIN_TOKEN", "")
+    assert client.delete("/api/admin/cache").status_code == 404
+    assert client.delete("/api/admin/cache", headers={"x-admin-token": ""}).status_code == 404
+
+
+def test_admin_cache_requires_matching_token(client, monkeypatch):
+    monkeypatch.setattr(app, "ADMIN_TOKEN", "secret")
+    assert client.delete("/api/admin/cache").status_code == 403
+    assert client.delete("/api/admin/cache", headers={"x-admin-token": "wrong"}).status_code == 403
+    response = client.delete("/api/admin/cache", headers={"x-admin-token": "secret"})
+    assert response.status_code == 200
+    assert "invalidated" in response.json()
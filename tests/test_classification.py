@@ -0,0 +1,38 @@
+import pytest
+
+from api import index as app
+from api.utils.interaction_index import InteractionIndex
+from api.utils.knowledge_base import InteractionKnowledgeBase, build_knowledge_base
+
+
+@pytest.fixture
+def knowledge_base(tmp_path, monkeypatch):
+    path = str(tmp_path / "ddi.kb")
+    build_knowledge_base([
+        ("warfarin", "aspirin", "ADVICE", "Minor"),
+        ("simvastatin", "clarithromycin", "EFFECT", "Major"),
+        ("acetaminophen", "caffeine", "ADVICE", "Minor"),
+    ], path)
+    kb = InteractionKnowledgeBase(path)
+    monkeypatch.setattr(app, "knowledge_base", kb)
+    yield kb
+    kb.close()
+
+
+def classify(drug1, drug2):
+    interaction_index = InteractionIndex()
+    return app.classify_resolved(interaction_index, app.resolve_drug(interaction_index, drug1),
+                                 app.resolve_drug(interaction_index, drug2))
+
+
+def test_knowledge_base_never_downgrades_rules(knowledge_base):
+    assert classify("warfarin", "aspirin") == ("EFFECT", "Major", app.MAJOR_PAIR_DESCRIPTION)
+
+
+def test_knowledge_base_upgrades_rules(knowledge_base):
+    assert classify("simvastatin", "clarithromycin") == ("EFFECT", "Major", app.KNOWN_PAIR_DESCRIPTION)
+
+
+def test_knowledge_base_replaces_default(knowledge_base):
+    assert classify("acetaminophen", "caffeine") == ("ADVICE", "Minor", app.KNOWN_PAIR_DESCRIPTION)
+    assert classify("acetaminophen", "melatonin")[2] == app.DEFAULT_DESCRIPTION
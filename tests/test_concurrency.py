@@ -0,0 +1,38 @@
+import asyncio
+
+import pytest
+
+from api.utils.concurrency import hedged
+
+
+def test_hedge_sent_when_first_attempt_is_slow():
+    delays = [1.0, 0.01]
+
+    async def attempt():
+        await asyncio.sleep(delays.pop(0))
+        return "done"
+
+    assert asyncio.run(hedged(attempt, 0.05)) == ("done", True)
+
+
+@pytest.mark.parametrize("cancel_after", [0.01, 0.1])
+def test_cancelling_caller_cancels_every_attempt(cancel_after):
+    attempts = []
+
+    async def attempt():
+        task = asyncio.current_task()
+        attempts.append(task)
+        await asyncio.sleep(10)
+
+    async def run():
+        caller = asyncio.ensure_future(hedged(attempt, 0.05))
+        await asyncio.sleep(cancel_after)
+        caller.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await caller
+        await asyncio.sleep(0)
+        # Checked before asyncio.run cancels whatever is left over
+        return [task.cancelled() for task in attempts]
+
+    cancelled = asyncio.run(run())
+    assert cancelled == [True] * (1 if cancel_after < 0.05 else 2)
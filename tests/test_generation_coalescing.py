@@ -0,0 +1,35 @@
+import asyncio
+
+import httpx
+
+from api import index as app
+from api.utils.cache import TTLCache
+from api.utils.generation_backend import StubBackend
+from api.utils.singleflight import SingleFlight
+
+
+def test_concurrent_predictions_share_one_generation_per_explanation(monkeypatch):
+    requests = 20
+    backend = StubBackend(latency=0.2)
+    flights = SingleFlight()
+    monkeypatch.setattr(app, "generation_backend", backend)
+    monkeypatch.setattr(app, "generation_flights", flights)
+    monkeypatch.setattr(app, "explanation_cache", TTLCache(64, 3600))
+    monkeypatch.setattr(app, "report_store", None)
+
+    async def run():
+        transport = httpx.ASGITransport(app=app.app)
+        async with httpx.AsyncClient(transport=transport, base_url="http://test") as client:
+            return await asyncio.gather(*(
+                client.post("/api/predict", json={"drug1": "Warfarin", "drug2": "Aspirin"})
+                for _ in range(requests)
+            ))
+
+    responses = asyncio.run(run())
+    assert [response.status_code for response in responses] == [200] * requests
+    assert len({response.json()["patient_report"] for response in responses}) == 1
+    assert all(response.json()["sections"]["patient_report"] == "generated" for response in responses)
+    # One patient and one professional generation; every other caller waited on them
+    assert backend.calls == 2
+    assert flights.executions == 2
+    assert flights.coalesced == 2 * (requests - 1)
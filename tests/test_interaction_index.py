@@ -0,0 +1,60 @@
+import random
+
+from api import index as app
+from api.utils.interaction_index import DRUG_CLASSES, MAJOR_PAIRS, InteractionIndex
+from api.utils.interaction_index_bench import indexed_classify, linear_classify, synthetic_rules
+
+
+def candidate_names(names, rng):
+    """Rule names plus fragments, supersets, case variants and combinations of them"""
+    candidates = list(names) + ["", "a", "xyz", "Tylenol", "aspirin 81mg", "warfarin sodium", "statin", "pril", "sartan"]
+    for name in names:
+        start = rng.randrange(len(name))
+        end = rng.randrange(start, len(name)) + 1
+        candidates += [name[start:end], name.title(), "x" + name + "y", name + " " + rng.choice(names)]
+    return candidates
+
+
+def classify_with_index(interaction_index, drug1, drug2):
+    resolved1 = app.resolve_drug(interaction_index, app.normalize_drug_name(drug1))
+    resolved2 = app.resolve_drug(interaction_index, app.normalize_drug_name(drug2))
+    return app.classify_resolved(interaction_index, resolved1, resolved2)[:2]
+
+
+def test_builtin_rules_match_linear_scan():
+    rng = random.Random(0)
+    names = sorted({name for pair in MAJOR_PAIRS for name in pair} | {name for members in DRUG_CLASSES.values() for name in members})
+    candidates = candidate_names(names, rng)
+    # min_fragment=0 matches fragments of any length, exactly like the linear scan
+    interaction_index = InteractionIndex(min_fragment=0)
+    assert app.knowledge_base is None
+
+    mismatches = []
+    for drug1 in candidates:
+        for drug2 in rng.sample(candidates, 30) + [drug1]:
+            expected = linear_classify(drug1, drug2)
+            actual = classify_with_index(interaction_index, drug1, drug2)
+            if actual != expected:
+                mismatches.append((drug1, drug2, expected, actual))
+    assert mismatches == []
+
+
+def test_synthetic_rules_match_linear_scan():
+    rng = random.Random(1)
+    pairs = synthetic_rules(2000, rng)
+    names = sorted({name for pair in pairs for name in pair})
+    candidates = candidate_names(names, rng)
+    interaction_index = InteractionIndex(pairs, min_fragment=0)
+
+    for _ in range(3000):
+        drug1, drug2 = rng.choice(candidates), rng.choice(candidates)
+        assert indexed_classify(interaction_index, drug1, drug2) == linear_classify(drug1, drug2, pairs), (drug1, drug2)
+
+
+def test_short_fragments_do_not_match():
+    interaction_index = InteractionIndex()
+    assert interaction_index.related_ids("") == set()
+    assert interaction_index.related_ids("ar") == set()
+    assert interaction_index.containing_ids("far") != []
+    assert classify_with_index(interaction_index, "wa", "as") == ("EFFECT", "Moderate")
+    assert classify_with_index(interaction_index, "warfarin", "aspirin") == ("EFFECT", "Major")
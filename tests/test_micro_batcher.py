@@ -0,0 +1,71 @@
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+from api.ml.micro_batcher import MicroBatcher
+
+
+class FakeModel:
+    """run_batch that records every batch; blocks on gate while it is cleared"""
+
+    def __init__(self, fail_on=None):
+        self.batches = []
+        self.fail_on = fail_on
+        self.gate = threading.Event()
+        self.gate.set()
+
+    def __call__(self, items):
+        self.gate.wait(5)
+        self.batches.append(list(items))
+        if self.fail_on is not None and self.fail_on in items:
+            raise RuntimeError("model failed")
+        return [item * 10 for item in items]
+
+
+def test_batches_never_exceed_max_batch_size():
+    model = FakeModel()
+    batcher = MicroBatcher(model, max_batch_size=4, max_wait=0.2)
+    futures = [batcher.submit(i) for i in range(10)]
+    assert [future.result(5) for future in futures] == [i * 10 for i in range(10)]
+    assert sorted(len(batch) for batch in model.batches) == [2, 4, 4]
+    assert batcher.stats()["items"] == 10 and batcher.stats()["batches"] == 3
+
+
+def test_partial_batch_flushes_after_max_wait():
+    model = FakeModel()
+    batcher = MicroBatcher(model, max_batch_size=8, max_wait=0.05)
+    started = time.monotonic()
+    assert batcher.submit(7).result(5) == 70
+    assert 0.04 <= time.monotonic() - started < 1.0
+    assert model.batches == [[7]]
+
+
+def test_results_reach_their_callers_in_order():
+    model = FakeModel()
+    # Sorting by length reorders items inside a batch; each caller must still get its own result
+    batcher = MicroBatcher(model, max_batch_size=5, max_wait=0.02, length=lambda item: -item)
+    with ThreadPoolExecutor(max_workers=16) as pool:
+        results = list(pool.map(lambda i: batcher.submit(i).result(5), range(40)))
+    assert results == [i * 10 for i in range(40)]
+    assert any(batch != sorted(batch) for batch in model.batches if len(batch) > 1)
+
+
+def test_exception_reaches_every_waiter_in_the_failed_batch():
+    model = FakeModel(fail_on=13)
+    batcher = MicroBatcher(model, max_batch_size=4, max_wait=0.01, window=1)
+    # Hold the worker on a first batch so the next items queue up together
+    model.gate.clear()
+    first = batcher.submit(0)
+    time.sleep(0.05)
+    failing = [batcher.submit(item) for item in (11, 12, 13, 14)]
+    after = batcher.submit(20)
+    model.gate.set()
+
+    assert first.result(5) == 0
+    for future in failing:
+        with pytest.raises(RuntimeError, match="model failed"):
+            future.result(5)
+    assert after.result(5) == 200
+    assert [11, 12, 13, 14] in model.batches
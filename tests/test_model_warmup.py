@@ -0,0 +1,53 @@
+import threading
+import time
+
+from fastapi.testclient import TestClient
+
+from api import index as app
+from api.ml import ddi_predictor, report_generator
+from api.ml.model_holder import LazyModel
+from api.routers import predict as ddi_models
+
+
+def wait_for_state(model, states, timeout=5.0):
+    # warmup() starts the load on a background thread, so it may not have begun yet
+    deadline = time.monotonic() + timeout
+    while model.state not in states and time.monotonic() < deadline:
+        time.sleep(0.01)
+    return model.state
+
+
+def test_app_startup_warms_both_models(monkeypatch):
+    release = threading.Event()
+
+    def loader():
+        release.wait(5)
+        return object()
+
+    classifier = LazyModel("DDI classifier", loader)
+    generator = LazyModel("BioGPT generator", loader)
+    monkeypatch.setattr(ddi_predictor, "classifier", classifier)
+    monkeypatch.setattr(report_generator, "generator", generator)
+    monkeypatch.setattr(ddi_models, "DDI_MODELS_WARMUP", True)
+
+    with TestClient(app.app) as client:
+        assert wait_for_state(classifier, ("loading", "ready")) == "loading"
+        assert wait_for_state(generator, ("loading", "ready")) == "loading"
+        # Health and the model status endpoint answer while the models load
+        assert client.get("/api/health").status_code == 200
+        assert client.get("/api/ddi/models").json()["ready"] is False
+
+        release.set()
+        for model in (classifier, generator):
+            model.get()
+        assert client.get("/api/ddi/models").json()["ready"] is True
+
+
+def test_warmup_can_be_disabled(monkeypatch):
+    classifier = LazyModel("DDI classifier", object)
+    monkeypatch.setattr(ddi_predictor, "classifier", classifier)
+    monkeypatch.setattr(ddi_models, "DDI_MODELS_WARMUP", False)
+
+    with TestClient(app.app):
+        time.sleep(0.05)
+        assert classifier.state == "unloaded"
@@ -0,0 +1,43 @@
+import os
+
+import pytest
+
+pytest.importorskip("onnxruntime")
+pytest.importorskip("transformers")
+pytest.importorskip("torch")
+
+from api.ml.ddi_predictor import MODEL_ID, interaction_text
+from api.ml.onnx_classifier import OnnxClassifier, export_classifier
+
+# The classifier to export; point at a smaller checkpoint to keep local runs short
+AGREEMENT_MODEL = os.getenv("DDI_AGREEMENT_MODEL", MODEL_ID)
+MIN_AGREEMENT = float(os.getenv("DDI_AGREEMENT_MIN", "0.99"))
+
+DRUGS = ["warfarin", "aspirin", "ibuprofen", "simvastatin", "clarithromycin", "metformin",
+         "lisinopril", "digoxin", "fluoxetine", "tramadol", "amiodarone", "ketoconazole"]
+TEXTS = [interaction_text(DRUGS[i % len(DRUGS)], DRUGS[(i * 5 + 1) % len(DRUGS)]) for i in range(96)]
+
+
+@pytest.fixture(scope="module")
+def exported(tmp_path_factory):
+    directory = str(tmp_path_factory.mktemp("ddi-onnx"))
+    try:
+        export_classifier(AGREEMENT_MODEL, directory, quantize=True)
+    except OSError as e:
+        pytest.skip(f"{AGREEMENT_MODEL} is not available: {e}")
+    return directory
+
+
+@pytest.fixture(scope="module")
+def reference_labels():
+    from transformers import pipeline
+
+    classifier = pipeline("text-classification", model=AGREEMENT_MODEL)
+    return [result["label"] for result in classifier(TEXTS, batch_size=16)]
+
+
+@pytest.mark.parametrize("quantized", [False, True], ids=["fp32", "int8"])
+def test_onnx_labels_agree_with_pytorch(exported, reference_labels, quantized):
+    labels = [result["label"] for result in OnnxClassifier(exported, quantized=quantized)(TEXTS, batch_size=16)]
+    agreement = sum(a == b for a, b in zip(labels, reference_labels)) / len(TEXTS)
+    assert agreement >= MIN_AGREEMENT
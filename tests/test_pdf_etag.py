@@ -0,0 +1,49 @@
+import pytest
+from fastapi.testclient import TestClient
+
+from api import index as app
+from api.utils.pdf_cache import PDFCache
+
+PREDICTION = {"prediction": "EFFECT", "severity": "Major", "patient_report": "Bleeding risk rises."}
+
+
+def pdf_request(**prediction):
+    return {"drug1": "Warfarin", "drug2": "Aspirin", "report_type": "patient",
+            "prediction_data": {**PREDICTION, **prediction}}
+
+
+@pytest.fixture
+def client(tmp_path, monkeypatch):
+    monkeypatch.setattr(app, "pdf_cache", PDFCache(str(tmp_path)))
+    return TestClient(app.app)
+
+
+def test_etag_is_stable_for_identical_requests(client):
+    first = client.post("/api/generate-pdf", json=pdf_request())
+    second = client.post("/api/generate-pdf", json=pdf_request())
+    assert first.status_code == second.status_code == 200
+    assert first.headers["etag"] == second.headers["etag"]
+    assert first.content == second.content
+    assert app.pdf_cache.hits == 1
+
+
+def test_etag_changes_with_the_prediction(client):
+    first = client.post("/api/generate-pdf", json=pdf_request())
+    changed = client.post("/api/generate-pdf", json=pdf_request(severity="Moderate"))
+    assert first.headers["etag"] != changed.headers["etag"]
+
+
+def test_matching_if_none_match_returns_304_without_body(client):
+    etag = client.post("/api/generate-pdf", json=pdf_request()).headers["etag"]
+    rendered = app.pdf_render_pool.rendered
+
+    for header in (etag, f"W/{etag}", f'"other", {etag}', "*"):
+        response = client.post("/api/generate-pdf", json=pdf_request(), headers={"If-None-Match": header})
+        assert response.status_code == 304
+        assert response.content == b""
+        assert response.headers["etag"] == etag
+    assert app.pdf_render_pool.rendered == rendered
+
+    stale = client.post("/api/generate-pdf", json=pdf_request(), headers={"If-None-Match": '"stale"'})
+    assert stale.status_code == 200
+    assert stale.content.startswith(b"%PDF")
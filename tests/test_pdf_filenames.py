@@ -0,0 +1,38 @@
+import io
+import zipfile
+
+from fastapi.testclient import TestClient
+
+from api import index as app
+
+PREDICTION = {"prediction": "EFFECT", "severity": "Major", "patient_report": "text", "professional_report": "text"}
+
+
+def test_report_filename_strips_path_and_header_characters():
+    filename = app.report_filename("patient", "../../etc/passwd", 'x"; y\r\nz')
+    assert filename == "DDI_Report_Patient_.._.._etc_passwd_x_y_z.pdf"
+    assert "/" not in filename and '"' not in filename
+
+
+def test_bulk_zip_entries_stay_in_archive(monkeypatch):
+    monkeypatch.setattr(app, "pdf_cache", None)
+    client = TestClient(app.app)
+    response = client.post("/api/generate-pdf/bulk", json={"items": [
+        {"drug1": "../../x", "drug2": "/etc/cron.d/y", "report_type": "patient", "prediction_data": PREDICTION},
+        {"drug1": "..\\evil", "drug2": "Aspirin", "report_type": "patient", "prediction_data": PREDICTION},
+    ]})
+    assert response.status_code == 200
+    names = zipfile.ZipFile(io.BytesIO(response.content)).namelist()
+    pdfs = [name for name in names if name.endswith(".pdf")]
+    assert len(pdfs) == 2
+    assert all("/" not in name and "\\" not in name for name in names)
+
+
+def test_single_pdf_content_disposition_is_sanitized(monkeypatch):
+    monkeypatch.setattr(app, "pdf_cache", None)
+    client = TestClient(app.app)
+    response = client.post("/api/generate-pdf", json={
+        "drug1": "../x", "drug2": 'a";b', "report_type": "patient", "prediction_data": PREDICTION,
+    })
+    assert response.status_code == 200
+    assert response.headers["content-disposition"] == 'attachment; filename="DDI_Report_Patient_.._x_a_b.pdf"'
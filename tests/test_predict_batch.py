@@ -0,0 +1,93 @@
+import asyncio
+import json
+import time
+
+import pytest
+from fastapi.testclient import TestClient
+
+from api import index as app
+from api.utils.cache import TTLCache
+from api.utils.generation_backend import StubBackend
+
+
+class PerDrugLatencyBackend(StubBackend):
+    """StubBackend that takes longer for prompts mentioning a slow drug"""
+
+    def __init__(self, slow: dict):
+        super().__init__()
+        self.slow = slow
+
+    async def _generate(self, prompt, parameters, on_token=None):
+        await asyncio.sleep(max((latency for drug, latency in self.slow.items() if drug in prompt), default=0.0))
+        return await super()._generate(prompt, parameters, on_token)
+
+
+@pytest.fixture
+def backend(monkeypatch):
+    backend = PerDrugLatencyBackend({"Digoxin": 0.5})
+    monkeypatch.setattr(app, "generation_backend", backend)
+    monkeypatch.setattr(app, "explanation_cache", TTLCache(64, 3600))
+    monkeypatch.setattr(app, "report_store", None)
+    return backend
+
+
+def pairs(*names):
+    return [{"drug1": drug1, "drug2": drug2} for drug1, drug2 in names]
+
+
+def test_lines_stream_in_completion_order(backend):
+    request = app.BatchPredictionRequest(pairs=pairs(("Warfarin", "Digoxin"), ("Warfarin", "Aspirin"), ("Metformin", "Aspirin")))
+
+    async def collect():
+        started = time.perf_counter()
+        arrivals = []
+        async for line in app.stream_batch_predictions(request.pairs):
+            arrivals.append((time.perf_counter() - started, json.loads(line)))
+        return arrivals
+
+    arrivals = asyncio.run(collect())
+    indexes = [record["index"] for _, record in arrivals]
+    assert sorted(indexes[:2]) == [1, 2] and indexes[2] == 0
+    # The fast pairs are yielded before the slow one finishes, not all at the end
+    assert arrivals[0][0] < 0.25 and arrivals[1][0] < 0.25
+    assert arrivals[2][0] >= 0.5
+
+
+def test_endpoint_returns_one_ndjson_line_per_pair(backend):
+    response = TestClient(app.app).post("/api/predict/batch", json={"pairs": pairs(("Warfarin", "Aspirin"), ("Metformin", "Digoxin"))})
+    assert response.status_code == 200
+    assert response.headers["content-type"].startswith("application/x-ndjson")
+    records = [json.loads(line) for line in response.text.splitlines()]
+    assert sorted(record["index"] for record in records) == [0, 1]
+    by_index = {record["index"]: record for record in records}
+    assert by_index[0]["severity"] == "Major"
+    assert by_index[1]["drug2"] == "Digoxin"
+
+
+def test_failed_pair_becomes_an_error_line(backend, monkeypatch):
+    classify = app.classify_interaction
+
+    async def failing(drug1, drug2):
+        if "Boom" in (drug1, drug2):
+            raise RuntimeError("classifier exploded")
+        return await classify(drug1, drug2)
+
+    monkeypatch.setattr(app, "classify_interaction", failing)
+    response = TestClient(app.app).post("/api/predict/batch", json={
+        "pairs": pairs(("Warfarin", "Aspirin"), ("Boom", "Aspirin"), ("Metformin", "Aspirin"))
+    })
+    assert response.status_code == 200
+    records = {record["index"]: record for record in map(json.loads, response.text.splitlines())}
+    assert sorted(records) == [0, 1, 2]
+    assert records[1] == {"index": 1, "drug1": "Boom", "drug2": "Aspirin", "error": "Analysis failed"}
+    assert "error" not in records[0] and "error" not in records[2]
+
+
+def test_pair_limit_is_enforced(backend, monkeypatch):
+    monkeypatch.setattr(app, "PREDICT_BATCH_MAX_PAIRS", 2)
+    client = TestClient(app.app)
+    response = client.post("/api/predict/batch", json={"pairs": pairs(("A1", "B1"), ("A2", "B2"), ("A3", "B3"))})
+    assert response.status_code == 400
+    assert "At most 2 pairs" in response.json()["detail"]
+    assert client.post("/api/predict/batch", json={"pairs": pairs(("A1", "B1"), ("A2", "B2"))}).status_code == 200
+    assert client.post("/api/predict/batch", json={"pairs": []}).status_code == 400
@@ -0,0 +1,65 @@
+import json
+
+import pytest
+from fastapi.testclient import TestClient
+
+from api import index as app
+from api.utils.cache import TTLCache
+from api.utils.generation_backend import StubBackend
+from api.utils.singleflight import SingleFlight
+
+REQUEST = {"drug1": "warfarin", "drug2": "aspirin"}
+
+
+@pytest.fixture
+def client(monkeypatch):
+    monkeypatch.setattr(app, "generation_backend", StubBackend(latency=0.05))
+    monkeypatch.setattr(app, "generation_flights", SingleFlight())
+    monkeypatch.setattr(app, "explanation_cache", TTLCache(64, 3600))
+    monkeypatch.setattr(app, "report_store", None)
+    return TestClient(app.app)
+
+
+def stream_events(client) -> list:
+    """(event, data) for every server-sent event of one streamed prediction"""
+    response = client.post("/api/predict/stream", json=REQUEST)
+    assert response.status_code == 200
+    assert response.headers["content-type"].startswith("text/event-stream")
+    events = []
+    for block in response.text.strip().split("\n\n"):
+        fields = dict(line.split(": ", 1) for line in block.splitlines())
+        events.append((fields["event"], json.loads(fields["data"])))
+    return events
+
+
+def test_events_arrive_in_order(client):
+    events = stream_events(client)
+    names = [event for event, _ in events]
+
+    assert names[0] == "classification"
+    assert events[0][1] == {"prediction": "EFFECT", "severity": "Major"}
+    assert names[-1] == "done"
+    assert names.count("section") == 2
+
+    done = events[-1][1]
+    for section in ("patient_report", "professional_report"):
+        positions = [i for i, (event, data) in enumerate(events) if data.get("section") == section]
+        tokens = [events[i][1]["text"] for i in positions if events[i][0] == "token"]
+        # Every token of a section comes before its section event, which carries the final text
+        assert tokens and events[positions[-1]][0] == "section"
+        assert all(events[i][0] == "token" for i in positions[:-1])
+        assert events[positions[-1]][1]["source"] == "generated"
+        assert events[positions[-1]][1]["text"] == done[section]
+        assert done["sections"][section] == "generated"
+
+
+def test_cache_hit_sends_sections_without_tokens(client):
+    first = stream_events(client)
+    calls = app.generation_backend.calls
+
+    events = stream_events(client)
+    assert app.generation_backend.calls == calls
+    assert [event for event, _ in events] == ["classification", "section", "section", "done"]
+    cached = {data["section"]: data["text"] for event, data in events if event == "section"}
+    generated = {data["section"]: data["text"] for event, data in first if event == "section"}
+    assert cached == generated
@@ -0,0 +1,65 @@
+import pytest
+from fastapi.testclient import TestClient
+
+from api import index as app
+from api.utils.cache import TTLCache
+from api.utils.generation_backend import StubBackend
+
+DRUGS = ["Warfarin", "Aspirin", "warfarin sodium", "Metformin", "Simvastatin", " WARFARIN ", "Clarithromycin"]
+
+
+@pytest.fixture
+def client(monkeypatch):
+    monkeypatch.setattr(app, "generation_backend", StubBackend())
+    monkeypatch.setattr(app, "explanation_cache", TTLCache(64, 3600))
+    monkeypatch.setattr(app, "report_store", None)
+    return TestClient(app.app)
+
+
+def analyze(client, **request):
+    response = client.post("/api/regimen", json={"drugs": DRUGS, "explain_severity": "Major", **request})
+    assert response.status_code == 200
+    return response.json()
+
+
+def test_duplicate_entities_are_merged(client):
+    regimen = analyze(client)
+    assert regimen["drugs"] == ["Warfarin", "Aspirin", "Metformin", "Simvastatin", "Clarithromycin"]
+    assert regimen["duplicates"] == {"Warfarin Sodium": "Warfarin"}
+    assert len(regimen["interactions"]) == 10
+
+
+def test_interactions_are_ranked_most_severe_first(client):
+    severities = [interaction["severity"] for interaction in analyze(client)["interactions"]]
+    ranks = [app.SEVERITY_RANK[severity] for severity in severities]
+    assert ranks == sorted(ranks, reverse=True)
+    assert severities[0] == "Major"
+    assert {"Moderate"} <= set(severities)
+
+
+def test_matrix_is_symmetric_with_empty_diagonal(client):
+    regimen = analyze(client)
+    matrix = regimen["matrix"]
+    size = len(regimen["drugs"])
+    assert len(matrix) == size and all(len(row) == size for row in matrix)
+    for i in range(size):
+        assert matrix[i][i] is None
+        for j in range(size):
+            assert matrix[i][j] == matrix[j][i]
+
+    index = {drug: i for i, drug in enumerate(regimen["drugs"])}
+    for interaction in regimen["interactions"]:
+        assert matrix[index[interaction["drug1"]]][index[interaction["drug2"]]] == interaction["severity"]
+    assert matrix[index["Warfarin"]][index["Aspirin"]] == "Major"
+
+
+def test_only_pairs_at_or_above_threshold_are_explained(client):
+    for interaction in analyze(client)["interactions"]:
+        explained = interaction["severity"] == "Major"
+        assert bool(interaction["patient_report"]) == explained
+        assert bool(interaction["sections"]) == explained
+
+
+def test_one_distinct_drug_is_rejected(client):
+    response = client.post("/api/regimen", json={"drugs": ["Warfarin", "warfarin sodium"]})
+    assert response.status_code == 400
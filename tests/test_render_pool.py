@@ -0,0 +1,70 @@
+import asyncio
+import os
+import threading
+
+import pytest
+
+from api.utils import render_pool
+from api.utils.render_pool import PDFRenderPool, RenderPoolFull
+
+release = threading.Event()
+
+
+def blocking_render(report_type, drug1, drug2, prediction_data):
+    release.wait(5)
+    return b"%PDF-blocked"
+
+
+def crashing_render(report_type, drug1, drug2, prediction_data):
+    # Kill the worker process, as a segfault in a native library would
+    os._exit(1)
+
+
+def test_cancelled_caller_keeps_its_slot_until_the_render_ends(monkeypatch):
+    monkeypatch.setattr(render_pool, "render_pdf", blocking_render)
+    release.clear()
+    pool = PDFRenderPool("thread", max_workers=1, max_queue=0)
+
+    async def run():
+        caller = asyncio.ensure_future(pool.render("patient", "a", "b", {}))
+        await asyncio.sleep(0.05)
+        caller.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await caller
+
+        # The render is still running on the worker, so the pool is still full
+        assert pool.stats()["pending"] == 1
+        with pytest.raises(RenderPoolFull):
+            await pool.render("patient", "a", "b", {})
+
+        release.set()
+        for _ in range(100):
+            if pool.stats()["pending"] == 0:
+                break
+            await asyncio.sleep(0.01)
+        assert pool.stats()["pending"] == 0
+        return await pool.render("patient", "a", "b", {})
+
+    try:
+        assert asyncio.run(run()) == b"%PDF-blocked"
+    finally:
+        release.set()
+        pool.shutdown()
+
+
+def test_pool_recovers_after_a_worker_process_dies(monkeypatch):
+    pool = PDFRenderPool("process", max_workers=1, max_queue=4)
+
+    async def run():
+        monkeypatch.setattr(render_pool, "render_pdf", crashing_render)
+        with pytest.raises(render_pool.BrokenProcessPool):
+            await pool.render("patient", "a", "b", {})
+        assert pool.stats()["pending"] == 0
+
+        monkeypatch.undo()
+        return await pool.render("patient", "Warfarin", "Aspirin", {"prediction": "EFFECT", "severity": "Major"})
+
+    try:
+        assert asyncio.run(run()).startswith(b"%PDF")
+    finally:
+        pool.shutdown()
@@ -0,0 +1,36 @@
+from fastapi.testclient import TestClient
+
+from api import index as app
+from api.utils.cache import TTLCache
+from api.utils.generation_backend import StubBackend
+from api.utils.report_store import ReportStore
+
+REQUEST = {"drug1": "Warfarin", "drug2": "Aspirin"}
+
+
+def test_stored_report_is_served_without_generating(tmp_path, monkeypatch):
+    path = str(tmp_path / "reports.sqlite3")
+    writer = ReportStore(path)
+    first_backend = StubBackend()
+    monkeypatch.setattr(app, "report_store", writer)
+    monkeypatch.setattr(app, "generation_backend", first_backend)
+    monkeypatch.setattr(app, "explanation_cache", TTLCache(64, 3600))
+    client = TestClient(app.app)
+
+    generated = client.post("/api/predict", json=REQUEST).json()
+    assert first_backend.calls == 2
+    writer.stop()
+
+    # Another worker: its own store connection, an empty in-process cache and a fresh backend
+    reader = ReportStore(path)
+    second_backend = StubBackend()
+    monkeypatch.setattr(app, "report_store", reader)
+    monkeypatch.setattr(app, "generation_backend", second_backend)
+    monkeypatch.setattr(app, "explanation_cache", TTLCache(64, 3600))
+
+    served = client.post("/api/predict", json=REQUEST).json()
+    assert second_backend.calls == 0
+    assert reader.hits == 2
+    assert served["patient_report"] == generated["patient_report"]
+    assert served["professional_report"] == generated["professional_report"]
+    reader.stop()
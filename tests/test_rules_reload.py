@@ -0,0 +1,39 @@
+import json
+
+import pytest
+
+from api.utils.interaction_index import RuleSetManager, load_rules
+
+
+@pytest.mark.parametrize("rules", [
+    {"drug_classes": ["x"]},
+    {"drug_classes": {"statins": "simvastatin"}},
+    {"major_pairs": [[1, 2]]},
+    {"major_pairs": [["warfarin"]]},
+    {"major_pairs": [["warfarin", ""]]},
+    {"class_interactions": [["statins", "nsaids", "EFFECT", "Moderate"]]},
+    {"class_interactions": [["statins", "nonexistent", "EFFECT", "Moderate", "x"]]},
+    {"monitored_classes": ["nonexistent"]},
+    {"monitored_classes": "statins"},
+])
+def test_load_rules_rejects_wrong_shapes(tmp_path, rules):
+    path = tmp_path / "rules.json"
+    path.write_text(json.dumps(rules))
+    with pytest.raises(ValueError):
+        load_rules(str(path))
+
+
+def test_bad_rules_file_keeps_previous_rule_set(tmp_path):
+    path = tmp_path / "rules.json"
+    path.write_text(json.dumps({"version": "v1", "major_pairs": [["alpha", "beta"]]}))
+    manager = RuleSetManager(str(path))
+    assert manager.current.version == "v1"
+
+    path.write_text(json.dumps({"version": "v2", "drug_classes": ["x"]}))
+    assert manager.reload_if_changed() is False
+    assert manager.current.version == "v1"
+
+    path.write_text(json.dumps({"version": "v3", "major_pairs": [["alpha", "gamma"]]}))
+    assert manager.reload_if_changed() is True
+    assert manager.current.index.is_major_pair(manager.current.index.related_ids("alpha"),
+                                               manager.current.index.related_ids("gamma"))
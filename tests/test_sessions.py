@@ -0,0 +1,95 @@
+import pytest
+from fastapi.testclient import TestClient
+
+from api import index as app
+from api.utils.cache import TTLCache
+from api.utils.generation_backend import StubBackend
+from api.utils.session_store import SessionStore
+
+
+@pytest.fixture
+def client(tmp_path, monkeypatch):
+    monkeypatch.setattr(app, "session_store", SessionStore(str(tmp_path / "sessions.sqlite3")))
+    monkeypatch.setattr(app, "generation_backend", StubBackend())
+    monkeypatch.setattr(app, "explanation_cache", TTLCache(64, 3600))
+    monkeypatch.setattr(app, "report_store", None)
+    return TestClient(app.app)
+
+
+@pytest.fixture
+def computed(monkeypatch):
+    """(drug1, drug2) of every pair the session endpoints classify"""
+    pairs = []
+    original = app.session_pair_result
+
+    async def counting(drug1, drug2, *args):
+        pairs.append((drug1, drug2))
+        return await original(drug1, drug2, *args)
+
+    monkeypatch.setattr(app, "session_pair_result", counting)
+    return pairs
+
+
+def pair_names(interactions):
+    return sorted(tuple(sorted((pair["drug1"], pair["drug2"]))) for pair in interactions)
+
+
+def test_create_computes_every_pair(client, computed):
+    response = client.post("/api/sessions", json={"drugs": ["warfarin", "aspirin", "ibuprofen"]})
+    assert response.status_code == 200
+    session = response.json()
+    assert session["version"] == 1
+    assert session["drugs"] == ["Warfarin", "Aspirin", "Ibuprofen"]
+    assert len(session["interactions"]) == len(session["diff"]["added"]) == len(computed) == 3
+    assert session["interactions"][0]["severity"] == "Major"
+
+
+def test_adding_a_drug_computes_only_its_pairs(client, computed):
+    session = client.post("/api/sessions", json={"drugs": ["warfarin", "aspirin", "ibuprofen"]}).json()
+    computed.clear()
+
+    response = client.post(f"/api/sessions/{session['session_id']}/drugs", json={"drugs": ["Metformin", "warfarin"]})
+    updated = response.json()
+    assert response.status_code == 200
+    assert updated["version"] == 2
+    # warfarin is already listed, so only metformin's three pairs are new
+    assert sorted(tuple(sorted(pair)) for pair in computed) == [
+        ("Aspirin", "Metformin"), ("Ibuprofen", "Metformin"), ("Metformin", "Warfarin")
+    ]
+    assert pair_names(updated["diff"]["added"]) == sorted(tuple(sorted(pair)) for pair in computed)
+    assert updated["diff"]["changed"] == [] and updated["diff"]["removed"] == []
+    assert len(updated["interactions"]) == 6
+
+
+def test_removing_a_drug_drops_its_pairs_without_computing(client, computed):
+    session = client.post("/api/sessions", json={"drugs": ["warfarin", "aspirin", "ibuprofen"]}).json()
+    computed.clear()
+
+    response = client.delete(f"/api/sessions/{session['session_id']}/drugs/Aspirin")
+    updated = response.json()
+    assert response.status_code == 200
+    assert computed == []
+    assert updated["drugs"] == ["Warfarin", "Ibuprofen"]
+    assert pair_names(updated["diff"]["removed"]) == [("Aspirin", "Ibuprofen"), ("Aspirin", "Warfarin")]
+    assert pair_names(updated["interactions"]) == [("Ibuprofen", "Warfarin")]
+    assert client.get(f"/api/sessions/{session['session_id']}").json()["version"] == 2
+
+
+def test_stale_version_is_a_conflict(client, monkeypatch):
+    session_id = client.post("/api/sessions", json={"drugs": ["warfarin", "aspirin"]}).json()["session_id"]
+    original = app.apply_session_changes
+
+    async def racing(session, add=(), remove=()):
+        # Another request commits while this one is still computing its pairs
+        version, stored = app.session_store.get(session_id)
+        app.session_store.update(session_id, version, stored)
+        return await original(session, add=add, remove=remove)
+
+    monkeypatch.setattr(app, "apply_session_changes", racing)
+    response = client.post(f"/api/sessions/{session_id}/drugs", json={"drugs": ["ibuprofen"]})
+    assert response.status_code == 409
+
+    monkeypatch.setattr(app, "apply_session_changes", original)
+    retried = client.post(f"/api/sessions/{session_id}/drugs", json={"drugs": ["ibuprofen"]})
+    assert retried.status_code == 200
+    assert retried.json()["version"] == 3